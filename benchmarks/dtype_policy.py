@@ -0,0 +1,118 @@
+"""Gain of the "preserve" dtype policy on float32 inputs.
+
+Every function is run on the same float32 sample with the float64 and
+the preserve policies (see obscure_stats.config). Best wall time, peak traced
+memory (relative to the size of the input) and the relative difference
+of the results are reported, so both the saved memory traffic and its cost
+in precision are visible.
+
+Run with `python -m benchmarks.dtype_policy`, e.g.::
+
+    python -m benchmarks.dtype_policy
+    python -m benchmarks.dtype_policy --functions l_skew,l_kurt --size 7
+
+Rolling, distributed and quadratic measures are skipped unless listed explicitly.
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import typing
+import warnings
+
+import numpy as np
+
+from benchmarks.memory import MEMORY_CLASSES
+from benchmarks.suite import functions, make_call, make_data, measure
+from obscure_stats.config import DTYPE_POLICIES, config_context
+
+if typing.TYPE_CHECKING:
+    from collections.abc import Iterator, Sequence
+
+
+def _whole_sample() -> list[str]:
+    """Get names of the measures of whole samples with linear memory."""
+    return sorted(
+        name
+        for name, (func, kind) in functions().items()
+        if kind == "array"
+        and name not in MEMORY_CLASSES
+        and func.__module__.split(".")[1] != "rolling"
+    )
+
+
+def _relative_difference(a: typing.Any, b: typing.Any) -> float:  # noqa: ANN401
+    """Calculate the largest relative difference of the results."""
+    _a = np.asarray(a, dtype=np.float64)
+    _b = np.asarray(b, dtype=np.float64)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        diff = np.abs(_a - _b) / np.maximum(np.abs(_a), np.finfo(np.float64).tiny)
+    diff = diff[np.isfinite(diff)]
+    return float(diff.max(initial=0.0))
+
+
+def run(names: Sequence[str], *, size: int = 6, repeat: int = 3) -> Iterator[dict]:
+    """Measure the functions under both policies and yield the records."""
+    registry = functions()
+    x, y = make_data(10**size, "float32", 0.0, "continuous")
+    for name in names:
+        func, kind = registry[name]
+        call = make_call(func, kind, x, y)
+        record: dict = {"function": name}
+        results = []
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            for policy in DTYPE_POLICIES:
+                with config_context(dtype_policy=policy):
+                    results.append(call())
+                    seconds, peak = measure(call, repeat)
+                record[policy] = {"seconds": seconds, "peak": peak / x.nbytes}
+        record["difference"] = _relative_difference(*results)
+        yield record
+
+
+def table(records: Sequence[dict]) -> str:
+    """Render the records as a markdown table."""
+    header = ["function"]
+    for policy in DTYPE_POLICIES:
+        header += [f"{policy} time, ms", f"{policy} peak / input"]
+    header += ["speedup", "relative difference"]
+    lines = ["| " + " | ".join(header) + " |", "|" + "---|" * len(header)]
+    for record in records:
+        cells = [record["function"]]
+        for policy in DTYPE_POLICIES:
+            cells += [
+                f"{record[policy]['seconds'] * 1e3:.2f}",
+                f"{record[policy]['peak']:.2f}",
+            ]
+        speedup = record["float64"]["seconds"] / record["preserve"]["seconds"]
+        cells += [f"{speedup:.2f}", f"{record['difference']:.1e}"]
+        lines.append("| " + " | ".join(cells) + " |")
+    return "\n".join(lines) + "\n"
+
+
+def _split(value: str) -> list[str]:
+    """Parse comma separated values."""
+    return [v for v in value.split(",") if v]
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    """Run the benchmark from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--functions", type=_split, default=_whole_sample())
+    parser.add_argument(
+        "--size", type=int, default=6, help="Power of ten of the sample size."
+    )
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+    unknown = sorted(set(args.functions) - set(functions()))
+    if unknown:
+        parser.error(f"unknown functions {unknown}")
+    records = list(run(args.functions, size=args.size, repeat=args.repeat))
+    sys.stdout.write(table(records))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,65 @@
+"""Benchmark of the import time of the package and its submodules.
+
+Every module is imported in a fresh interpreter, the time of the interpreter
+with numpy only is reported as the baseline.
+Run with `python -m benchmarks.import_time`.
+"""
+
+from __future__ import annotations
+
+import os
+import pathlib
+import statistics
+import subprocess
+import sys
+import time
+
+MODULES = (
+    "numpy",
+    "obscure_stats",
+    "obscure_stats.association",
+    "obscure_stats.central_tendency",
+    "obscure_stats.dispersion",
+    "obscure_stats.kurtosis",
+    "obscure_stats.skewness",
+    "obscure_stats.variation",
+    "obscure_stats.rolling",
+    "obscure_stats.distributed",
+    "obscure_stats.cli",
+    "scipy.stats",
+)
+SOURCES = pathlib.Path(__file__).parents[1] / "src"
+
+
+def measure(module: str, repeat: int = 10) -> tuple[float, bool]:
+    """Measure median wall time of the import in a fresh interpreter.
+
+    Returns
+    -------
+    seconds : float
+        Median time of the interpreter run.
+    scipy_loaded : bool
+        Whether scipy.stats was loaded by the import.
+    """
+    code = f"import sys, {module}; sys.exit('scipy.stats' in sys.modules)"
+    env = {**os.environ, "PYTHONPATH": str(SOURCES)}
+    times = []
+    loaded = False
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = subprocess.run([sys.executable, "-c", code], env=env, check=False)  # noqa: S603
+        times.append(time.perf_counter() - start)
+        loaded = bool(result.returncode)
+    return statistics.median(times), loaded
+
+
+def main(repeat: int = 10) -> None:
+    """Print import time of every module."""
+    for module in MODULES:
+        seconds, loaded = measure(module, repeat)
+        mark = "scipy.stats loaded" if loaded else ""
+        sys.stdout.write(f"{module:<34}{seconds * 1000:>8.1f} ms  {mark}\n")
+
+
+if __name__ == "__main__":
+    main()
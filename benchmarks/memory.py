@@ -0,0 +1,267 @@
+"""Peak memory classes of all public functions.
+
+Peak allocation of every public function is traced by tracemalloc at
+increasing sizes, and the empirical complexity is fitted as the slope of
+log(peak) against log(n). A function fails when its slope exceeds the
+exponent of the declared memory class (see MEMORY_CLASSES) by more than
+the tolerance. The table of the fitted classes with predicted peaks could be
+used for capacity planning.
+
+Run with `python -m benchmarks.memory`, e.g.::
+
+    python -m benchmarks.memory
+    python -m benchmarks.memory --functions shamos_estimator --budget 1073741824
+    python -m benchmarks.memory --output memory.md
+
+Exit code is 1 when any function exceeds its declared class.
+"""
+
+from __future__ import annotations
+
+import argparse
+import math
+import pathlib
+import sys
+import tracemalloc
+import typing
+import warnings
+
+import numpy as np
+
+from benchmarks.suite import functions, make_call, make_data
+
+if typing.TYPE_CHECKING:
+    from collections.abc import Callable, Iterator, Sequence
+
+# memory class -> exponent of n
+CLASSES = {"O(1)": 0, "O(n)": 1, "O(n^2)": 2}
+# functions allocating pairwise differences, others are expected to be O(n)
+MEMORY_CLASSES = {
+    "tukey_correlation": "O(n^2)",
+}
+# sizes for each class, quadratic functions are measured on smaller inputs
+SIZES = {
+    "O(1)": (1000, 4000, 16000, 64000),
+    "O(n)": (1000, 4000, 16000, 64000),
+    "O(n^2)": (250, 500, 1000, 2000),
+}
+# sizes of the predicted peaks in the table
+CAPACITY_SIZES = (10**6, 10**7)
+
+
+def declared_class(name: str) -> str:
+    """Get declared memory class of the function."""
+    return MEMORY_CLASSES.get(name, "O(n)")
+
+
+def peak_memory(call: Callable[[], typing.Any]) -> int:
+    """Measure peak traced memory of the call in bytes."""
+    tracemalloc.start()
+    try:
+        call()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def fit_exponent(sizes: Sequence[int], peaks: Sequence[int]) -> float:
+    """Fit the slope of log(peak) against log(n) by least squares.
+
+    Constant overhead only lowers the slope, so it never makes
+    a function exceed its class.
+    """
+    return float(np.polyfit(np.log(sizes), np.log(np.maximum(peaks, 1)), 1)[0])
+
+
+def fit_model(
+    sizes: Sequence[int], peaks: Sequence[int], exponent: int
+) -> tuple[float, float]:
+    """Fit peak = overhead + coefficient * n^k of the declared class.
+
+    Both terms are kept non-negative, so that the constant buffers
+    (e.g. histograms) are not extrapolated as per element costs.
+    """
+    if not exponent:
+        return float(max(peaks)), 0.0
+    design = np.column_stack(
+        [np.ones(len(sizes)), np.asarray(sizes, dtype=np.float64) ** exponent]
+    )
+    (overhead, coefficient), *_ = np.linalg.lstsq(design, peaks, rcond=None)
+    if overhead < 0:
+        overhead = 0.0
+        coefficient = np.dot(design[:, 1], peaks) / np.dot(design[:, 1], design[:, 1])
+    elif coefficient < 0:
+        overhead, coefficient = np.mean(peaks), 0.0
+    return float(overhead), float(coefficient)
+
+
+def predict(record: dict, n: int) -> float:
+    """Predict peak memory of the function at size n."""
+    return record["overhead"] + record["coefficient"] * n ** CLASSES[record["class"]]
+
+
+def profile(  # noqa: PLR0913
+    name: str,
+    func: Callable,
+    kind: str,
+    *,
+    dtype: str = "float64",
+    nan_density: float = 0.0,
+    tolerance: float = 0.25,
+) -> dict:
+    """Measure peaks of one function and compare the fitted class with declared."""
+    memory_class = declared_class(name)
+    sizes = SIZES[memory_class]
+    peaks = []
+    for n in sizes:
+        x, y = make_data(n, dtype, nan_density, "continuous")
+        # the first call imports lazy dependencies and fills caches
+        call = make_call(func, kind, x, y)
+        call()
+        peaks.append(peak_memory(call))
+    exponent = fit_exponent(sizes, peaks)
+    declared = CLASSES[memory_class]
+    overhead, coefficient = fit_model(sizes, peaks, declared)
+    return {
+        "function": name,
+        "class": memory_class,
+        "sizes": list(sizes),
+        "peaks": peaks,
+        "exponent": exponent,
+        "overhead": overhead,
+        "coefficient": coefficient,
+        "ok": exponent <= declared + tolerance,
+    }
+
+
+def run(
+    names: Sequence[str],
+    *,
+    dtype: str = "float64",
+    nan_density: float = 0.0,
+    tolerance: float = 0.25,
+) -> Iterator[dict]:
+    """Profile the functions and yield the records, failed calls are recorded."""
+    registry = functions()
+    for name in names:
+        func, kind = registry[name]
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            try:
+                yield profile(
+                    name,
+                    func,
+                    kind,
+                    dtype=dtype,
+                    nan_density=nan_density,
+                    tolerance=tolerance,
+                )
+            except Exception as e:  # noqa: BLE001
+                yield {"function": name, "error": f"{type(e).__name__}: {e}"}
+
+
+def _format_bytes(value: float) -> str:
+    """Format bytes with binary prefixes."""
+    for unit in ("B", "KiB", "MiB", "GiB"):
+        if value < 1024:  # noqa: PLR2004
+            return f"{value:.1f} {unit}"
+        value /= 1024
+    return f"{value:.1f} TiB"
+
+
+def capacity(record: dict, budget: int) -> int:
+    """Find the largest n which predicted peak fits into the budget."""
+    declared = CLASSES[record["class"]]
+    available = budget - record["overhead"]
+    if available < 0:
+        return 0
+    if not declared or not record["coefficient"]:
+        return sys.maxsize
+    return int((available / record["coefficient"]) ** (1 / declared))
+
+
+def _format_capacity(n: int) -> str:
+    """Format the largest size, sizes not limited by the budget are marked."""
+    return "unbounded" if n == sys.maxsize else f"{n:.3g}"
+
+
+def table(records: Sequence[dict], budget: int) -> str:
+    """Render the records as a markdown table."""
+    header = [
+        "function",
+        "declared",
+        "fitted exponent",
+        "peak at largest n",
+        *(f"peak at n=1e{round(math.log10(n))}" for n in CAPACITY_SIZES),
+        f"max n within {_format_bytes(budget)}",
+        "status",
+    ]
+    lines = ["| " + " | ".join(header) + " |", "|" + "---|" * len(header)]
+    for record in records:
+        if "error" in record:
+            cells = [record["function"], declared_class(record["function"])]
+            cells += ["-"] * (len(header) - 3) + [record["error"]]
+        else:
+            cells = [
+                record["function"],
+                record["class"],
+                f"{record['exponent']:.2f}",
+                f"{_format_bytes(record['peaks'][-1])} (n={record['sizes'][-1]})",
+                *(_format_bytes(predict(record, n)) for n in CAPACITY_SIZES),
+                _format_capacity(capacity(record, budget)),
+                "ok" if record["ok"] else "EXCEEDS",
+            ]
+        lines.append("| " + " | ".join(cells) + " |")
+    return "\n".join(lines) + "\n"
+
+
+def _split(value: str) -> list[str]:
+    """Parse comma separated values."""
+    return [v for v in value.split(",") if v]
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    """Run the memory benchmarks from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--functions", type=_split, default=sorted(functions()))
+    parser.add_argument("--dtype", default="float64")
+    parser.add_argument("--nan", type=float, default=0.0, help="Density of NaNs.")
+    parser.add_argument(
+        "--tolerance", type=float, default=0.25, help="Allowed excess of exponent."
+    )
+    parser.add_argument(
+        "--budget",
+        type=int,
+        default=2**30,
+        help="Bytes of memory for the capacity column.",
+    )
+    parser.add_argument("--output", type=pathlib.Path, help="Save the table.")
+    args = parser.parse_args(argv)
+    unknown = sorted(set(args.functions) - set(functions()))
+    if unknown:
+        parser.error(f"unknown functions {unknown}")
+
+    records = list(
+        run(
+            args.functions,
+            dtype=args.dtype,
+            nan_density=args.nan,
+            tolerance=args.tolerance,
+        )
+    )
+    text = table(records, args.budget)
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(text)
+    sys.stdout.write(text)
+    failed = [r for r in records if not r.get("ok", True)]
+    for record in failed:
+        sys.stdout.write(
+            f"EXCEEDS {record['function']}: declared {record['class']}, "
+            f"fitted exponent {record['exponent']:.2f}\n"
+        )
+    return int(bool(failed))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,296 @@
+"""Benchmark suite of all public functions.
+
+Every public function is run over the grid of sizes, dtypes, densities of
+missing values, distributions and shapes. Wall time (best of several runs)
+and peak memory (traced by tracemalloc in a separate run) are recorded and
+could be saved as a baseline and compared against it later.
+
+Run with `python -m benchmarks.suite`, e.g.::
+
+    python -m benchmarks.suite --sizes 2,4 --save baselines/main.json
+    python -m benchmarks.suite --sizes 2,4 --compare baselines/main.json
+    python -m benchmarks.suite --functions midhinge,trimean --dtypes float32
+
+Sizes are given as powers of ten (from 10^2 to 10^7 by default). Larger
+sizes of a case are skipped once the time predicted from the smaller ones
+exceeds --max-time, so quadratic measures stop early.
+"""
+
+from __future__ import annotations
+
+import argparse
+import functools
+import importlib
+import inspect
+import itertools
+import json
+import pathlib
+import sys
+import time
+import tracemalloc
+import typing
+import warnings
+
+import numpy as np
+
+if typing.TYPE_CHECKING:
+    from collections.abc import Callable, Iterator, Sequence
+
+# module -> how the data is passed to its functions
+MODULES = {
+    "obscure_stats.association": "array",
+    "obscure_stats.central_tendency": "array",
+    "obscure_stats.dispersion": "array",
+    "obscure_stats.distributed": "shards",
+    "obscure_stats.kurtosis": "array",
+    "obscure_stats.rolling": "array",
+    "obscure_stats.skewness": "array",
+    "obscure_stats.variation": "array",
+}
+SIZES = (2, 3, 4, 5, 6, 7)
+DTYPES = ("float64", "float32", "int64")
+NAN_DENSITIES = (0.0, 0.01, 0.5)
+DISTRIBUTIONS = ("continuous", "ties")
+SHAPES = ("1d", "batched")
+# rows of the batched inputs
+ROWS = 100
+WINDOW = 100
+SHARDS = 8
+
+
+def functions() -> dict[str, tuple[Callable, str]]:
+    """Collect public functions with the kinds of their inputs."""
+    result = {}
+    for module_name, kind in MODULES.items():
+        module = importlib.import_module(module_name)
+        for name in module.__all__:
+            func = getattr(module, name)
+            if name == "distributed_quantiles":
+                func = functools.partial(func, q=[0.25, 0.5, 0.75])
+            result[name] = (func, kind)
+    return result
+
+
+def make_data(
+    n: int, dtype: str, nan_density: float, distribution: str, seed: int = 42
+) -> tuple[np.ndarray, np.ndarray]:
+    """Generate a pair of dependent samples."""
+    rng = np.random.default_rng(seed)
+    if distribution == "ties":
+        x = np.round(rng.exponential(5, size=n))
+        y = np.round(x + rng.exponential(5, size=n))
+    else:
+        x = rng.normal(50, 10, size=n)
+        y = x + rng.normal(0, 10, size=n)
+    x, y = x.astype(dtype), y.astype(dtype)
+    if nan_density:
+        x[rng.random(n) < nan_density] = np.nan
+        y[rng.random(n) < nan_density] = np.nan
+    return x, y
+
+
+def make_call(
+    func: Callable, kind: str, x: np.ndarray, y: np.ndarray
+) -> Callable[[], typing.Any]:
+    """Bind the data to the function, 2-d inputs are processed row by row."""
+    params = inspect.signature(func).parameters
+    if "window" in params:
+        func = functools.partial(func, window=min(WINDOW, x.shape[-1]))
+    if kind == "shards":
+        func = functools.partial(_split_shards, func)
+    if "y" in params:
+        if x.ndim > 1:
+            return lambda: [func(x[i], y[i]) for i in range(len(x))]
+        return functools.partial(func, x, y)
+    if x.ndim > 1:
+        if "axis" in params:
+            return functools.partial(func, x, axis=-1)
+        return lambda: [func(row) for row in x]
+    return functools.partial(func, x)
+
+
+def _split_shards(func: Callable, x: np.ndarray) -> typing.Any:  # noqa: ANN401
+    """Call the distributed function on the shards of the data."""
+    return func(np.array_split(x, SHARDS))
+
+
+def measure(call: Callable[[], typing.Any], repeat: int) -> tuple[float, int]:
+    """Measure best wall time and peak traced memory of the call."""
+    best = np.inf
+    for _ in range(repeat):
+        start = time.perf_counter()
+        call()
+        best = min(best, time.perf_counter() - start)
+    tracemalloc.start()
+    try:
+        call()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return best, peak
+
+
+def cases(
+    names: Sequence[str],
+    dtypes: Sequence[str],
+    nan_densities: Sequence[float],
+    distributions: Sequence[str],
+    shapes: Sequence[str],
+) -> Iterator[tuple[str, str, float, str, str]]:
+    """Iterate over the grid without the sizes, skipping impossible cases."""
+    for case in itertools.product(names, dtypes, nan_densities, distributions, shapes):
+        _, dtype, nan_density, _, _ = case
+        if nan_density and np.dtype(dtype).kind != "f":
+            continue
+        yield case
+
+
+def run(  # noqa: PLR0913
+    names: Sequence[str],
+    *,
+    sizes: Sequence[int] = SIZES,
+    dtypes: Sequence[str] = DTYPES,
+    nan_densities: Sequence[float] = NAN_DENSITIES,
+    distributions: Sequence[str] = DISTRIBUTIONS,
+    shapes: Sequence[str] = SHAPES,
+    repeat: int = 3,
+    max_time: float = 5.0,
+    max_memory: int = 4 * 2**30,
+) -> Iterator[dict]:
+    """Run the benchmarks and yield the records.
+
+    Larger sizes are skipped when tenfold time or peak memory
+    of the previous size exceeds the limits.
+    """
+    registry = functions()
+    grid = cases(names, dtypes, nan_densities, distributions, shapes)
+    for name, dtype, nan_density, distribution, shape in grid:
+        func, kind = registry[name]
+        last_time, last_peak = 0.0, 0
+        for power in sorted(sizes):
+            n = 10**power
+            if shape == "batched" and n < ROWS * 10:
+                continue
+            # a linear or worse function gets at least 10 times heavier
+            if last_time * 10 > max_time or last_peak * 10 > max_memory:
+                break
+            x, y = make_data(n, dtype, nan_density, distribution)
+            if shape == "batched":
+                x, y = x.reshape(ROWS, -1), y.reshape(ROWS, -1)
+            call = make_call(func, kind, x, y)
+            record = {
+                "function": name,
+                "n": n,
+                "dtype": dtype,
+                "nan_density": nan_density,
+                "distribution": distribution,
+                "shape": shape,
+            }
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore")
+                try:
+                    last_time, last_peak = measure(call, repeat)
+                except Exception as e:  # noqa: BLE001
+                    # e.g. rows without values, the larger sizes are skipped
+                    yield {**record, "error": f"{type(e).__name__}: {e}"}
+                    break
+            yield {**record, "time": last_time, "peak_memory": last_peak}
+
+
+def _key(record: dict) -> tuple:
+    """Identify the benchmark case of the record."""
+    return tuple(
+        record[k]
+        for k in ("function", "n", "dtype", "nan_density", "distribution", "shape")
+    )
+
+
+def compare(
+    records: Sequence[dict],
+    baseline: Sequence[dict],
+    tolerance: float = 0.2,
+    min_time: float = 1e-4,
+) -> list[str]:
+    """Find cases that are slower or use more memory than in the baseline."""
+    reference = {_key(r): r for r in baseline}
+    regressions = []
+    for record in records:
+        base = reference.get(_key(record))
+        if base is None or "error" in base or "error" in record:
+            continue
+        slower = record["time"] / base["time"] if base["time"] else 1.0
+        heavier = (
+            record["peak_memory"] / base["peak_memory"] if base["peak_memory"] else 1.0
+        )
+        if (slower > 1 + tolerance and record["time"] > min_time) or (
+            heavier > 1 + tolerance
+        ):
+            case = " ".join(str(v) for v in _key(record))
+            regressions.append(f"{case}: time x{slower:.2f}, memory x{heavier:.2f}")
+    return regressions
+
+
+def _split(value: str, kind: type = str) -> list:
+    """Parse comma separated values."""
+    return [kind(v) for v in value.split(",") if v]
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    """Run the suite from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--functions", type=_split, default=sorted(functions()))
+    parser.add_argument(
+        "--sizes", type=functools.partial(_split, kind=int), default=SIZES
+    )
+    parser.add_argument("--dtypes", type=_split, default=DTYPES)
+    parser.add_argument(
+        "--nan", type=functools.partial(_split, kind=float), default=NAN_DENSITIES
+    )
+    parser.add_argument("--distributions", type=_split, default=DISTRIBUTIONS)
+    parser.add_argument("--shapes", type=_split, default=SHAPES)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--max-time", type=float, default=5.0, help="Seconds.")
+    parser.add_argument("--max-memory", type=int, default=4 * 2**30, help="Bytes.")
+    parser.add_argument("--save", type=pathlib.Path, help="Save records as JSON.")
+    parser.add_argument("--compare", type=pathlib.Path, help="Baseline JSON.")
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    args = parser.parse_args(argv)
+
+    records = []
+    for record in run(
+        args.functions,
+        sizes=args.sizes,
+        dtypes=args.dtypes,
+        nan_densities=args.nan,
+        distributions=args.distributions,
+        shapes=args.shapes,
+        repeat=args.repeat,
+        max_time=args.max_time,
+        max_memory=args.max_memory,
+    ):
+        records.append(record)
+        case = (
+            "{function:<48}{n:>10} {dtype:<8}{nan_density:<6}{distribution:<12}"
+            "{shape:<9}".format(**record)
+        )
+        if "error" in record:
+            sys.stdout.write(f"{case}{record['error']}\n")
+        else:
+            sys.stdout.write(
+                f"{case}{record['time']:>12.6f} s{record['peak_memory']:>14} B\n"
+            )
+    if args.save:
+        args.save.parent.mkdir(parents=True, exist_ok=True)
+        args.save.write_text(json.dumps(records, indent=1))
+    if args.compare:
+        regressions = compare(
+            records, json.loads(args.compare.read_text()), args.tolerance
+        )
+        for line in regressions:
+            sys.stdout.write(f"REGRESSION {line}\n")
+        return int(bool(regressions))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1 +1,4 @@
 """Collection of lesser-known statistical functions."""
+
+# kept in sync with pyproject.toml, cached results are keyed by it
+__version__ = "0.2.2"
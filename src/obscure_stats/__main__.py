@@ -0,0 +1,5 @@
+"""Entry point of `python -m obscure_stats`."""
+
+from obscure_stats.cli import main
+
+raise SystemExit(main())
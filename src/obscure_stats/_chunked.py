@@ -0,0 +1,159 @@
+"""Module for blockwise processing of memory-mapped inputs.
+
+np.memmap inputs larger than the memory budget (see obscure_stats.config)
+are streamed in blocks, so that only a block-sized part of the data is copied
+at once. Mergeable statistics are computed per block and then combined.
+"""
+
+from __future__ import annotations
+
+import typing
+
+import numpy as np
+
+from obscure_stats.config import _config, get_config
+
+if typing.TYPE_CHECKING:
+    from collections.abc import Callable, Iterator, Sequence
+
+# number of block-sized float64 temporaries alive at once
+_TEMPORARIES = 6
+_MIN_BLOCK = 1024
+
+
+def _nanvar(x: np.ndarray) -> float:
+    """Calculate variance ignoring missing values with float64 accumulators.
+
+    Deviations from the mean keep the float type of the input,
+    so float32 data is not converted to float64.
+    """
+    _x = np.asarray(x)
+    if _x.dtype.kind != "f":
+        _x = _x.astype(np.float64)
+    mean_func = np.mean if _assume_no_nans() else np.nanmean
+    mean = _x.dtype.type(mean_func(_x, dtype=np.float64))
+    return mean_func(np.square(_x - mean), dtype=np.float64)
+
+
+# sums are accumulated in float64 without converting the input
+_IN_MEMORY: dict[str, Callable] = {
+    "count": lambda x: np.count_nonzero(~np.isnan(np.asarray(x, dtype=np.float64))),
+    "sum": lambda x: np.nansum(x, dtype=np.float64),
+    "sumsq": lambda x: np.nansum(np.square(x), dtype=np.float64),
+    "mean": lambda x: np.nanmean(x, dtype=np.float64),
+    "var": _nanvar,
+    "std": lambda x: np.sqrt(_nanvar(x)),
+    "min": np.nanmin,
+    "max": np.nanmax,
+}
+# the same statistics of inputs without missing values
+_NO_NANS: dict[str, Callable] = {
+    "count": np.size,
+    "sum": lambda x: np.sum(x, dtype=np.float64),
+    "sumsq": lambda x: np.sum(np.square(x), dtype=np.float64),
+    "mean": lambda x: np.mean(x, dtype=np.float64),
+    "var": _nanvar,
+    "std": lambda x: np.sqrt(_nanvar(x)),
+    "min": np.min,
+    "max": np.max,
+}
+
+
+def _assume_no_nans() -> bool:
+    """Check if the checks of missing values are skipped (see nan_policy)."""
+    return _config.get()["nan_policy"] == "assume_none"
+
+
+def _is_streamed(x: np.ndarray) -> bool:
+    """Check if the input should be processed blockwise."""
+    return (
+        isinstance(x, np.memmap)
+        and x.flags.forc
+        and x.nbytes > get_config()["memory_budget"]
+    )
+
+
+def _block_length() -> int:
+    """Calculate number of elements in one block."""
+    return max(get_config()["memory_budget"] // (8 * _TEMPORARIES), _MIN_BLOCK)
+
+
+def _blocks(x: np.ndarray) -> Iterator[np.ndarray]:
+    """Split the input into flat views that fit into the memory budget."""
+    # contiguous arrays are flattened without copying
+    flat = x.ravel(order="K")
+    size = _block_length()
+    for start in range(0, len(flat), size):
+        yield flat[start : start + size]
+
+
+def _streamed_stats(x: np.ndarray) -> dict[str, float]:
+    """Calculate mergeable statistics of the input in one pass over the blocks.
+
+    Blocks are combined with the pairwise update of mean and sum of squared
+    deviations, see Chan, Golub, LeVeque (1983).
+    """
+    no_nans = _assume_no_nans()
+    count = 0
+    mean = m2 = total = sumsq = 0.0
+    minimum, maximum = np.inf, -np.inf
+    for block in _blocks(x):
+        b = np.asarray(block, dtype=np.float64)
+        if not no_nans:
+            b = b[~np.isnan(b)]
+        n_b = len(b)
+        if not n_b:
+            continue
+        sum_b = b.sum()
+        mean_b = sum_b / n_b
+        m2_b = np.square(b - mean_b).sum()
+        delta = mean_b - mean
+        n = count + n_b
+        mean += delta * n_b / n
+        m2 += m2_b + delta**2 * count * n_b / n
+        count = n
+        total += sum_b
+        sumsq += np.square(b).sum()
+        minimum = min(minimum, b.min())
+        maximum = max(maximum, b.max())
+    if not count:
+        mean = m2 = minimum = maximum = np.nan
+    return {
+        "count": count,
+        "sum": total,
+        "sumsq": sumsq,
+        "mean": mean,
+        "var": m2 / count if count else np.nan,
+        "std": (m2 / count) ** 0.5 if count else np.nan,
+        "min": minimum,
+        "max": maximum,
+    }
+
+
+def _nanstats(x: np.ndarray, *names: str) -> tuple:
+    """Calculate statistics ignoring missing values.
+
+    In-memory inputs use numpy nan-functions (or plain ones when the inputs
+    are assumed to have no missing values), large np.memmap inputs
+    are processed in one blockwise pass.
+    Available statistics: count, sum, sumsq (sum of squares),
+    mean, var, std, min and max.
+    """
+    if not _is_streamed(x):
+        funcs = _NO_NANS if _assume_no_nans() else _IN_MEMORY
+        return tuple(funcs[name](x) for name in names)
+    result = _streamed_stats(x)
+    return tuple(result[name] for name in names)
+
+
+def _streamed_quantiles(x: np.ndarray, q: Sequence[float] | np.ndarray) -> np.ndarray:
+    """Calculate exact quantiles of the large input block by block.
+
+    Blocks are treated as the shards of distributed quantile selection,
+    so only histograms and candidate values are kept in memory.
+    """
+    # imported here, as the distributed module depends on obscure_stats._utils
+    from obscure_stats.distributed.distributed import _select  # noqa: PLC0415
+
+    max_candidates = _block_length() // 2
+    return _select(list(_blocks(x)), q, map, 16, max_candidates)
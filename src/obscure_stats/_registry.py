@@ -0,0 +1,33 @@
+"""Registry of the measures by their names.
+
+Shared by the command line interface, the parallel and the asyncio modules,
+so that none of them depends on the others.
+"""
+
+from __future__ import annotations
+
+import typing
+
+from obscure_stats import (
+    association,
+    central_tendency,
+    dispersion,
+    kurtosis,
+    skewness,
+    variation,
+)
+
+if typing.TYPE_CHECKING:
+    from collections.abc import Callable
+
+# measures of one sample
+ESTIMATORS: dict[str, Callable] = {
+    name: getattr(module, name)
+    for module in (central_tendency, dispersion, kurtosis, skewness, variation)
+    for name in module.__all__
+}
+# all public measures, association of two samples included
+FUNCTIONS: dict[str, Callable] = {
+    **ESTIMATORS,
+    **{name: getattr(association, name) for name in association.__all__},
+}
@@ -0,0 +1,699 @@
+"""Module for internal helpers shared between the measures."""
+
+from __future__ import annotations
+
+import functools
+import importlib
+import inspect
+import types
+import typing
+from collections import Counter
+
+import numpy as np
+
+from obscure_stats._chunked import (
+    _assume_no_nans,
+    _blocks,
+    _is_streamed,
+    _nanstats,
+    _streamed_quantiles,
+)
+from obscure_stats.cache import _memoize
+from obscure_stats.config import _config, config_context, get_config
+from obscure_stats.dispatch import _choose, _threshold
+from obscure_stats.profiling import _instrument
+
+if typing.TYPE_CHECKING:
+    from collections.abc import Callable, Sequence
+
+_F = typing.TypeVar("_F", bound="Callable[..., typing.Any]")
+
+
+class _LazyModule(types.ModuleType):
+    """Module that is imported on the first access to its attributes.
+
+    Importing scipy.stats takes several hundred milliseconds,
+    so it is postponed until a function that needs it is called.
+    """
+
+    def __getattr__(self, name: str) -> typing.Any:  # noqa: ANN401
+        """Import the module and get its attribute."""
+        return getattr(importlib.import_module(self.__name__), name)
+
+
+def _lazy_import(name: str) -> typing.Any:  # noqa: ANN401
+    """Create a module proxy that is imported on demand."""
+    return _LazyModule(name)
+
+
+def _has_nans(x: np.ndarray, axis: int | None = None) -> np.ndarray | bool:
+    """Check if the input (or every slice along the axis) has missing values."""
+    _x = np.asarray(x)
+    if _x.dtype.kind not in "fc":
+        return False
+    if axis is None and _is_streamed(x):
+        return any(np.isnan(b).any() for b in _blocks(x))
+    return np.isnan(_x).any(axis=axis)
+
+
+def _nan_policy(func: _F) -> _F:
+    """Add the nan_policy argument to the measure.
+
+    The policy (the nan_policy setting by default, see obscure_stats.config)
+    is applied to the arguments x and y. Under "raise" and "propagate"
+    they are checked once and inputs without missing values are processed
+    as under "assume_none", so the helpers skip their own checks.
+    Results of slices with missing values are missing under "propagate".
+    """
+    signature = inspect.signature(func)
+    names = [name for name in ("x", "y") if name in signature.parameters]
+    axis_parameter = signature.parameters.get("axis")
+
+    def apply(args: tuple, kwargs: dict) -> typing.Any:  # noqa: ANN401
+        policy = _config.get()["nan_policy"]
+        if policy not in {"raise", "propagate"}:
+            return func(*args, **kwargs)
+        bound = signature.bind(*args, **kwargs)
+        axis = None
+        if axis_parameter is not None:
+            axis = bound.arguments.get("axis", axis_parameter.default)
+        missing = np.zeros((), dtype=bool)
+        for name in names:
+            missing = missing | _has_nans(bound.arguments[name], axis)
+        if not missing.any():
+            with config_context(nan_policy="assume_none"):
+                return func(*args, **kwargs)
+        if policy == "raise":
+            msg = "Input contains missing values."
+            raise ValueError(msg)
+        result = np.array(func(*args, **kwargs), dtype=np.float64)
+        result[missing] = np.nan
+        return result[()]
+
+    @functools.wraps(func)
+    def wrapper(
+        *args: typing.Any,  # noqa: ANN401
+        nan_policy: str | None = None,
+        **kwargs: typing.Any,  # noqa: ANN401
+    ) -> typing.Any:  # noqa: ANN401
+        if nan_policy is None:
+            return apply(args, kwargs)
+        with config_context(nan_policy=nan_policy):
+            return apply(args, kwargs)
+
+    policy_parameter = inspect.Parameter(
+        "nan_policy",
+        inspect.Parameter.KEYWORD_ONLY,
+        default=None,
+        annotation="str | None",
+    )
+    wrapper.__signature__ = signature.replace(  # type: ignore[attr-defined]
+        parameters=[*signature.parameters.values(), policy_parameter]
+    )
+    return typing.cast("_F", wrapper)
+
+
+def _shared_nan_policy(x: np.ndarray) -> str:
+    """Get the policy of several measures of the same input.
+
+    The input is checked for missing values once: measures of inputs without
+    them take the "assume_none" fast paths, otherwise the nan_policy setting
+    is kept.
+    """
+    policy = _config.get()["nan_policy"]
+    if policy != "assume_none" and not _has_nans(x):
+        return "assume_none"
+    return policy
+
+
+def _comb(
+    n: np.ndarray | int,
+    k: Sequence[int] | np.ndarray | int,
+    dtype: np.dtype | type = np.float64,
+) -> np.ndarray:
+    """Calculate binomial coefficients for small k.
+
+    Same as scipy.special.comb, but does not need scipy.
+    """
+    _n = np.asarray(n, dtype=dtype)
+    _k = np.asarray(k)
+    result = np.ones(np.broadcast(_n, _k).shape, dtype=dtype)
+    for i in range(int(_k.max(initial=0))):
+        # masked ufuncs are slower, the mask is needed only for arrays of k
+        mask = True if _k.ndim == 0 else i < _k
+        np.multiply(result, _n - i, out=result, where=mask)
+        np.divide(result, i + 1, out=result, where=mask)
+    return result
+
+
+def _work_dtype(x: np.ndarray) -> np.dtype:
+    """Get the float type of the temporary arrays of the computations.
+
+    Under the "preserve" dtype policy float inputs keep their precision
+    (float16 is promoted to float32), everything else is converted to float64.
+    """
+    dtype = getattr(x, "dtype", np.dtype(np.float64))
+    if dtype.kind == "f" and get_config()["dtype_policy"] == "preserve":
+        return np.promote_types(dtype, np.float32)
+    return np.dtype(np.float64)
+
+
+def _dot(a: np.ndarray, b: np.ndarray) -> np.ndarray | float:
+    """Calculate sums of the products over the last axis in float64.
+
+    BLAS accumulates in the type of the operands, so products
+    of lower precision are summed by np.sum with a float64 accumulator.
+    """
+    if np.result_type(a, b) == np.float64:
+        return a @ b
+    return np.sum(a * b, axis=-1, dtype=np.float64)
+
+
+def _center(x: np.ndarray) -> np.ndarray:
+    """Subtract the mean (accumulated in float64) keeping the type of x."""
+    (mean,) = _nanstats(x, "mean")
+    return x - x.dtype.type(mean)
+
+
+def _nanmedian(x: np.ndarray) -> float:
+    """Calculate the median ignoring missing values (see nan_policy)."""
+    if _assume_no_nans():
+        return np.median(x)
+    return np.nanmedian(x)
+
+
+def _pwm(xs: np.ndarray, orders: Sequence[int]) -> list[float]:
+    """Calculate probability weighted moments of the sorted values.
+
+    Missing values should be at the end of xs, they are skipped
+    but counted in the sample size (as np.nansum does).
+    Weights keep the precision of the data (see _work_dtype).
+    """
+    n = len(xs)
+    m = n
+    if xs.dtype.kind == "f" and not _assume_no_nans():
+        m -= int(np.count_nonzero(np.isnan(xs)))
+    dtype = _work_dtype(xs)
+    common = 1 / _comb(n - 1, orders) / n
+    return [
+        common[i] * _dot(_comb(np.arange(r, m), r, dtype), xs[r:m])
+        for i, r in enumerate(orders)
+    ]
+
+
+def _scratch(
+    x: np.ndarray,
+    *,
+    overwrite_input: bool = False,
+    buffer: np.ndarray | None = None,
+) -> tuple[np.ndarray, bool]:
+    """Get the array with the values of x that the measure could reorder.
+
+    The values are copied into the beginning of the buffer when it is given.
+    Writeable input arrays are used as is when overwrite_input is True.
+
+    Returns
+    -------
+    x : np.ndarray
+        The input, or the view of the buffer of the same shape.
+    owned : bool
+        Whether the array could be sorted or partitioned in place,
+        otherwise the helpers make their own copies.
+    """
+    if buffer is None:
+        owned = overwrite_input and isinstance(x, np.ndarray) and x.flags.writeable
+        return x, bool(owned)
+    if overwrite_input:
+        msg = "Parameters overwrite_input and buffer could not be used together."
+        raise ValueError(msg)
+    _x = np.asarray(x)
+    if (
+        not isinstance(buffer, np.ndarray)
+        or buffer.ndim != 1
+        or not buffer.flags.writeable
+        or not buffer.flags.c_contiguous
+    ):
+        msg = "Parameter buffer should be a writeable contiguous 1-d array."
+        raise ValueError(msg)
+    if len(buffer) < _x.size:
+        msg = f"Parameter buffer should have at least {_x.size} elements."
+        raise ValueError(msg)
+    if not np.can_cast(_x.dtype, buffer.dtype):
+        msg = f"Parameter buffer should have a dtype that holds {_x.dtype} values."
+        raise ValueError(msg)
+    view = buffer[: _x.size].reshape(_x.shape)
+    np.copyto(view, _x)
+    return view, True
+
+
+# number of elements moved at once while dropping missing values in place
+_COMPACT_BLOCK = 1 << 16
+
+
+def _compact(x: np.ndarray, keep: np.ndarray) -> np.ndarray:
+    """Move the kept values to the beginning of the flat array.
+
+    Values are moved block by block, so only a block-sized
+    temporary is allocated.
+    """
+    size = _COMPACT_BLOCK
+    m = 0
+    for start in range(0, len(x), size):
+        values = x[start : start + size][keep[start : start + size]]
+        x[m : m + len(values)] = values
+        m += len(values)
+    return x[:m]
+
+
+def _strip_nans(
+    x: np.ndarray, *, overwrite_input: bool = False, copy: bool = True
+) -> np.ndarray:
+    """Flatten the input and drop missing values.
+
+    The result is safe to modify: it is either a fresh copy or,
+    when overwrite_input is True, the input itself (missing values are
+    removed by moving the other ones to its beginning).
+    When copy is False and there are no missing values, the input is returned
+    as is and should only be read. Inputs are not checked when they are assumed
+    to have no missing values (see nan_policy).
+    """
+    _x = np.asarray(x)
+    inplace = overwrite_input and _x.flags.writeable and _x.flags.forc
+    if _x.dtype.kind in "fc" and not _assume_no_nans():
+        notnan = np.isnan(_x)
+        np.logical_not(notnan, out=notnan)
+        if not notnan.all():
+            if inplace:
+                return _compact(_x.ravel(order="K"), notnan.ravel(order="K"))
+            return _x[notnan]
+    if isinstance(x, np.ndarray) and copy and not inplace:
+        return _x.flatten()
+    return _x.ravel()
+
+
+def _finite(xs: np.ndarray) -> np.ndarray:
+    """Get the view of the finite values of the sorted array."""
+    if xs.dtype.kind != "f":
+        return xs
+    # infinities are at the ends and missing values after them
+    lo = np.searchsorted(xs, -np.inf, side="right")
+    hi = np.searchsorted(xs, np.inf, side="left")
+    return xs[lo:hi]
+
+
+@_instrument(phase="sort")
+@_memoize(intermediate=True)
+def _sort(
+    x: np.ndarray, axis: int = -1, *, overwrite_input: bool = False
+) -> np.ndarray:
+    """Sort the array, in place when it could be overwritten."""
+    if overwrite_input:
+        x.sort(axis=axis)
+        return x
+    return np.sort(x, axis=axis)
+
+
+@_instrument(phase="sort")
+@_memoize(intermediate=True)
+def _argsort(x: np.ndarray, *, stable: bool = False) -> np.ndarray:
+    """Find indexes that sort the array."""
+    return np.argsort(x, kind="stable" if stable else None)
+
+
+def _quantile_indexes(
+    n: int, q: Sequence[float] | np.ndarray
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Calculate neighbouring order statistics and weights of the quantiles.
+
+    Indexes and weights are the same as in the default (linear)
+    method of np.quantile.
+    """
+    virtual = (n - 1) * np.asarray(q, dtype=np.float64)
+    lo = np.floor(virtual)
+    gamma = virtual - lo
+    lo = lo.astype(np.intp)
+    hi = np.minimum(lo + 1, n - 1)
+    return lo, hi, gamma
+
+
+def _lerp(a: np.ndarray, b: np.ndarray, t: np.ndarray) -> np.ndarray:
+    """Interpolate between a and b in the same way as np.quantile does."""
+    diff = b - a
+    return np.where(t >= 0.5, b - diff * (1 - t), a + diff * t)  # noqa: PLR2004
+
+
+@_instrument(phase="quantile")
+def _sorted_quantiles(xs: np.ndarray, q: Sequence[float] | np.ndarray) -> np.ndarray:
+    """Calculate quantiles of the sorted data without missing values."""
+    lo, hi, gamma = _quantile_indexes(len(xs), q)
+    return _lerp(xs[lo], xs[hi], gamma)
+
+
+@_instrument(phase="quantile")
+def _partition(
+    x: np.ndarray,
+    q: Sequence[float] | np.ndarray,
+    *,
+    overwrite_input: bool = False,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Partition the data around all order statistics needed for the quantiles.
+
+    Missing values are dropped once and the data is partitioned by one call
+    of np.partition with all required indexes (including interpolation
+    neighbours), so the returned buffer could be reused for anything that needs
+    the same order statistics. When many order statistics are needed, the data
+    could be sorted instead (see obscure_stats.dispatch).
+
+    Returns
+    -------
+    xs : np.ndarray
+        Partitioned buffer without missing values.
+    lo, hi : np.ndarray
+        Indexes of the neighbouring order statistics of every quantile.
+    gamma : np.ndarray
+        Interpolation weights of every quantile.
+    """
+    xs = _strip_nans(x, overwrite_input=overwrite_input)
+    lo, hi, gamma = _quantile_indexes(len(xs), q)
+    if len(xs):
+        kth = np.unique(np.r_[lo, hi])
+        if _choose("quantiles", len(xs), k=len(kth)) == "quantile_sort":
+            xs.sort()
+        else:
+            xs.partition(kth)
+    return xs, lo, hi, gamma
+
+
+@_instrument(phase="quantile")
+def _nanquantile(
+    x: np.ndarray,
+    q: Sequence[float] | np.ndarray,
+    *,
+    overwrite_input: bool = False,
+) -> np.ndarray:
+    """Calculate several quantiles ignoring missing values.
+
+    Drop-in replacement for np.nanquantile with the linear method
+    that partitions the data only once.
+    Large memory-mapped inputs are processed block by block.
+    """
+    if _is_streamed(x):
+        return _streamed_quantiles(x, q)
+    xs, lo, hi, gamma = _partition(x, q, overwrite_input=overwrite_input)
+    if not len(xs):
+        return np.full(len(lo), np.nan)
+    return _lerp(xs[lo], xs[hi], gamma)
+
+
+def _tail_sums(
+    xs: np.ndarray,
+    lo: np.ndarray,
+    hi: np.ndarray,
+    thresholds: np.ndarray,
+    upper: Sequence[bool],
+) -> tuple[np.ndarray, np.ndarray]:
+    """Calculate sums and counts of values above or below the thresholds.
+
+    Buffer xs should be partitioned around lo and hi, and every threshold
+    should lie between xs[lo] and xs[hi] (as the quantiles do).
+    Sums of the segments between the partition points are accumulated
+    in float64 without converting the buffer, only ties with the thresholds
+    are counted separately.
+
+    Returns
+    -------
+    sums : np.ndarray
+        Sums of values x >= threshold (for upper) or x <= threshold.
+    counts : np.ndarray
+        Numbers of such values.
+    """
+    n = len(xs)
+    bounds = np.where(upper, hi, lo + 1)
+    edges = np.unique(np.r_[0, bounds])
+    edges = edges[edges < n]
+    stops = np.r_[edges, n]
+    segments = [
+        np.sum(xs[stops[i] : stops[i + 1]], dtype=np.float64) for i in range(len(edges))
+    ]
+    prefix = np.r_[0.0, np.cumsum(segments)]
+    prefix_at = prefix[np.searchsorted(stops, bounds)]
+    sums = np.where(upper, prefix[-1] - prefix_at, prefix_at)
+    counts = np.where(upper, n - bounds, bounds)
+    for i, is_upper in enumerate(upper):
+        # values equal to the threshold could be left on the other side
+        if is_upper and xs[lo[i]] >= thresholds[i]:
+            rest = xs[: bounds[i]]
+        elif not is_upper and xs[hi[i]] <= thresholds[i]:
+            rest = xs[bounds[i] :]
+        else:
+            continue
+        tie_sum, tie_count = _ties(rest, thresholds[i], upper=is_upper)
+        sums[i] += tie_sum
+        counts[i] += tie_count
+    return sums, counts
+
+
+# number of elements compared at once while counting ties with the thresholds
+_TIE_BLOCK = 1 << 16
+
+
+def _ties(xs: np.ndarray, p: float, *, upper: bool) -> tuple[float, int]:
+    """Sum and count values x >= p (for upper) or x <= p block by block.
+
+    Only a block-sized mask is allocated, so heavily tied samples
+    need no temporaries of the sample size.
+    """
+    compare = np.greater_equal if upper else np.less_equal
+    mask = np.empty(min(len(xs), _TIE_BLOCK), dtype=bool)
+    total = 0.0
+    count = 0
+    for start in range(0, len(xs), _TIE_BLOCK):
+        block = xs[start : start + _TIE_BLOCK]
+        m = mask[: len(block)]
+        compare(block, p, out=m)
+        total += float(np.sum(block, where=m, dtype=np.float64))
+        count += int(np.count_nonzero(m))
+    return total, count
+
+
+def _count_values(x: np.ndarray, algorithm: str) -> tuple[np.ndarray, np.ndarray]:
+    """Find distinct values of the array and their counts.
+
+    Integers are counted with np.bincount ("counts_bincount") over the range
+    of the values, other arrays are sorted by np.unique ("counts_unique").
+    """
+    if algorithm == "counts_bincount":
+        codes = x.astype(np.intp)
+        low = codes.min()
+        counts = np.bincount(codes - low)
+        values = np.flatnonzero(counts)
+        return (values + low).astype(x.dtype), counts[values]
+    return np.unique(x, return_counts=True)
+
+
+def _counting_candidates(x: np.ndarray) -> tuple[list[str], int]:
+    """List vectorised algorithms that could count the array and its value range."""
+    candidates = ["counts_unique"]
+    span = 0
+    if x.dtype.kind in "biu":
+        high = int(x.max())
+        span = high - int(x.min())
+        if high <= np.iinfo(np.intp).max:
+            candidates.insert(0, "counts_bincount")
+    return candidates, span
+
+
+def _counts(x: np.ndarray) -> np.ndarray:
+    """Count occurrences of every distinct value.
+
+    Arrays of numbers without missing values and of strings are counted
+    by np.bincount or np.unique (see obscure_stats.dispatch), other inputs
+    are counted by collections.Counter, which also keeps missing values apart,
+    as they are not equal to each other.
+    """
+    if (
+        isinstance(x, np.ndarray)
+        and x.ndim == 1
+        and len(x)
+        and x.dtype.kind in "biufUS"
+        and not (x.dtype.kind == "f" and not _assume_no_nans() and np.isnan(x).any())
+    ):
+        candidates, span = _counting_candidates(x)
+        algorithm = _choose(
+            "counts", len(x), candidates=[*candidates, "counts_counter"], span=span
+        )
+        if algorithm != "counts_counter":
+            return _count_values(x, algorithm)[1]
+    return np.asarray(list(Counter(x).values()))
+
+
+def _sorted_floats(x: np.ndarray) -> np.ndarray:
+    """Sort the values without missing ones, integers are converted to floats."""
+    xs = _strip_nans(x)
+    if xs.dtype.kind != "f":
+        xs = xs.astype(np.float64)
+    return _sort(xs, overwrite_input=True)
+
+
+def _gmd_dense(x: np.ndarray) -> float:
+    """Calculate Gini mean difference over the cartesian product."""
+    n = len(x)
+    product = np.meshgrid(x, x, sparse=True)
+    return np.nansum(np.abs(product[0] - product[1])) / (n * (n - 1))
+
+
+def _gmd_sorted(x: np.ndarray) -> float:
+    """Calculate Gini mean difference as a weighted sum of the order statistics.
+
+    Sum of |x_i - x_j| over all pairs of the sorted values is
+    2 * sum((2 * i - m + 1) * x_(i)).
+    """
+    n = len(x)
+    xs = _sorted_floats(x).astype(_work_dtype(x), copy=False)
+    if len(xs) and not (np.isfinite(xs[0]) and np.isfinite(xs[-1])):
+        return _gmd_dense(x)
+    weights = 2 * np.arange(len(xs), dtype=xs.dtype) - (len(xs) - 1)
+    return float(2 * _dot(weights, xs) / (n * (n - 1)))
+
+
+def _gmd(x: np.ndarray) -> float:
+    """Calculate Gini mean difference by the cheapest algorithm."""
+    if _choose("gmd", len(x)) == "gmd_sorted":
+        return _gmd_sorted(x)
+    return _gmd_dense(x)
+
+
+def _row_bounds(
+    xs: np.ndarray, shift: np.ndarray, t: np.floating, *, strict: bool
+) -> np.ndarray:
+    """Count columns j of every row i with xs[j] + shift[i] < t (or <= t)."""
+    m = len(xs)
+    bounds = np.searchsorted(xs, t - shift, side="left" if strict else "right")
+    before = np.less if strict else np.less_equal
+    # t - shift is rounded, so the bounds could be off by a few distinct values
+    while True:
+        prev = np.maximum(bounds - 1, 0)
+        back = (bounds > 0) & ~before(xs[prev] + shift, t)
+        if not back.any():
+            break
+        bounds[back] = np.searchsorted(xs, xs[prev[back]], side="left")
+    while True:
+        nxt = np.minimum(bounds, m - 1)
+        forward = (bounds < m) & before(xs[nxt] + shift, t)
+        if not forward.any():
+            break
+        bounds[forward] = np.searchsorted(xs, xs[nxt[forward]], side="right")
+    return bounds
+
+
+def _gather_pairs(
+    xs: np.ndarray,
+    shift: np.ndarray,
+    left: np.ndarray,
+    ends: np.ndarray,
+    positions: np.ndarray,
+) -> np.ndarray:
+    """Get candidates at the positions of the flattened column ranges."""
+    rows = np.searchsorted(ends, positions, side="right")
+    offsets = positions - np.r_[0, ends[:-1]][rows]
+    return xs[left[rows] + offsets] + shift[rows]
+
+
+def _select_pairs(
+    xs: np.ndarray, shift: np.ndarray, start: np.ndarray, k: int
+) -> np.floating:
+    """Find the k-th smallest of xs[j] + shift[i] over the columns j >= start[i].
+
+    Rows of the implicit matrix are sorted, so the candidates are kept as
+    a range of columns in every row. Ranges are narrowed to the values between
+    two pivots taken from a random sample around the rank of the answer
+    (as in Floyd-Rivest selection), counting the values below a pivot takes
+    one vectorised binary search per row, and the remaining candidates are
+    gathered once there are few of them.
+    """
+    m = len(xs)
+    rng = np.random.default_rng(k)
+    left = start.copy()
+    right = np.full(m, m, dtype=np.intp)
+    size = 1 << 14
+    gap = 3 * int(size**0.5)
+    while True:
+        ends = np.cumsum(right - left)
+        total = int(ends[-1])
+        rank = k - int((left - start).sum())
+        if total <= _threshold(m):
+            values = _gather_pairs(xs, shift, left, ends, np.arange(total))
+            return np.partition(values, rank)[rank]
+        sample = _gather_pairs(xs, shift, left, ends, rng.integers(total, size=size))
+        sample.sort()
+        position = rank * size // total
+        low = sample[max(position - gap, 0)]
+        high = sample[min(position + gap, size - 1)]
+        below = np.maximum(_row_bounds(xs, shift, low, strict=True), start)
+        if int((below - start).sum()) > k:
+            right = np.minimum(right, below)
+            continue
+        upto_low = np.maximum(_row_bounds(xs, shift, low, strict=False), start)
+        if int((upto_low - start).sum()) > k:
+            return low
+        upto_high = np.maximum(_row_bounds(xs, shift, high, strict=False), start)
+        left = np.maximum(left, upto_low)
+        if int((upto_high - start).sum()) > k:
+            right = np.minimum(right, upto_high)
+        else:
+            left = np.maximum(left, upto_high)
+
+
+def _pairwise_median_dense(x: np.ndarray, *, sums: bool) -> float:
+    """Calculate median of pairwise sums or absolute differences.
+
+    All pairs of the cartesian product are used, including the pairs of
+    the value with itself, missing values are ignored.
+    """
+    product = np.meshgrid(x, x, sparse=True)
+    if sums:
+        return np.nanmedian(product[0] + product[1])
+    return np.nanmedian(np.abs(product[0] - product[1]))
+
+
+def _pairwise_median_select(x: np.ndarray, *, sums: bool) -> float:
+    """Calculate median of pairwise sums or absolute differences by selection.
+
+    Same as _pairwise_median_dense, but the order statistics of the pairs are
+    selected in the implicit matrix of the sorted values, so the time
+    complexity is O(n log^2 n) and the memory complexity is O(n).
+
+    References
+    ----------
+    Johnson, D. B.; Mizoguchi, T. (1978).
+    Selecting the Kth Element in X + Y and X1 + X2 + ... + Xm.
+    SIAM Journal on Computing. 7 (2): 147-153.
+    """
+    xs = _sorted_floats(x)
+    m = len(xs)
+    if not m:
+        return np.nanmedian(np.asarray(x))
+    if not (np.isfinite(xs[0]) and np.isfinite(xs[-1])):
+        return _pairwise_median_dense(x, sums=sums)
+    shift = xs if sums else -xs
+    # only differences to the right of the diagonal are not negative
+    start = np.zeros(m, dtype=np.intp) if sums else np.arange(1, m + 1)
+
+    def kth(k: int) -> np.floating:
+        if sums:
+            return _select_pairs(xs, shift, start, k)
+        # m zeros of the diagonal, then every difference twice
+        if k < m:
+            return xs.dtype.type(0)
+        return _select_pairs(xs, shift, start, (k - m) // 2)
+
+    lo, hi = (m * m - 1) // 2, m * m // 2
+    low = kth(lo)
+    return np.r_[low, kth(hi) if hi != lo else low].mean()
+
+
+def _pairwise_median(x: np.ndarray, *, sums: bool) -> float:
+    """Calculate median of pairwise sums or differences by the cheapest algorithm."""
+    if _choose("pairwise_median", len(x)) == "pairwise_median_select":
+        return _pairwise_median_select(x, sums=sums)
+    return _pairwise_median_dense(x, sums=sums)
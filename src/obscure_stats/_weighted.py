@@ -0,0 +1,362 @@
+"""Module for frequency-weighted samples.
+
+Heavily tied data could be stored as distinct values with their counts.
+Such samples are processed in the compressed form: order statistics are found
+in the cumulative counts, probability weighted moments sum the weights
+of whole blocks of tied order statistics at once and pairs of values are
+counted by products of their counts. So the time depends on the number
+of distinct values rather than on the number of observations.
+Results are the same as for the sample with every value repeated
+as many times as its weight (np.repeat(x, weights)).
+"""
+
+from __future__ import annotations
+
+import math
+import typing
+
+import numpy as np
+
+from obscure_stats._chunked import _assume_no_nans, _nanstats
+from obscure_stats._utils import (
+    _comb,
+    _lerp,
+    _nanmedian,
+    _nanquantile,
+    _quantile_indexes,
+    _row_bounds,
+    _scratch,
+)
+from obscure_stats.dispatch import _threshold
+from obscure_stats.profiling import _instrument
+
+if typing.TYPE_CHECKING:
+    from collections.abc import Sequence
+
+# largest sum of products that fits into int64 accumulators
+_INT64_BOUND = 2**63
+
+
+def _check_weights(x: np.ndarray, weights: np.ndarray) -> np.ndarray:
+    """Check that weights are counts of the values, flatten them to int64."""
+    _w = np.asarray(weights)
+    if _w.shape != np.shape(x):
+        msg = "Parameter weights should have the same shape as x."
+        raise ValueError(msg)
+    if _w.dtype.kind not in "biuf" or (
+        _w.dtype.kind == "f"
+        and not (np.isfinite(_w).all() and np.array_equal(_w, np.floor(_w)))
+    ):
+        msg = "Parameter weights should be non-negative integer counts."
+        raise ValueError(msg)
+    if _w.size and _w.min() < 0:
+        msg = "Parameter weights should be non-negative integer counts."
+        raise ValueError(msg)
+    return _w.astype(np.int64).ravel()
+
+
+@_instrument(phase="sort")
+def _compress(x: np.ndarray, weights: np.ndarray) -> tuple[np.ndarray, np.ndarray, int]:
+    """Sort distinct values of the weighted sample.
+
+    Returns
+    -------
+    xs : np.ndarray
+        Sorted distinct values without missing ones, as float64.
+    ws : np.ndarray
+        Positive counts of the values.
+    n : int
+        Size of the sample, counts of missing values included.
+    """
+    ws = _check_weights(x, weights)
+    xs = np.asarray(x, dtype=np.float64).ravel()
+    n = int(ws.sum())
+    keep = ws > 0
+    if not _assume_no_nans():
+        keep &= ~np.isnan(xs)
+    xs, ws = xs[keep], ws[keep]
+    order = np.argsort(xs, kind="stable")
+    xs, ws = xs[order], ws[order]
+    if len(xs):
+        starts = np.flatnonzero(np.r_[True, xs[1:] != xs[:-1]])
+        xs, ws = xs[starts], np.add.reduceat(ws, starts)
+    return xs, ws, n
+
+
+def _exact_dot(a: np.ndarray, b: np.ndarray) -> int:
+    """Sum products of the counts, in Python integers when int64 could overflow."""
+    if int(np.abs(a).max(initial=0)) * int(np.abs(b).sum()) < _INT64_BOUND:
+        return int(a @ b)
+    return int(np.dot(a.astype(object), b.astype(object)))
+
+
+def _pair_counts(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Multiply the counts, in Python integers when int64 could overflow."""
+    if int(a.max(initial=0)) * int(b.max(initial=0)) < _INT64_BOUND:
+        return a * b
+    return a.astype(object) * b.astype(object)
+
+
+def _weighted_kth(values: np.ndarray, counts: np.ndarray, k: int) -> np.floating:
+    """Find the k-th smallest of the values repeated counts times."""
+    order = np.argsort(values, kind="stable")
+    _counts = counts[order]
+    if _counts.dtype != object and (
+        int(_counts.max(initial=0)) * len(_counts) >= _INT64_BOUND
+    ):
+        _counts = _counts.astype(object)
+    cumulative = np.cumsum(_counts)
+    return values[order[np.searchsorted(cumulative, k, side="right")]]
+
+
+def _weighted_stats(x: np.ndarray, weights: np.ndarray, *names: str) -> tuple:
+    """Calculate statistics of the weighted sample ignoring missing values.
+
+    Available statistics are the same as in _nanstats.
+    """
+    w = _check_weights(x, weights).astype(np.float64)
+    _x = np.asarray(x, dtype=np.float64).ravel()
+    keep = w > 0
+    if not _assume_no_nans():
+        keep &= ~np.isnan(_x)
+    _x, w = _x[keep], w[keep]
+    count = w.sum()
+    total = w @ _x
+    mean = total / count if count else np.nan
+    var = w @ np.square(_x - mean) / count if count else np.nan
+    result = {
+        "count": count,
+        "sum": total,
+        "sumsq": w @ np.square(_x),
+        "mean": mean,
+        "var": var,
+        "std": np.sqrt(var),
+        "min": _x.min() if len(_x) else np.nan,
+        "max": _x.max() if len(_x) else np.nan,
+    }
+    return tuple(result[name] for name in names)
+
+
+def _sample_stats(
+    x: np.ndarray, *names: str, weights: np.ndarray | None = None
+) -> tuple:
+    """Calculate statistics ignoring missing values, weighted when weights are given."""
+    if weights is None:
+        return _nanstats(x, *names)
+    return _weighted_stats(x, weights, *names)
+
+
+def _sample_size(x: np.ndarray, weights: np.ndarray | None = None) -> int:
+    """Get size of the sample, missing values included."""
+    if weights is None:
+        return len(x)
+    return int(_check_weights(x, weights).sum())
+
+
+@_instrument(phase="quantile")
+def _weighted_quantiles(
+    x: np.ndarray, weights: np.ndarray, q: Sequence[float] | np.ndarray
+) -> np.ndarray:
+    """Calculate quantiles of the weighted sample ignoring missing values.
+
+    Order statistics are found in the cumulative counts, interpolation
+    is the same as in the linear method of np.quantile.
+    """
+    xs, ws, _ = _compress(x, weights)
+    cumulative = np.cumsum(ws)
+    lo, hi, gamma = _quantile_indexes(int(cumulative[-1]) if len(ws) else 0, q)
+    if not len(xs):
+        return np.full(len(lo), np.nan)
+    x_lo = xs[np.searchsorted(cumulative, lo, side="right")]
+    x_hi = xs[np.searchsorted(cumulative, hi, side="right")]
+    return _lerp(x_lo, x_hi, gamma)
+
+
+def _sample_quantiles(
+    x: np.ndarray,
+    q: Sequence[float] | np.ndarray,
+    *,
+    overwrite_input: bool = False,
+    buffer: np.ndarray | None = None,
+    weights: np.ndarray | None = None,
+) -> np.ndarray:
+    """Calculate quantiles ignoring missing values, weighted when weights are given.
+
+    Scratch arrays are not needed for the weighted samples, so overwrite_input
+    and buffer are used only without weights.
+    """
+    if weights is not None:
+        return _weighted_quantiles(x, weights, q)
+    _x, owned = _scratch(x, overwrite_input=overwrite_input, buffer=buffer)
+    return _nanquantile(_x, q, overwrite_input=owned)
+
+
+def _sample_median(x: np.ndarray, weights: np.ndarray | None = None) -> float:
+    """Calculate the median ignoring missing values, weighted when weights are given."""
+    if weights is None:
+        return _nanmedian(x)
+    return _weighted_quantiles(x, weights, [0.5])[0]
+
+
+def _weighted_tail_sums(
+    xs: np.ndarray,
+    ws: np.ndarray,
+    thresholds: np.ndarray,
+    upper: Sequence[bool],
+) -> tuple[np.ndarray, np.ndarray]:
+    """Calculate sums and counts of values above or below the thresholds.
+
+    Same as _tail_sums, but for the sorted distinct values with their counts.
+    """
+    prefix_sums = np.r_[0.0, np.cumsum(ws * xs)]
+    prefix_counts = np.r_[0, np.cumsum(ws)]
+    bounds = np.where(
+        upper,
+        np.searchsorted(xs, thresholds, side="left"),
+        np.searchsorted(xs, thresholds, side="right"),
+    )
+    sums = np.where(upper, prefix_sums[-1] - prefix_sums[bounds], prefix_sums[bounds])
+    counts = np.where(
+        upper, prefix_counts[-1] - prefix_counts[bounds], prefix_counts[bounds]
+    )
+    return sums, counts
+
+
+def _block_comb_sums(starts: np.ndarray, ends: np.ndarray, r: int) -> np.ndarray:
+    """Sum binomial coefficients C(j, r) over j in [start, end) of every block.
+
+    The sum is (end)_k - (start)_k divided by k! (k = r + 1, falling factorials),
+    and the difference of the products is expanded into the telescoping sum
+    of (end - start) times products of the factors, so positions
+    of large samples do not cancel each other.
+    """
+    e = np.asarray(ends, dtype=np.float64)
+    s = np.asarray(starts, dtype=np.float64)
+    k = r + 1
+    total = np.zeros_like(e)
+    for i in range(k):
+        term = np.ones_like(e)
+        for t in range(i):
+            term *= e - t
+        for t in range(i + 1, k):
+            term *= s - t
+        total += term
+    return (e - s) * total / math.factorial(k)
+
+
+def _weighted_pwm(
+    x: np.ndarray, weights: np.ndarray, orders: Sequence[int]
+) -> list[float]:
+    """Calculate probability weighted moments of the weighted sample.
+
+    Same as _pwm of the expanded sorted sample: weights of the tied order
+    statistics of every distinct value are summed at once.
+    """
+    xs, ws, n = _compress(x, weights)
+    ends = np.cumsum(ws)
+    starts = ends - ws
+    common = 1 / _comb(n - 1, orders) / n
+    return [
+        common[i] * float(_block_comb_sums(starts, ends, r) @ xs)
+        for i, r in enumerate(orders)
+    ]
+
+
+def _weighted_gmd(x: np.ndarray, weights: np.ndarray) -> float:
+    """Calculate Gini mean difference of the weighted sample.
+
+    Order statistics of every distinct value get the sum of the coefficients
+    2 * i - m + 1 of their positions (see _gmd_sorted).
+    """
+    xs, ws, n = _compress(x, weights)
+    if len(xs) and not (np.isfinite(xs[0]) and np.isfinite(xs[-1])):
+        differences = np.abs(xs[:, None] - xs[None, :])
+        return np.nansum(np.outer(ws, ws) * differences) / (n * (n - 1))
+    ends = np.cumsum(ws)
+    m = int(ends[-1]) if len(ends) else 0
+    coefficients = (ws * (2 * ends - ws - m)).astype(np.float64)
+    return float(2 * (coefficients @ xs) / (n * (n - 1)))
+
+
+def _select_weighted_pairs(
+    xs: np.ndarray, ws: np.ndarray, shift: np.ndarray, start: np.ndarray, k: int
+) -> np.floating:
+    """Find the k-th smallest of xs[j] + shift[i] over the columns j >= start[i].
+
+    Every pair is repeated ws[i] * ws[j] times. Candidates are kept as ranges
+    of columns in the sorted rows, the pivot is the median of the middles
+    of the rows weighted by their lengths, so at least a quarter of the
+    candidates is dropped on every step. Counts of the pairs below
+    the pivot are found in the cumulative counts of the columns.
+    """
+    m = len(xs)
+    cumulative = np.r_[0, np.cumsum(ws)]
+    left = start.copy()
+    right = np.full(m, m, dtype=np.intp)
+
+    def rank(bounds: np.ndarray) -> int:
+        return _exact_dot(ws, cumulative[bounds] - cumulative[start])
+
+    while True:
+        sizes = right - left
+        total = int(sizes.sum())
+        if total <= _threshold(m):
+            rows = np.repeat(np.arange(m), sizes)
+            columns = np.arange(total) - np.repeat(np.cumsum(sizes) - sizes, sizes)
+            columns += left[rows]
+            values = xs[columns] + shift[rows]
+            counts = _pair_counts(ws[rows], ws[columns])
+            return _weighted_kth(values, counts, k - rank(left))
+        rows = np.flatnonzero(sizes)
+        middles = xs[(left[rows] + right[rows]) // 2] + shift[rows]
+        pivot = _weighted_kth(middles, sizes[rows], (total - 1) // 2)
+        below = np.maximum(_row_bounds(xs, shift, pivot, strict=True), start)
+        if rank(below) > k:
+            right = np.minimum(right, below)
+            continue
+        upto = np.maximum(_row_bounds(xs, shift, pivot, strict=False), start)
+        if rank(upto) > k:
+            return pivot
+        left = np.maximum(left, upto)
+
+
+def _weighted_pairwise_median(
+    x: np.ndarray, weights: np.ndarray, *, sums: bool
+) -> float:
+    """Calculate median of pairwise sums or absolute differences of the weighted sample.
+
+    Same as _pairwise_median of the expanded sample: all pairs of the
+    cartesian product are used, a pair of distinct values is repeated
+    by the product of their counts.
+    """
+    xs, ws, _ = _compress(x, weights)
+    m = len(xs)
+    if not m:
+        return np.nan
+    size = int(ws.sum())
+    lo, hi = (size * size - 1) // 2, size * size // 2
+    if not (np.isfinite(xs[0]) and np.isfinite(xs[-1])):
+        # pairs of infinite values without the sum (difference) are dropped
+        with np.errstate(invalid="ignore"):
+            product = xs[:, None] + xs if sums else np.abs(xs[:, None] - xs)
+        counts = _pair_counts(np.repeat(ws, m), np.tile(ws, m))
+        values = product.ravel()
+        keep = ~np.isnan(values)
+        size = int(counts[keep].sum())
+        lo, hi = (size - 1) // 2, size // 2
+        low = _weighted_kth(values[keep], counts[keep], lo)
+        return np.r_[low, _weighted_kth(values[keep], counts[keep], hi)].mean()
+    shift = xs if sums else -xs
+    start = np.zeros(m, dtype=np.intp) if sums else np.arange(1, m + 1)
+    # tied values of the same distinct value give zero differences
+    zeros = _exact_dot(ws, ws)
+
+    def kth(k: int) -> np.floating:
+        if sums:
+            return _select_weighted_pairs(xs, ws, shift, start, k)
+        if k < zeros:
+            return xs.dtype.type(0)
+        return _select_weighted_pairs(xs, ws, shift, start, (k - zeros) // 2)
+
+    low = kth(lo)
+    return np.r_[low, kth(hi) if hi != lo else low].mean()
@@ -0,0 +1,407 @@
+"""Module for calling the measures from asyncio event loops.
+
+Heavy measures block the event loop, so their awaitable variants run them
+on a bounded thread pool. Concurrent calls of the same measure are coalesced:
+calls made within max_delay seconds are run as one batch (up to max_batch
+calls) by one task of the pool, and batches of samples of the same size
+are vectorised where the measure allows it (the Trimmed Harrell-Davis
+quantiles of all samples are one sparse matrix product).
+
+Every public function of the measure modules has an awaitable variant
+with the same name and two more keyword arguments, timeout (in seconds)
+and executor::
+
+    from obscure_stats import aio
+
+    async def handler(request):
+        x = await request.json()
+        return await aio.hodges_lehmann_sen_location(x, timeout=0.5)
+
+Only calls with equal settings are vectorised together, and results of
+the vectorised batch are passed through the same checks of missing values,
+memoisation and profiling as the calls of the measure itself.
+Cancelled calls that were not started are removed from the batch, results
+of calls that are already running are discarded.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import concurrent.futures
+import contextvars
+import functools
+import inspect
+import os
+import threading
+import typing
+
+import numpy as np
+
+from obscure_stats import central_tendency
+from obscure_stats._registry import FUNCTIONS
+from obscure_stats._utils import _nan_policy
+from obscure_stats.cache import _memoize
+from obscure_stats.central_tendency.central_tendency import _thd_weights
+from obscure_stats.config import _config
+from obscure_stats.profiling import _instrument
+
+if typing.TYPE_CHECKING:
+    from collections.abc import Callable, Sequence
+
+# arguments of the call and the context of the caller (with its settings)
+_Call = tuple[tuple, dict, contextvars.Context]
+_THD_SIGNATURE = inspect.signature(
+    central_tendency.standard_trimmed_harrell_davis_quantile
+)
+
+
+def _batched_thd(calls: Sequence[_Call]) -> list[typing.Any] | None:
+    """Calculate Trimmed Harrell-Davis quantiles of the samples of the same size.
+
+    Returns None when the calls could not be vectorised.
+    """
+    samples: list[np.ndarray] = []
+    q = None
+    for args, kwargs, _ in calls:
+        bound = _THD_SIGNATURE.bind(*args, **kwargs)
+        bound.apply_defaults()
+        _q = np.asarray(bound.arguments["q"], dtype=np.float64)
+        x = np.asarray(bound.arguments["x"])
+        if (
+            (q is not None and not np.array_equal(_q, q))
+            or bound.arguments["weights"] is not None
+            or x.ndim != 1
+            or x.dtype.kind not in "iuf"
+            or (samples and len(x) != len(samples[0]))
+            or not np.isfinite(x).all()
+        ):
+            return None
+        q = _q
+        samples.append(x)
+    if q is None or len(samples[0]) <= 1 or np.any(q <= 0) or np.any(q >= 1):
+        return None
+    xs = np.sort(np.stack(samples), axis=1)
+    thdq = _thd_weights(xs.shape[1], tuple(q.ravel().tolist())) @ xs.T
+    return [
+        thdq[0, i] if q.ndim == 0 else thdq[:, i].reshape(q.shape)
+        for i in range(len(samples))
+    ]
+
+
+# vectorised implementations of the batches
+_BATCHED: dict[str, Callable[[Sequence[_Call]], list[typing.Any] | None]] = {
+    "standard_trimmed_harrell_davis_quantile": _batched_thd,
+}
+
+
+# result of the vectorised batch for the call being replayed
+_BATCH_RESULT: contextvars.ContextVar[typing.Any] = contextvars.ContextVar(
+    "batch_result"
+)
+
+
+def _replay(func: Callable) -> Callable:
+    """Wrap the results of the batch like the measure itself.
+
+    The wrapper has the name and the signature of the measure and the same
+    decorators, so the checks of missing values, the cache keys and
+    the profiled calls are the same as of the direct calls.
+    """
+
+    @functools.wraps(inspect.unwrap(func))
+    def lookup(*args: typing.Any, **kwargs: typing.Any) -> typing.Any:  # noqa: ANN401, ARG001
+        return _BATCH_RESULT.get()
+
+    return _instrument(_nan_policy(_memoize(lookup)))
+
+
+_REPLAYED = {name: _replay(FUNCTIONS[name]) for name in _BATCHED}
+
+
+def _replay_call(
+    name: str,
+    result: typing.Any,  # noqa: ANN401
+    args: tuple,
+    kwargs: dict,
+) -> typing.Any:  # noqa: ANN401
+    """Pass the result of the batch through the wrappers of the measure."""
+    token = _BATCH_RESULT.set(result)
+    try:
+        return _REPLAYED[name](*args, **kwargs)
+    finally:
+        _BATCH_RESULT.reset(token)
+
+
+def _same_settings(calls: Sequence[_Call]) -> list[list[int]]:
+    """Group indexes of the calls made with equal settings."""
+    groups: list[tuple[dict, list[int]]] = []
+    for i, (_, _, context) in enumerate(calls):
+        settings = context.run(_config.get)
+        for group_settings, indexes in groups:
+            if group_settings == settings:
+                indexes.append(i)
+                break
+        else:
+            groups.append((settings, [i]))
+    return [indexes for _, indexes in groups]
+
+
+def _outcome(
+    context: contextvars.Context,
+    func: Callable,
+    /,
+    *args: typing.Any,  # noqa: ANN401
+    **kwargs: typing.Any,  # noqa: ANN401
+) -> tuple[bool, typing.Any]:
+    """Run the function in the context of the caller, catching its error."""
+    try:
+        return True, context.run(func, *args, **kwargs)
+    except Exception as e:  # noqa: BLE001
+        return False, e
+
+
+def _run_batch(name: str, calls: Sequence[_Call]) -> list[tuple[bool, typing.Any]]:
+    """Run the batch of calls in the worker thread.
+
+    Returns
+    -------
+    outcomes : list of tuples
+        Result or exception of every call.
+    """
+    outcomes: list[tuple[bool, typing.Any] | None] = [None] * len(calls)
+    batched = _BATCHED.get(name)
+    if batched is not None:
+        for indexes in _same_settings(calls):
+            if len(indexes) < 2:  # noqa: PLR2004
+                continue
+            group = [calls[i] for i in indexes]
+            try:
+                results = group[0][2].run(batched, group)
+            except Exception:  # noqa: BLE001
+                # every call raises its own error below
+                results = None
+            if results is None:
+                continue
+            for j, i in enumerate(indexes):
+                args, kwargs, context = calls[i]
+                outcomes[i] = _outcome(
+                    context, _replay_call, name, results[j], args, kwargs
+                )
+    func = FUNCTIONS[name]
+    for i, (args, kwargs, context) in enumerate(calls):
+        if outcomes[i] is None:
+            outcomes[i] = _outcome(context, func, *args, **kwargs)
+    return typing.cast("list[tuple[bool, typing.Any]]", outcomes)
+
+
+class BatchExecutor:
+    """Bounded executor that coalesces concurrent calls into batches.
+
+    Parameters
+    ----------
+    max_workers : int, optional
+        Number of worker threads, min(4, number of CPUs) by default.
+    max_batch : int, default = 64
+        Largest number of calls in one batch.
+    max_delay : float, default = 0.001
+        Time in seconds for which the first call of a batch waits for others.
+
+    Examples
+    --------
+    >>> async def main(samples):
+    ...     with BatchExecutor(max_workers=2) as executor:
+    ...         return await asyncio.gather(
+    ...             *(executor.compute("midhinge", x) for x in samples)
+    ...         )
+    """
+
+    def __init__(
+        self,
+        max_workers: int | None = None,
+        max_batch: int = 64,
+        max_delay: float = 0.001,
+    ) -> None:
+        if max_batch < 1:
+            msg = "Parameter max_batch should be a positive integer."
+            raise ValueError(msg)
+        if max_delay < 0:
+            msg = "Parameter max_delay should be non-negative."
+            raise ValueError(msg)
+        self._pool = concurrent.futures.ThreadPoolExecutor(
+            max_workers or min(4, os.cpu_count() or 1),
+            thread_name_prefix="obscure_stats",
+        )
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self._pending: dict[
+            tuple[asyncio.AbstractEventLoop, str],
+            list[tuple[_Call, asyncio.Future]],
+        ] = {}
+        self._timers: dict[
+            tuple[asyncio.AbstractEventLoop, str], asyncio.TimerHandle
+        ] = {}
+        # the executor could be shared by event loops of different threads
+        self._lock = threading.Lock()
+
+    async def compute(
+        self,
+        func: str | Callable,
+        *args: typing.Any,  # noqa: ANN401
+        timeout: float | None = None,  # noqa: ASYNC109
+        **kwargs: typing.Any,  # noqa: ANN401
+    ) -> typing.Any:  # noqa: ANN401
+        """Calculate the measure without blocking the event loop.
+
+        Parameters
+        ----------
+        func : str or callable
+            Name of the measure or the public function itself.
+        *args, **kwargs
+            Arguments of the measure.
+        timeout : float, optional
+            Time in seconds to wait for the result.
+
+        Returns
+        -------
+        result : Any
+            Value of the measure.
+
+        Raises
+        ------
+        asyncio.TimeoutError
+            If the result is not ready in time.
+        """
+        name = func if isinstance(func, str) else func.__name__
+        if name not in FUNCTIONS:
+            msg = f"Unknown measure {name}."
+            raise ValueError(msg)
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        key = (loop, name)
+        with self._lock:
+            batch = self._pending.setdefault(key, [])
+            batch.append(((args, kwargs, contextvars.copy_context()), future))
+            full = len(batch) >= self.max_batch
+            if not full and len(batch) == 1:
+                self._timers[key] = loop.call_later(self.max_delay, self._flush, key)
+        if full:
+            self._flush(key)
+        return await asyncio.wait_for(future, timeout)
+
+    def _flush(self, key: tuple[asyncio.AbstractEventLoop, str]) -> None:
+        """Send the pending calls to the pool as one batch."""
+        with self._lock:
+            timer = self._timers.pop(key, None)
+            pending = self._pending.pop(key, [])
+        if timer is not None:
+            timer.cancel()
+        batch = [(call, future) for call, future in pending if not future.cancelled()]
+        if not batch:
+            return
+        loop, name = key
+        futures = [future for _, future in batch]
+        task = loop.run_in_executor(
+            self._pool, _run_batch, name, [call for call, _ in batch]
+        )
+        task.add_done_callback(functools.partial(_resolve, futures))
+
+    def shutdown(self, *, wait: bool = True) -> None:
+        """Stop the worker threads.
+
+        Parameters
+        ----------
+        wait : bool, default = True
+            Wait for the running batches.
+        """
+        self._pool.shutdown(wait=wait, cancel_futures=True)
+
+    def __enter__(self) -> BatchExecutor:  # noqa: PYI034
+        """Use the executor."""
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        """Stop the worker threads."""
+        self.shutdown()
+
+
+def _resolve(futures: Sequence[asyncio.Future], task: asyncio.Future) -> None:
+    """Pass outcomes of the batch to the waiting calls."""
+    outcomes: list[tuple[bool, typing.Any]]
+    if task.cancelled():
+        outcomes = [(False, asyncio.CancelledError())] * len(futures)
+    elif task.exception() is not None:
+        outcomes = [(False, task.exception())] * len(futures)
+    else:
+        outcomes = task.result()
+    for i, future in enumerate(futures):
+        ok, value = outcomes[i]
+        if future.done():
+            # cancelled or timed out while running
+            continue
+        if ok:
+            future.set_result(value)
+        else:
+            future.set_exception(value)
+
+
+_default: BatchExecutor | None = None
+_default_lock = threading.Lock()
+
+
+def _default_executor() -> BatchExecutor:
+    """Create the shared executor on the first call."""
+    global _default  # noqa: PLW0603
+    with _default_lock:
+        if _default is None:
+            _default = BatchExecutor()
+        return _default
+
+
+async def compute(
+    func: str | Callable,
+    *args: typing.Any,  # noqa: ANN401
+    timeout: float | None = None,  # noqa: ASYNC109
+    executor: BatchExecutor | None = None,
+    **kwargs: typing.Any,  # noqa: ANN401
+) -> typing.Any:  # noqa: ANN401
+    """Calculate the measure without blocking the event loop.
+
+    Parameters
+    ----------
+    func : str or callable
+        Name of the measure or the public function itself.
+    *args, **kwargs
+        Arguments of the measure.
+    timeout : float, optional
+        Time in seconds to wait for the result.
+    executor : BatchExecutor, optional
+        Executor of the call, the shared one by default.
+
+    Returns
+    -------
+    result : Any
+        Value of the measure.
+    """
+    executor = executor or _default_executor()
+    return await executor.compute(func, *args, timeout=timeout, **kwargs)
+
+
+def _awaitable(name: str) -> Callable[..., typing.Awaitable[typing.Any]]:
+    """Create the awaitable variant of the measure."""
+    func = FUNCTIONS[name]
+
+    @functools.wraps(func)
+    async def wrapper(*args: typing.Any, **kwargs: typing.Any) -> typing.Any:  # noqa: ANN401
+        return await compute(name, *args, **kwargs)
+
+    return wrapper
+
+
+def __getattr__(name: str) -> Callable[..., typing.Awaitable[typing.Any]]:
+    """Get the awaitable variant of the measure."""
+    if name in FUNCTIONS:
+        wrapper = _awaitable(name)
+        globals()[name] = wrapper
+        return wrapper
+    msg = f"module {__name__!r} has no attribute {name!r}"
+    raise AttributeError(msg)
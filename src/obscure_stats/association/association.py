@@ -5,11 +5,17 @@ from __future__ import annotations
 import warnings
 
 import numpy as np
-from scipy import stats  # type: ignore[import-untyped]
 
-from obscure_stats.dispersion import gini_mean_difference
+from obscure_stats._chunked import _assume_no_nans
+from obscure_stats._utils import _argsort, _lazy_import, _nan_policy
+from obscure_stats.cache import _memoize
+from obscure_stats.profiling import _instrument
 
+dispersion = _lazy_import("obscure_stats.dispersion")
+stats = _lazy_import("scipy.stats")
 
+
+@_instrument(phase="validation")
 def _check_arrays(x: np.ndarray, y: np.ndarray) -> bool:
     """Check arrays.
 
@@ -38,7 +44,9 @@ def _check_arrays(x: np.ndarray, y: np.ndarray) -> bool:
             stacklevel=2,
         )
         return True
-    if (np.isnan(x).sum() >= len(x) - 1) or (np.isnan(y).sum() >= len(x) - 1):
+    if not _assume_no_nans() and (
+        (np.isnan(x).sum() >= len(x) - 1) or (np.isnan(y).sum() >= len(x) - 1)
+    ):
         warnings.warn(
             "One of the input arrays has too many missing values,"
             " please check the arrays.",
@@ -48,16 +56,22 @@ def _check_arrays(x: np.ndarray, y: np.ndarray) -> bool:
     return False
 
 
+@_instrument(phase="validation")
 def _prep_arrays(x: np.ndarray, y: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
     """Prepare data for downstream task."""
-    notnan = ~(np.isnan(x) | np.isnan(y))
     _x = np.asarray(x)
     _y = np.asarray(y)
+    if _assume_no_nans():
+        return _x, _y
+    notnan = ~(np.isnan(x) | np.isnan(y))
     _x = _x[notnan]
     _y = _y[notnan]
     return _x, _y
 
 
+@_instrument
+@_nan_policy
+@_memoize
 def chatterjeexi(x: np.ndarray, y: np.ndarray) -> float:
     """Calculate Xi correlation coefficient.
 
@@ -78,6 +92,9 @@ def chatterjeexi(x: np.ndarray, y: np.ndarray) -> float:
         Input array.
     y : array_like
         Input array.
+    nan_policy : {"propagate", "omit", "raise", "assume_none"}, optional
+        Handling of missing values, the nan_policy setting by default
+        (see obscure_stats.config).
 
     Returns
     -------
@@ -99,7 +116,7 @@ def chatterjeexi(x: np.ndarray, y: np.ndarray) -> float:
     x, y = _prep_arrays(x, y)
     # heavily inspired by https://github.com/czbiohub-sf/xicor/issues/17#issue-965635013
     n = len(x)
-    y_forward_ordered = y[np.argsort(x)]
+    y_forward_ordered = y[_argsort(x)]
     _, y_unique_indexes, y_counts = np.unique(
         y_forward_ordered, return_inverse=True, return_counts=True
     )
@@ -108,6 +125,9 @@ def chatterjeexi(x: np.ndarray, y: np.ndarray) -> float:
     return 1.0 - 0.5 * np.sum(np.abs(np.diff(right))) / np.mean(left * (n - left))
 
 
+@_instrument
+@_nan_policy
+@_memoize
 def concordance_corrcoef(x: np.ndarray, y: np.ndarray) -> float:
     """Calculate concordance correlation coefficient.
 
@@ -123,6 +143,9 @@ def concordance_corrcoef(x: np.ndarray, y: np.ndarray) -> float:
         Input array.
     y : array_like
         Input array.
+    nan_policy : {"propagate", "omit", "raise", "assume_none"}, optional
+        Handling of missing values, the nan_policy setting by default
+        (see obscure_stats.config).
 
     Returns
     -------
@@ -147,6 +170,9 @@ def concordance_corrcoef(x: np.ndarray, y: np.ndarray) -> float:
     return p * x_a
 
 
+@_instrument
+@_nan_policy
+@_memoize
 def concordance_rate(
     x: np.ndarray,
     y: np.ndarray,
@@ -167,6 +193,9 @@ def concordance_rate(
         Input array.
     y : array_like
         Input array.
+    nan_policy : {"propagate", "omit", "raise", "assume_none"}, optional
+        Handling of missing values, the nan_policy setting by default
+        (see obscure_stats.config).
 
     Returns
     -------
@@ -198,6 +227,9 @@ def concordance_rate(
     return (n_q1 + n_q3 - n_q2 - n_q4) / n
 
 
+@_instrument
+@_nan_policy
+@_memoize
 def symmetric_chatterjeexi(x: np.ndarray, y: np.ndarray) -> float:
     """Calculate symmetric Xi correlation coefficient.
 
@@ -218,6 +250,9 @@ def symmetric_chatterjeexi(x: np.ndarray, y: np.ndarray) -> float:
         Input array.
     y : array_like
         Input array.
+    nan_policy : {"propagate", "omit", "raise", "assume_none"}, optional
+        Handling of missing values, the nan_policy setting by default
+        (see obscure_stats.config).
 
     Returns
     -------
@@ -239,14 +274,14 @@ def symmetric_chatterjeexi(x: np.ndarray, y: np.ndarray) -> float:
     x, y = _prep_arrays(x, y)
     n = len(x)
     # y ~ f(x)
-    y_forward_ordered = y[np.argsort(x)]
+    y_forward_ordered = y[_argsort(x)]
     _, y_unique_indexes, y_counts = np.unique(
         y_forward_ordered, return_inverse=True, return_counts=True
     )
     right_xy = np.cumsum(y_counts)[y_unique_indexes]
     left_xy = np.cumsum(y_counts[::-1])[len(y_counts) - y_unique_indexes - 1]
     # x ~ f(y)
-    x_forward_ordered = x[np.argsort(y)]
+    x_forward_ordered = x[_argsort(y)]
     _, x_unique_indexes, x_counts = np.unique(
         x_forward_ordered, return_inverse=True, return_counts=True
     )
@@ -259,6 +294,9 @@ def symmetric_chatterjeexi(x: np.ndarray, y: np.ndarray) -> float:
     )
 
 
+@_instrument
+@_nan_policy
+@_memoize
 def zhangi(x: np.ndarray, y: np.ndarray) -> float:
     """Calculate I correlation coefficient proposed by Q. Zhang.
 
@@ -271,6 +309,9 @@ def zhangi(x: np.ndarray, y: np.ndarray) -> float:
         Input array.
     y : array_like
         Input array.
+    nan_policy : {"propagate", "omit", "raise", "assume_none"}, optional
+        Handling of missing values, the nan_policy setting by default
+        (see obscure_stats.config).
 
     Returns
     -------
@@ -301,6 +342,9 @@ def zhangi(x: np.ndarray, y: np.ndarray) -> float:
     )
 
 
+@_instrument
+@_nan_policy
+@_memoize
 def tanimoto_similarity(x: np.ndarray, y: np.ndarray) -> float:
     """Calculate Tanimoto similarity.
 
@@ -314,6 +358,9 @@ def tanimoto_similarity(x: np.ndarray, y: np.ndarray) -> float:
         Input array.
     y : array_like
         Input array.
+    nan_policy : {"propagate", "omit", "raise", "assume_none"}, optional
+        Handling of missing values, the nan_policy setting by default
+        (see obscure_stats.config).
 
     Returns
     -------
@@ -340,6 +387,9 @@ def tanimoto_similarity(x: np.ndarray, y: np.ndarray) -> float:
     return xy / (xx + yy - xy)
 
 
+@_instrument
+@_nan_policy
+@_memoize
 def blomqvistbeta(x: np.ndarray, y: np.ndarray) -> float:
     """Calculate Blomqvist's beta.
 
@@ -352,6 +402,9 @@ def blomqvistbeta(x: np.ndarray, y: np.ndarray) -> float:
         Input array.
     y : array_like
         Input array.
+    nan_policy : {"propagate", "omit", "raise", "assume_none"}, optional
+        Handling of missing values, the nan_policy setting by default
+        (see obscure_stats.config).
 
     Returns
     -------
@@ -382,6 +435,9 @@ def blomqvistbeta(x: np.ndarray, y: np.ndarray) -> float:
     return np.mean(np.sign((x - med_x) * (y - med_y)))
 
 
+@_instrument
+@_nan_policy
+@_memoize
 def winsorized_correlation(x: np.ndarray, y: np.ndarray, k: float = 0.1) -> float:
     """Calculate winsorized correlation coefficient.
 
@@ -395,6 +451,9 @@ def winsorized_correlation(x: np.ndarray, y: np.ndarray, k: float = 0.1) -> floa
         Input array.
     k : float
         The percentages of values to winsorize on each side of the arrays.
+    nan_policy : {"propagate", "omit", "raise", "assume_none"}, optional
+        Handling of missing values, the nan_policy setting by default
+        (see obscure_stats.config).
 
     Returns
     -------
@@ -419,6 +478,9 @@ def winsorized_correlation(x: np.ndarray, y: np.ndarray, k: float = 0.1) -> floa
     return np.corrcoef(x_w, y_w)[0, 1]
 
 
+@_instrument
+@_nan_policy
+@_memoize
 def rank_minrelation_coefficient(x: np.ndarray, y: np.ndarray) -> float:
     """Calculate rank minrelation coefficient.
 
@@ -432,6 +494,9 @@ def rank_minrelation_coefficient(x: np.ndarray, y: np.ndarray) -> float:
         Input array.
     y : array_like
         Input array.
+    nan_policy : {"propagate", "omit", "raise", "assume_none"}, optional
+        Handling of missing values, the nan_policy setting by default
+        (see obscure_stats.config).
 
     Returns
     -------
@@ -457,14 +522,17 @@ def rank_minrelation_coefficient(x: np.ndarray, y: np.ndarray) -> float:
         return np.nan
     x, y = _prep_arrays(x, y)
     n_sq = len(x) ** 2
-    rank_x_inc = (np.argsort(x) + 1) ** 2 / n_sq - 0.5
-    rank_y_inc = (np.argsort(y) + 1) ** 2 / n_sq - 0.5
-    rank_y_dec = 0.5 - (np.argsort(-y) + 1) ** 2 / n_sq
+    rank_x_inc = (_argsort(x) + 1) ** 2 / n_sq - 0.5
+    rank_y_inc = (_argsort(y) + 1) ** 2 / n_sq - 0.5
+    rank_y_dec = 0.5 - (_argsort(-y) + 1) ** 2 / n_sq
     lower = np.sum((-rank_x_inc < rank_y_inc) * (rank_x_inc + rank_y_inc) ** 2)
     higher = np.sum((rank_x_inc > rank_y_dec) * (rank_x_inc - rank_y_dec) ** 2)
     return (lower - higher) / (lower + higher)
 
 
+@_instrument
+@_nan_policy
+@_memoize
 def tukey_correlation(x: np.ndarray, y: np.ndarray) -> float:
     """Calculate Tukey's correlation coefficient.
 
@@ -477,6 +545,9 @@ def tukey_correlation(x: np.ndarray, y: np.ndarray) -> float:
         Input array.
     y : array_like
         Input array.
+    nan_policy : {"propagate", "omit", "raise", "assume_none"}, optional
+        Handling of missing values, the nan_policy setting by default
+        (see obscure_stats.config).
 
     Returns
     -------
@@ -496,11 +567,11 @@ def tukey_correlation(x: np.ndarray, y: np.ndarray) -> float:
     if _check_arrays(x, y):
         return np.nan
     x, y = _prep_arrays(x, y)
-    s_x = gini_mean_difference(x)
-    s_y = gini_mean_difference(y)
+    s_x = dispersion.gini_mean_difference(x)
+    s_y = dispersion.gini_mean_difference(y)
     x_norm = x / s_x
     y_norm = y / s_y
     return 0.25 * (
-        gini_mean_difference(x_norm + y_norm) ** 2
-        - gini_mean_difference(x_norm - y_norm) ** 2
+        dispersion.gini_mean_difference(x_norm + y_norm) ** 2
+        - dispersion.gini_mean_difference(x_norm - y_norm) ** 2
     )
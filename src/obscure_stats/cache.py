@@ -0,0 +1,313 @@
+"""Module for opt-in memoisation of the measures.
+
+The cache is enabled by the cache_entries setting (see obscure_stats.config)::
+
+    with config_context(cache_entries=1024, cache_dir="/var/cache/stats"):
+        l_skew(x)  # computed, the sorted copy of x is kept
+        l_kurt(x)  # reuses the sorted copy
+        l_skew(x)  # returned from the cache
+
+Values are keyed by a hash of the library version, the function name,
+the contents, dtypes and shapes of the array arguments, the values of the other
+parameters and the settings that change the results or the algorithms
+(dtype_policy, nan_policy, memory_budget and the cost model), so equal arrays hit
+the same entry and modified arrays never do. Entries written to cache_dir by
+other versions of the library are never read. Entries are
+evicted in the least recently used order when there are more than
+cache_entries of them or when they take more than cache_bytes.
+
+Besides the results of the public functions, intermediates shared between
+the measures (sorted copies and sorting permutations) are cached, and they are
+returned as read-only arrays. Numeric results without warnings are also
+written to the on-disk tier in cache_dir (as .npy files without pickling),
+which is shared between processes and is not bounded.
+
+Inputs streamed from disk in blocks (see obscure_stats.config) are not
+cached, as hashing would read the whole file.
+"""
+
+from __future__ import annotations
+
+import collections
+import functools
+import hashlib
+import inspect
+import json
+import pathlib
+import sys
+import tempfile
+import threading
+import typing
+import warnings
+
+import numpy as np
+
+import obscure_stats
+from obscure_stats._chunked import _is_streamed
+from obscure_stats.config import _config
+from obscure_stats.dispatch import _costs
+
+if typing.TYPE_CHECKING:
+    import os
+    from collections.abc import Callable
+
+_F = typing.TypeVar("_F", bound="Callable[..., typing.Any]")
+
+_SCALARS = (type(None), bool, int, float, complex, str, np.generic)
+
+
+class _LRUCache:
+    """Thread-safe LRU cache bounded by number of entries and bytes."""
+
+    def __init__(self) -> None:
+        self._data: collections.OrderedDict[bytes, tuple[typing.Any, int]] = (
+            collections.OrderedDict()
+        )
+        self._lock = threading.Lock()
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: bytes) -> tuple[bool, typing.Any]:
+        """Find the value and mark it as recently used."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return False, None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return True, entry[0]
+
+    def put(self, key: bytes, value: typing.Any, nbytes: int, settings: dict) -> None:  # noqa: ANN401
+        """Store the value and evict the least recently used entries."""
+        if nbytes > settings["cache_bytes"]:
+            return
+        with self._lock:
+            previous = self._data.pop(key, None)
+            if previous is not None:
+                self.nbytes -= previous[1]
+            self._data[key] = (value, nbytes)
+            self.nbytes += nbytes
+            while (
+                len(self._data) > settings["cache_entries"]
+                or self.nbytes > settings["cache_bytes"]
+            ):
+                _, (_, size) = self._data.popitem(last=False)
+                self.nbytes -= size
+
+    def clear(self) -> None:
+        """Drop all entries and reset the counters."""
+        with self._lock:
+            self._data.clear()
+            self.nbytes = self.hits = self.misses = 0
+
+    def __len__(self) -> int:
+        """Count the entries."""
+        return len(self._data)
+
+
+_cache = _LRUCache()
+
+
+def cache_info() -> dict[str, int]:
+    """Get statistics of the in-memory cache.
+
+    Returns
+    -------
+    info : dict
+        Number of entries, bytes, hits and misses.
+    """
+    return {
+        "entries": len(_cache),
+        "bytes": _cache.nbytes,
+        "hits": _cache.hits,
+        "misses": _cache.misses,
+    }
+
+
+def clear_cache(*, disk: bool = False) -> None:
+    """Clear the cache.
+
+    Parameters
+    ----------
+    disk : bool, default = False
+        Also delete the files of the on-disk tier in the current cache_dir.
+    """
+    _cache.clear()
+    directory = _config.get()["cache_dir"]
+    if disk and directory is not None:
+        for path in pathlib.Path(directory).glob("*.npy"):
+            path.unlink(missing_ok=True)
+
+
+def _hash_value(h: typing.Any, value: typing.Any) -> bool:  # noqa: ANN401
+    """Add the value to the hash, return False if it could not be hashed."""
+    if isinstance(value, (list, tuple)) and not all(
+        isinstance(v, _SCALARS) for v in value
+    ):
+        return False
+    if isinstance(value, (np.ndarray, list, tuple)):
+        if isinstance(value, np.ndarray) and _is_streamed(value):
+            return False
+        array = np.ascontiguousarray(value)
+        if array.dtype.kind not in "biufc":
+            return False
+        h.update(f"{type(value).__name__}:{array.dtype.str}:{array.shape}".encode())
+        h.update(array.view(np.uint8).data if array.size else b"")
+        return True
+    if isinstance(value, _SCALARS):
+        h.update(f"{type(value).__name__}:{value!r}".encode())
+        return True
+    return False
+
+
+def _make_key(
+    func: Callable, signature: inspect.Signature, args: tuple, kwargs: dict
+) -> bytes | None:
+    """Hash the call, None if some of the arguments could not be hashed."""
+    bound = signature.bind(*args, **kwargs)
+    bound.apply_defaults()
+    if bound.arguments.get("overwrite_input"):
+        return None
+    settings = _config.get()
+    h = hashlib.sha256()
+    # results of other versions are not reused, e.g. from the on-disk tier
+    h.update(obscure_stats.__version__.encode())
+    h.update(f"{func.__module__}.{func.__qualname__}".encode())
+    # results depend on the precision of the temporaries and on missing values
+    h.update(settings["dtype_policy"].encode())
+    h.update(settings["nan_policy"].encode())
+    # algorithms are chosen by the memory budget and the cost model,
+    # they could differ in the last digits
+    h.update(f"{settings['memory_budget']}".encode())
+    h.update(json.dumps(_costs(), sort_keys=True).encode())
+    for name, value in bound.arguments.items():
+        # scratch buffers do not change the results
+        if name == "buffer":
+            continue
+        h.update(name.encode())
+        if not _hash_value(h, value):
+            return None
+    return h.digest()
+
+
+def _nbytes(value: typing.Any) -> int:  # noqa: ANN401
+    """Estimate memory taken by the value."""
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    return sys.getsizeof(value)
+
+
+def _load(directory: str | os.PathLike, key: bytes) -> tuple[bool, typing.Any]:
+    """Read the value from the on-disk tier."""
+    path = pathlib.Path(directory) / f"{key.hex()}.npy"
+    try:
+        value = np.load(path, allow_pickle=False)
+    except (OSError, ValueError):
+        return False, None
+    return True, value[()] if value.ndim == 0 else value
+
+
+def _save(directory: str | os.PathLike, key: bytes, value: typing.Any) -> None:  # noqa: ANN401
+    """Write numeric value to the on-disk tier, other values are skipped."""
+    array = np.asarray(value)
+    if array.dtype.kind not in "biufc":
+        return
+    folder = pathlib.Path(directory)
+    folder.mkdir(parents=True, exist_ok=True)
+    # written under a temporary name, so readers never see partial files
+    with tempfile.NamedTemporaryFile(dir=folder, suffix=".tmp", delete=False) as fh:
+        np.save(fh, array, allow_pickle=False)
+    pathlib.Path(fh.name).replace(folder / f"{key.hex()}.npy")
+
+
+def _copy(value: typing.Any) -> typing.Any:  # noqa: ANN401
+    """Copy mutable results."""
+    return value.copy() if isinstance(value, np.ndarray) else value
+
+
+def _read_only(value: typing.Any) -> typing.Any:  # noqa: ANN401
+    """Protect the shared intermediate from modification."""
+    if isinstance(value, np.ndarray):
+        value = value.view()
+        value.flags.writeable = False
+    return value
+
+
+def _intermediate(
+    func: Callable, key: bytes, settings: dict, args: tuple, kwargs: dict
+) -> typing.Any:  # noqa: ANN401
+    """Get the shared intermediate from memory or compute it."""
+    found, value = _cache.get(key)
+    if not found:
+        value = _read_only(func(*args, **kwargs))
+        _cache.put(key, value, _nbytes(value), settings)
+    return value
+
+
+def _result(
+    func: Callable, key: bytes, settings: dict, args: tuple, kwargs: dict
+) -> typing.Any:  # noqa: ANN401
+    """Get the result from memory, disk or compute it, replaying its warnings."""
+    found, entry = _cache.get(key)
+    directory = settings["cache_dir"]
+    if not found and directory is not None:
+        found, value = _load(directory, key)
+        entry = (value, [])
+        if found:
+            _cache.put(key, entry, _nbytes(value), settings)
+    if not found:
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter("always")
+            value = _copy(func(*args, **kwargs))
+        entry = (value, [(w.message, w.category) for w in caught])
+        _cache.put(key, entry, _nbytes(value), settings)
+        if directory is not None and not caught:
+            _save(directory, key, value)
+    value, caught_warnings = entry
+    for message, category in caught_warnings:
+        warnings.warn(message, category, stacklevel=3)
+    return _copy(value)
+
+
+@typing.overload
+def _memoize(func: _F) -> _F: ...
+
+
+@typing.overload
+def _memoize(*, intermediate: bool) -> Callable[[_F], _F]: ...
+
+
+def _memoize(
+    func: _F | None = None, *, intermediate: bool = False
+) -> _F | Callable[[_F], _F]:
+    """Cache values of the function while the cache is enabled.
+
+    Used as @_memoize for the public functions (results are copied,
+    warnings are replayed, the on-disk tier is used) or as
+    @_memoize(intermediate=True) for shared helpers
+    (results are read-only and kept only in memory).
+    Calls that may overwrite the input are not cached.
+    """
+
+    def decorator(f: _F) -> _F:
+        signature = inspect.signature(f)
+
+        @functools.wraps(f)
+        def wrapper(*args: typing.Any, **kwargs: typing.Any) -> typing.Any:  # noqa: ANN401
+            settings = _config.get()
+            if not settings["cache_entries"]:
+                return f(*args, **kwargs)
+            key = _make_key(f, signature, args, kwargs)
+            if key is None:
+                return f(*args, **kwargs)
+            if intermediate:
+                return _intermediate(f, key, settings, args, kwargs)
+            return _result(f, key, settings, args, kwargs)
+
+        return typing.cast("_F", wrapper)
+
+    if func is None:
+        return decorator
+    return decorator(func)
@@ -1,12 +1,45 @@
 """Module for measures of central tendency."""
 
-import math
+from __future__ import annotations
 
-import numpy as np
-from scipy import stats  # type: ignore[import-untyped]
+import functools
+import typing
 
+import numpy as np
 
-def midrange(x: np.ndarray) -> float:
+from obscure_stats._utils import (
+    _finite,
+    _lazy_import,
+    _lerp,
+    _nan_policy,
+    _pairwise_median,
+    _partition,
+    _scratch,
+    _sort,
+    _tail_sums,
+)
+from obscure_stats._weighted import (
+    _compress,
+    _sample_quantiles,
+    _sample_stats,
+    _weighted_pairwise_median,
+    _weighted_quantiles,
+    _weighted_tail_sums,
+)
+from obscure_stats.cache import _memoize
+from obscure_stats.profiling import _instrument
+
+sparse = _lazy_import("scipy.sparse")
+stats = _lazy_import("scipy.stats")
+
+if typing.TYPE_CHECKING:
+    from scipy.sparse import csr_matrix  # type: ignore[import-untyped]
+
+
+@_instrument
+@_nan_policy
+@_memoize
+def midrange(x: np.ndarray, *, weights: np.ndarray | None = None) -> float:
     """Calculate midrange or midpoint, i.e. average between min and max.
 
     This measure could be noisy since it is based on minimum and maximum.
@@ -15,6 +48,12 @@ def midrange(x: np.ndarray) -> float:
     ----------
     x : array_like
         Input array.
+    weights : array_like, optional
+        Frequency weights (numbers of occurrences) of the values,
+        the sample is processed without expanding it.
+    nan_policy : {"propagate", "omit", "raise", "assume_none"}, optional
+        Handling of missing values, the nan_policy setting by default
+        (see obscure_stats.config).
 
     Returns
     -------
@@ -27,12 +66,20 @@ def midrange(x: np.ndarray) -> float:
     The Oxford dictionary of Statistical Terms.
     Oxford University Press.
     """
-    maximum = np.nanmax(x)
-    minimum = np.nanmin(x)
+    maximum, minimum = _sample_stats(x, "max", "min", weights=weights)
     return (maximum + minimum) * 0.5
 
 
-def midhinge(x: np.ndarray) -> float:
+@_instrument
+@_nan_policy
+@_memoize
+def midhinge(
+    x: np.ndarray,
+    *,
+    overwrite_input: bool = False,
+    buffer: np.ndarray | None = None,
+    weights: np.ndarray | None = None,
+) -> float:
     """Calculate midhinge, i.e. average between 1st and 3rd quartile.
 
     This measure is more robust then average.
@@ -41,6 +88,19 @@ def midhinge(x: np.ndarray) -> float:
     ----------
     x : array_like
         Input array.
+    overwrite_input : bool, default = False
+        If True, the input array is sorted or partitioned in place
+        and its contents are undefined after the call.
+    buffer : np.ndarray, optional
+        Writeable 1-d array of at least x.size elements, the values are
+        copied into it and reordered there instead of a new array,
+        so one buffer could be reused by many calls.
+    weights : array_like, optional
+        Frequency weights (numbers of occurrences) of the values,
+        the sample is processed without expanding it.
+    nan_policy : {"propagate", "omit", "raise", "assume_none"}, optional
+        Handling of missing values, the nan_policy setting by default
+        (see obscure_stats.config).
 
     Returns
     -------
@@ -53,11 +113,26 @@ def midhinge(x: np.ndarray) -> float:
     Exploratory Data Analysis.
     Addison-Wesley.
     """
-    q1, q3 = np.nanquantile(x, [0.25, 0.75])
+    q1, q3 = _sample_quantiles(
+        x,
+        [0.25, 0.75],
+        overwrite_input=overwrite_input,
+        buffer=buffer,
+        weights=weights,
+    )
     return (q3 + q1) * 0.5
 
 
-def trimean(x: np.ndarray) -> float:
+@_instrument
+@_nan_policy
+@_memoize
+def trimean(
+    x: np.ndarray,
+    *,
+    overwrite_input: bool = False,
+    buffer: np.ndarray | None = None,
+    weights: np.ndarray | None = None,
+) -> float:
     """Calculate trimean, i.e weighted average between 3 quartiles.
 
     This measure is more robust then average.
@@ -66,6 +141,19 @@ def trimean(x: np.ndarray) -> float:
     ----------
     x : array_like
         Input array.
+    overwrite_input : bool, default = False
+        If True, the input array is sorted or partitioned in place
+        and its contents are undefined after the call.
+    buffer : np.ndarray, optional
+        Writeable 1-d array of at least x.size elements, the values are
+        copied into it and reordered there instead of a new array,
+        so one buffer could be reused by many calls.
+    weights : array_like, optional
+        Frequency weights (numbers of occurrences) of the values,
+        the sample is processed without expanding it.
+    nan_policy : {"propagate", "omit", "raise", "assume_none"}, optional
+        Handling of missing values, the nan_policy setting by default
+        (see obscure_stats.config).
 
     Returns
     -------
@@ -78,11 +166,20 @@ def trimean(x: np.ndarray) -> float:
     Exploratory Data Analysis.
     Addison-Wesley.
     """
-    q1, q2, q3 = np.nanquantile(x, [0.25, 0.5, 0.75])
+    q1, q2, q3 = _sample_quantiles(
+        x,
+        [0.25, 0.5, 0.75],
+        overwrite_input=overwrite_input,
+        buffer=buffer,
+        weights=weights,
+    )
     return 0.5 * q2 + 0.25 * q1 + 0.25 * q3
 
 
-def contraharmonic_mean(x: np.ndarray) -> float:
+@_instrument
+@_nan_policy
+@_memoize
+def contraharmonic_mean(x: np.ndarray, *, weights: np.ndarray | None = None) -> float:
     """Calculate contraharmonic mean.
 
     Contraharmonic mean is a function complementary to the harmonic mean.
@@ -93,6 +190,12 @@ def contraharmonic_mean(x: np.ndarray) -> float:
     ----------
     x : array_like
         Input array.
+    weights : array_like, optional
+        Frequency weights (numbers of occurrences) of the values,
+        the sample is processed without expanding it.
+    nan_policy : {"propagate", "omit", "raise", "assume_none"}, optional
+        Handling of missing values, the nan_policy setting by default
+        (see obscure_stats.config).
 
     Returns
     -------
@@ -105,10 +208,20 @@ def contraharmonic_mean(x: np.ndarray) -> float:
     Handbook of means and their inequalities.
     Springer.
     """
-    return np.nansum(np.square(x)) / np.nansum(x)
-
-
-def midmean(x: np.ndarray) -> float:
+    sumsq, total = _sample_stats(x, "sumsq", "sum", weights=weights)
+    return sumsq / total
+
+
+@_instrument
+@_nan_policy
+@_memoize
+def midmean(
+    x: np.ndarray,
+    *,
+    overwrite_input: bool = False,
+    buffer: np.ndarray | None = None,
+    weights: np.ndarray | None = None,
+) -> float:
     """Calculate interquartile mean, i.e mean inside interquartile range.
 
     This measure is more robust then average.
@@ -117,6 +230,19 @@ def midmean(x: np.ndarray) -> float:
     ----------
     x : array_like
         Input array.
+    overwrite_input : bool, default = False
+        If True, the input array is sorted or partitioned in place
+        and its contents are undefined after the call.
+    buffer : np.ndarray, optional
+        Writeable 1-d array of at least x.size elements, the values are
+        copied into it and reordered there instead of a new array,
+        so one buffer could be reused by many calls.
+    weights : array_like, optional
+        Frequency weights (numbers of occurrences) of the values,
+        the sample is processed without expanding it.
+    nan_policy : {"propagate", "omit", "raise", "assume_none"}, optional
+        Handling of missing values, the nan_policy setting by default
+        (see obscure_stats.config).
 
     Returns
     -------
@@ -129,11 +255,29 @@ def midmean(x: np.ndarray) -> float:
     Encyclopedia of Research Design.
     SAGE Publications, Inc.
     """
-    q1, q3 = np.nanquantile(x, [0.25, 0.75])
-    return np.nanmean(np.where((x >= q1) & (x <= q3), x, np.nan))
-
-
-def hodges_lehmann_sen_location(x: np.ndarray) -> float:
+    if weights is not None:
+        xs, ws, _ = _compress(x, weights)
+        if not len(xs):
+            return np.nan
+        qs = _weighted_quantiles(x, weights, [0.25, 0.75])
+        sums, counts = _weighted_tail_sums(xs, ws, qs, [True, False])
+        return (sums.sum() - ws @ xs) / (counts.sum() - ws.sum())
+    _x, owned = _scratch(x, overwrite_input=overwrite_input, buffer=buffer)
+    xs, lo, hi, gamma = _partition(_x, [0.25, 0.75], overwrite_input=owned)
+    if not len(xs):
+        return np.nan
+    qs = _lerp(xs[lo], xs[hi], gamma)
+    # x >= q1 and x <= q3 cover the whole sample and intersect in the IQR
+    sums, counts = _tail_sums(xs, lo, hi, qs, [True, False])
+    return (sums.sum() - np.sum(xs, dtype=np.float64)) / (counts.sum() - len(xs))
+
+
+@_instrument
+@_nan_policy
+@_memoize
+def hodges_lehmann_sen_location(
+    x: np.ndarray, *, weights: np.ndarray | None = None
+) -> float:
     """Calculate Hodges-Lehmann-Sen robust location measure (pseudomedian).
 
     This measure is more robust then average.
@@ -142,6 +286,12 @@ def hodges_lehmann_sen_location(x: np.ndarray) -> float:
     ----------
     x : array_like
         Input array.
+    weights : array_like, optional
+        Frequency weights (numbers of occurrences) of the values,
+        the sample is processed without expanding it.
+    nan_policy : {"propagate", "omit", "raise", "assume_none"}, optional
+        Handling of missing values, the nan_policy setting by default
+        (see obscure_stats.config).
 
     Returns
     -------
@@ -161,17 +311,100 @@ def hodges_lehmann_sen_location(x: np.ndarray) -> float:
 
     Notes
     -----
-    This implementation uses cartesian product, so the time and memory complexity
-    are N^2. It is best to not use it on large arrays.
+    Small arrays are processed over the cartesian product (time and memory
+    complexity are N^2), larger ones by selection in the implicitly sorted
+    matrix of pairs (time complexity is N log^2 N, memory complexity is N),
+    see obscure_stats.dispatch.
     """
     # In the original paper authors suggest use only upper triangular
     # of the cartesian product, but in this implementation we use
     # whole matrix, which is equvalent.
-    product = np.meshgrid(x, x, sparse=True)
-    return np.nanmedian(product[0] + product[1]) * 0.5
+    if weights is not None:
+        return _weighted_pairwise_median(x, weights, sums=True) * 0.5
+    return _pairwise_median(x, sums=True) * 0.5
+
+
+def _thd_window(
+    n: int, q: np.ndarray
+) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Calculate beta parameters and the trimmed windows of the quantiles."""
+    n_calculated = 1 / n**0.5  # heuristic suggested by the author
+    a = (n + 1) * q
+    b = (n + 1) * (1.0 - q)
+    hdi = np.c_[
+        np.maximum(0, q - n_calculated * 0.5), np.minimum(1, q + n_calculated * 0.5)
+    ]
+    hdi_cdf = stats.beta.cdf(hdi, a[:, None], b[:, None])
+    return a, b, hdi, hdi_cdf
+
 
+def _thd_weights(n: int, qs: tuple[float, ...]) -> csr_matrix:
+    """Get sparse matrix of Trimmed Harrell-Davis weights.
 
-def standard_trimmed_harrell_davis_quantile(x: np.ndarray, q: float = 0.5) -> float:
+    A new matrix is built on every call over the cached read-only arrays,
+    so callers could not change the weights of the later calls.
+    """
+    return sparse.csr_matrix(_thd_weight_arrays(n, qs), shape=(len(qs), n))
+
+
+@functools.lru_cache(maxsize=128)
+def _thd_weight_arrays(
+    n: int, qs: tuple[float, ...]
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Calculate data, indices and indptr of the Trimmed Harrell-Davis weights."""
+    q = np.asarray(qs)
+    a, b, hdi, hdi_cdf = _thd_window(n, q)
+    i_start = np.floor(hdi[:, 0] * n).astype(int)
+    i_end = np.ceil(hdi[:, 1] * n).astype(int)
+    # every row has weights for indexes [i_start, i_end) of the sorted sample,
+    # calculated as differences of the beta CDF in the i_end - i_start + 1 nodes
+    sizes = i_end - i_start + 1
+    rows = np.repeat(np.arange(len(q)), sizes)
+    starts = np.cumsum(sizes) - sizes
+    cols = i_start[rows] + np.arange(len(rows)) - starts[rows]
+    nums = np.clip(cols / n, hdi[rows, 0], hdi[rows, 1])
+    cdfs = (stats.beta.cdf(nums, a[rows], b[rows]) - hdi_cdf[rows, 0]) / (
+        hdi_cdf[rows, 1] - hdi_cdf[rows, 0]
+    )
+    w = np.diff(cdfs)
+    keep = np.ones(len(w), dtype=bool)
+    keep[starts[1:] - 1] = False
+    weights = sparse.csr_matrix(
+        (w[keep], (rows[:-1][keep], cols[:-1][keep])),
+        shape=(len(q), n),
+    )
+    arrays = (weights.data, weights.indices, weights.indptr)
+    for array in arrays:
+        array.flags.writeable = False
+    return arrays
+
+
+def _thd_block_weights(n: int, q: np.ndarray, ends: np.ndarray) -> np.ndarray:
+    """Calculate Trimmed Harrell-Davis weights of the blocks of tied order statistics.
+
+    Weights of the order statistics are differences of the beta CDF
+    in the nodes, so weights of the block [start, end) sum up to the difference
+    of the CDF in its ends.
+    """
+    a, b, hdi, hdi_cdf = _thd_window(n, q)
+    nodes = np.clip(np.r_[0, ends][None, :] / n, hdi[:, :1], hdi[:, 1:])
+    cdfs = (stats.beta.cdf(nodes, a[:, None], b[:, None]) - hdi_cdf[:, :1]) / (
+        hdi_cdf[:, 1:] - hdi_cdf[:, :1]
+    )
+    return np.diff(cdfs, axis=1)
+
+
+@_instrument
+@_nan_policy
+@_memoize
+def standard_trimmed_harrell_davis_quantile(
+    x: np.ndarray,
+    q: float | np.ndarray = 0.5,
+    *,
+    overwrite_input: bool = False,
+    buffer: np.ndarray | None = None,
+    weights: np.ndarray | None = None,
+) -> float | np.ndarray:
     """Calculate Standard Trimmed Harrell-Davis median estimator.
 
     This measure is very robust.
@@ -182,13 +415,27 @@ def standard_trimmed_harrell_davis_quantile(x: np.ndarray, q: float = 0.5) -> fl
     ----------
     x : array_like
         Input array.
-    q : float
-        Quantile value in range (0, 1).
+    q : float or array_like
+        Quantile value or values in range (0, 1).
+    overwrite_input : bool, default = False
+        If True, the input array is sorted or partitioned in place
+        and its contents are undefined after the call.
+    buffer : np.ndarray, optional
+        Writeable 1-d array of at least x.size elements, the values are
+        copied into it and reordered there instead of a new array,
+        so one buffer could be reused by many calls.
+    weights : array_like, optional
+        Frequency weights (numbers of occurrences) of the values,
+        the sample is processed without expanding it.
+    nan_policy : {"propagate", "omit", "raise", "assume_none"}, optional
+        Handling of missing values, the nan_policy setting by default
+        (see obscure_stats.config).
 
     Returns
     -------
-    thdq : float
-        The value of Trimmed Harrell-Davis quantile.
+    thdq : float or np.ndarray
+        The value of Trimmed Harrell-Davis quantile. If q is an array,
+        the array of values of the same shape is returned.
 
     References
     ----------
@@ -197,34 +444,44 @@ def standard_trimmed_harrell_davis_quantile(x: np.ndarray, q: float = 0.5) -> fl
     the highest density interval of the given width.
     Communications in Statistics - Simulation and Computation, pp. 1-11.
 
+    Notes
+    -----
+    Weights of all quantiles form a sparse matrix, which is cached for the
+    given sample size and quantile grid, so repeated calls on samples of the same
+    size reduce to the sorting and one sparse matrix-vector product.
+
     See Also
     --------
     scipy.stats.mstats.hdquantiles - Harrell-Davis quantile estimates.
     """
-    if q <= 0 or q >= 1:
+    _q = np.asarray(q, dtype=np.float64)
+    if np.any(_q <= 0) or np.any(_q >= 1):
         msg = "Parameter q should be in range (0, 1)."
         raise ValueError(msg)
-    xs = np.sort(x)
-    xs = xs[np.isfinite(xs)]
-    n = len(xs)
+    if weights is not None:
+        xs, ws, _ = _compress(x, weights)
+        finite = np.isfinite(xs)
+        xs, ws = xs[finite], ws[finite]
+        n = int(ws.sum())
+    else:
+        _x, owned = _scratch(x, overwrite_input=overwrite_input, buffer=buffer)
+        xs = _finite(_sort(_x, overwrite_input=owned))
+        n = len(xs)
     if n <= 1:
-        return xs[0]
-    n_calculated = 1 / n**0.5  # heuristic suggested by the author
-    a = (n + 1) * q
-    b = (n + 1) * (1.0 - q)
-    hdi = (max(0, q - n_calculated * 0.5), min(1, q + n_calculated * 0.5))
-    hdi_cdf = stats.beta.cdf(hdi, a, b)
-    i_start = int(math.floor(hdi[0] * n))
-    i_end = int(math.ceil(hdi[1] * n))
-    nums = np.arange(i_start, i_end + 1) / n
-    nums[nums <= hdi[0]] = hdi[0]
-    nums[nums >= hdi[1]] = hdi[1]
-    cdfs = (stats.beta.cdf(nums, a, b) - hdi_cdf[0]) / (hdi_cdf[1] - hdi_cdf[0])
-    w = cdfs[1:] - cdfs[:-1]
-    return np.sum(xs[i_start:i_end] * w)
-
-
-def half_sample_mode(x: np.ndarray) -> float:
+        return xs[0] if _q.ndim == 0 else np.full(_q.shape, xs[0])
+    if weights is not None:
+        thdq = _thd_block_weights(n, _q.ravel(), np.cumsum(ws)) @ xs
+    else:
+        thdq = _thd_weights(n, tuple(_q.ravel().tolist())) @ xs
+    return thdq[0] if _q.ndim == 0 else thdq.reshape(_q.shape)
+
+
+@_instrument
+@_nan_policy
+@_memoize
+def half_sample_mode(
+    x: np.ndarray, *, overwrite_input: bool = False, buffer: np.ndarray | None = None
+) -> float:
     """Calculate half sample mode.
 
     This estimator is more stable than regular mode estimation,
@@ -234,6 +491,16 @@ def half_sample_mode(x: np.ndarray) -> float:
     ----------
     x : array_like
         Input array.
+    overwrite_input : bool, default = False
+        If True, the input array is sorted or partitioned in place
+        and its contents are undefined after the call.
+    buffer : np.ndarray, optional
+        Writeable 1-d array of at least x.size elements, the values are
+        copied into it and reordered there instead of a new array,
+        so one buffer could be reused by many calls.
+    nan_policy : {"propagate", "omit", "raise", "assume_none"}, optional
+        Handling of missing values, the nan_policy setting by default
+        (see obscure_stats.config).
 
     Returns
     -------
@@ -251,18 +518,15 @@ def half_sample_mode(x: np.ndarray) -> float:
     scipy.stats.mode - Mode estimator.
     """
     # heavily inspired by https://github.com/cran/modeest/blob/master/R/hsm.R
-    y = np.sort(x)
-    y = y[np.isfinite(y)]
+    _x, owned = _scratch(x, overwrite_input=overwrite_input, buffer=buffer)
+    y = _finite(_sort(_x, overwrite_input=owned))
     _corner_cases = (4, 3)  # for 4 samples and 3 samples
     while (ny := len(y)) >= _corner_cases[0]:
         half_y = ny // 2
-        w_min = y[-1] - y[0]
-        for i in range(ny - half_y):
-            w = y[i + half_y - 1] - y[i]
-            if w <= w_min:
-                w_min = w
-                j = i
-        if w == 0:
+        w = y[half_y - 1 : ny - 1] - y[: ny - half_y]
+        # the last of the narrowest windows
+        j = len(w) - 1 - np.argmin(w[::-1])
+        if w[j] == 0:
             return y[j]
         y = y[j : (j + half_y - 1)]
     if len(y) == _corner_cases[1]:
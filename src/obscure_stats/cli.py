@@ -0,0 +1,429 @@
+"""Command line interface.
+
+Usage examples::
+
+    python -m obscure_stats describe data.csv dump.npy --stats midhinge,trimean
+    python -m obscure_stats describe col.bin --format raw --dtype float32 -j 4
+    python -m obscure_stats serve --workers 4
+    python -m obscure_stats list
+    python -m obscure_stats calibrate -o costs.json
+
+Every column is spooled into a temporary binary file and memory-mapped, so
+the moment and quantile based measures are computed block by block within
+the memory budget (see obscure_stats.config).
+"""
+
+from __future__ import annotations
+
+import argparse
+import concurrent.futures
+import csv
+import functools
+import itertools
+import json
+import math
+import pathlib
+import sys
+import tempfile
+import time
+import typing
+import warnings
+
+import numpy as np
+
+from obscure_stats._registry import ESTIMATORS
+from obscure_stats._utils import _shared_nan_policy
+from obscure_stats.client import DEFAULT_SOCKET
+from obscure_stats.config import NAN_POLICIES, config_context, get_config
+from obscure_stats.dispatch import calibrate, crossovers
+
+if typing.TYPE_CHECKING:
+    from collections.abc import Iterator, Sequence
+
+# measures computed by the blockwise (mergeable or exact quantile) kernels
+DEFAULT_STATISTICS = (
+    "bowley_skew",
+    "coefficient_of_range",
+    "coefficient_of_variation",
+    "contraharmonic_mean",
+    "crow_siddiqui_kurt",
+    "kelly_skew",
+    "midhinge",
+    "midrange",
+    "moors_octile_kurt",
+    "quartile_coefficient_of_dispersion",
+    "studentized_range",
+    "trimean",
+)
+FORMATS = ("auto", "csv", "npy", "raw")
+
+
+def _parse_statistics(value: str) -> list[str]:
+    """Parse comma separated names of the statistics."""
+    if value == "all":
+        return sorted(ESTIMATORS)
+    names = [name.strip() for name in value.split(",") if name.strip()]
+    unknown = [name for name in names if name not in ESTIMATORS]
+    if unknown or not names:
+        msg = f"Unknown statistics {unknown}, use `list` command to see all of them."
+        raise argparse.ArgumentTypeError(msg)
+    return names
+
+
+def _detect_format(path: pathlib.Path, file_format: str) -> str:
+    """Choose the reader by the file extension."""
+    if file_format != "auto":
+        return file_format
+    if path.suffix == ".npy":
+        return "npy"
+    if path.suffix in {".csv", ".tsv", ".txt"}:
+        return "csv"
+    return "raw"
+
+
+def _read_csv(
+    path: pathlib.Path, delimiter: str, chunk_size: int
+) -> tuple[list[str], Iterator[np.ndarray]]:
+    """Read column names and an iterator over the chunks of rows."""
+    with path.open(newline="") as fh:
+        first = fh.readline()
+    # quoted names are unquoted as by the csv readers
+    fields = [
+        field.strip()
+        for row in csv.reader([first], delimiter=delimiter)
+        for field in row
+    ]
+    try:
+        [float(field) for field in fields if field]
+    except ValueError:
+        names = fields
+        header = True
+    else:
+        names = [str(i) for i in range(len(fields))]
+        header = False
+
+    def chunks() -> Iterator[np.ndarray]:
+        with path.open() as fh:
+            lines = itertools.islice(fh, int(header), None)
+            while batch := list(itertools.islice(lines, chunk_size)):
+                chunk = np.genfromtxt(batch, delimiter=delimiter, dtype=np.float64)
+                yield chunk.reshape(-1, len(names))
+
+    return names, chunks()
+
+
+def _read_array(
+    path: pathlib.Path, file_format: str, dtype: str, n_columns: int, chunk_size: int
+) -> tuple[list[str], Iterator[np.ndarray]] | np.ndarray:
+    """Memory-map binary data, 1-d data is returned as is."""
+    if file_format == "npy":
+        data = np.load(path, mmap_mode="r")
+    elif path.stat().st_size:
+        data = np.memmap(path, dtype=dtype, mode="r").reshape(-1, n_columns)
+    else:
+        data = np.empty((0, n_columns), dtype=dtype)
+    if data.ndim == 1 or data.shape[1] == 1:
+        return data.reshape(-1)
+    data = data.reshape(len(data), -1)
+    names = [str(i) for i in range(data.shape[1])]
+    chunks = (
+        data[start : start + chunk_size] for start in range(0, len(data), chunk_size)
+    )
+    return names, chunks
+
+
+def _spool(
+    names: list[str], chunks: Iterator[np.ndarray], directory: str
+) -> dict[str, np.ndarray]:
+    """Write chunks of rows into per column files and memory-map them."""
+    paths = [pathlib.Path(directory) / f"{i}.bin" for i in range(len(names))]
+    handles = [p.open("wb") for p in paths]
+    try:
+        for chunk in chunks:
+            for i, fh in enumerate(handles):
+                np.ascontiguousarray(chunk[:, i], dtype=np.float64).tofile(fh)
+    finally:
+        for fh in handles:
+            fh.close()
+    return {
+        name: np.memmap(paths[i], dtype=np.float64, mode="r")
+        if paths[i].stat().st_size
+        else np.empty(0)
+        for i, name in enumerate(names)
+    }
+
+
+def _to_json(value: typing.Any) -> typing.Any:  # noqa: ANN401
+    """Convert the statistic to a JSON value, non-finite values become null."""
+    try:
+        value = float(value)
+    except (TypeError, ValueError):
+        return str(value)
+    return value if math.isfinite(value) else None
+
+
+def _describe_column(x: np.ndarray, statistics: Sequence[str]) -> dict:
+    """Calculate the statistics of one column with timings.
+
+    The column is checked for missing values once for all the statistics.
+    """
+    result: dict[str, typing.Any] = {
+        "count": len(x),
+        "statistics": {},
+        "timings": {},
+    }
+    policy = _shared_nan_policy(x)
+    for name in statistics:
+        start = time.perf_counter()
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter("always")
+            try:
+                with config_context(nan_policy=policy):
+                    value = _to_json(ESTIMATORS[name](x))
+            except Exception as e:  # noqa: BLE001
+                result.setdefault("errors", {})[name] = str(e)
+                value = None
+        result["timings"][name] = time.perf_counter() - start
+        result["statistics"][name] = value
+        if caught:
+            result.setdefault("warnings", {})[name] = [str(w.message) for w in caught]
+    return result
+
+
+def describe_file(  # noqa: PLR0913
+    path: str | pathlib.Path,
+    statistics: Sequence[str] = DEFAULT_STATISTICS,
+    *,
+    file_format: str = "auto",
+    dtype: str = "float64",
+    n_columns: int = 1,
+    delimiter: str = ",",
+    columns: Sequence[str] | None = None,
+    chunk_size: int = 65536,
+    memory_budget: int | None = None,
+    nan_policy: str | None = None,
+) -> dict:
+    """Calculate the statistics of every column of the file.
+
+    Parameters
+    ----------
+    path : str or Path
+        CSV, .npy or raw binary file.
+    statistics : sequence of str
+        Names of the statistics, see ESTIMATORS.
+    file_format : str, default = "auto"
+        One of "auto" (by the extension), "csv", "npy" or "raw".
+    dtype : str, default = "float64"
+        Data type of raw binary files.
+    n_columns : int, default = 1
+        Number of columns of raw binary files (stored row by row).
+    delimiter : str, default = ","
+        Delimiter of CSV files.
+    columns : sequence of str, optional
+        Names (or indexes for files without header) of the columns to describe.
+    chunk_size : int, default = 65536
+        Number of rows read at once.
+    memory_budget : int, optional
+        Bytes of temporary memory for blockwise processing.
+    nan_policy : {"propagate", "omit", "raise", "assume_none"}, optional
+        Handling of missing values, the nan_policy setting by default.
+
+    Returns
+    -------
+    report : dict
+        Number of rows, values, timings (in seconds) and warnings
+        of the statistics for every column.
+    """
+    path = pathlib.Path(path)
+    file_format = _detect_format(path, file_format)
+    settings: dict[str, typing.Any] = {}
+    if memory_budget is not None:
+        settings["memory_budget"] = memory_budget
+    if nan_policy is not None:
+        settings["nan_policy"] = nan_policy
+    report: dict[str, typing.Any] = {"file": str(path), "columns": {}}
+    with config_context(**settings), tempfile.TemporaryDirectory() as directory:
+        start = time.perf_counter()
+        if file_format == "csv":
+            data: typing.Any = _read_csv(path, delimiter, chunk_size)
+        else:
+            data = _read_array(path, file_format, dtype, n_columns, chunk_size)
+        if isinstance(data, np.ndarray):
+            table = {"0": data}
+        else:
+            names, chunks = data
+            table = _spool(names, chunks, directory)
+        report["read_time"] = time.perf_counter() - start
+        for name in columns or table:
+            if name not in table:
+                msg = f"Column {name} is not found in {path}."
+                raise ValueError(msg)
+            report["columns"][name] = _describe_column(table[name], statistics)
+    return report
+
+
+def _describe(args: argparse.Namespace) -> int:
+    """Run describe command."""
+    func = functools.partial(
+        describe_file,
+        statistics=args.stats,
+        file_format=args.format,
+        dtype=args.dtype,
+        n_columns=args.n_columns,
+        delimiter=args.delimiter,
+        columns=args.columns.split(",") if args.columns else None,
+        chunk_size=args.chunk_size,
+        memory_budget=args.memory_budget,
+        nan_policy=args.nan_policy,
+    )
+    try:
+        if args.jobs > 1 and len(args.files) > 1:
+            with concurrent.futures.ProcessPoolExecutor(args.jobs) as executor:
+                reports = list(executor.map(func, args.files))
+        else:
+            reports = [func(path) for path in args.files]
+    except (OSError, ValueError) as e:
+        sys.stderr.write(f"obscure_stats: error: {e}\n")
+        return 1
+    text = json.dumps(reports, indent=2) + "\n"
+    if args.output:
+        pathlib.Path(args.output).write_text(text)
+    else:
+        sys.stdout.write(text)
+    return 0
+
+
+def _serve(args: argparse.Namespace) -> int:
+    """Run serve command."""
+    # the server imports this module
+    from obscure_stats.server import serve  # noqa: PLC0415
+
+    serve(args.socket, args.workers)
+    return 0
+
+
+def _list(_args: argparse.Namespace) -> int:
+    """Run list command."""
+    for name in sorted(ESTIMATORS):
+        mark = " (default)" if name in DEFAULT_STATISTICS else ""
+        sys.stdout.write(f"{name}{mark}\n")
+    return 0
+
+
+def _calibrate(args: argparse.Namespace) -> int:
+    """Run calibrate command."""
+    with config_context(memory_budget=args.memory_budget):
+        costs = calibrate(args.sizes, repeat=args.repeat)
+        switches = crossovers(costs)
+    if args.output:
+        pathlib.Path(args.output).write_text(json.dumps(costs, indent=2) + "\n")
+    report = {
+        "costs": costs,
+        "crossovers": {
+            task: [{"size": n, "algorithm": name} for n, name in segments]
+            for task, segments in switches.items()
+        },
+    }
+    sys.stdout.write(json.dumps(report, indent=2) + "\n")
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Create parser of the command line arguments."""
+    parser = argparse.ArgumentParser(
+        prog="obscure_stats",
+        description="Collection of lesser-known statistical functions.",
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    describe = commands.add_parser(
+        "describe", help="Calculate statistics of the columns of the files."
+    )
+    describe.add_argument("files", nargs="+", help="CSV, .npy or raw binary files.")
+    describe.add_argument(
+        "-s",
+        "--stats",
+        type=_parse_statistics,
+        default=list(DEFAULT_STATISTICS),
+        help="Comma separated names of the statistics or `all`.",
+    )
+    describe.add_argument("-f", "--format", choices=FORMATS, default="auto")
+    describe.add_argument("--dtype", default="float64", help="Type of raw data.")
+    describe.add_argument(
+        "--n-columns", type=int, default=1, help="Number of columns of raw data."
+    )
+    describe.add_argument("-d", "--delimiter", default=",", help="CSV delimiter.")
+    describe.add_argument(
+        "-c", "--columns", help="Comma separated names or indexes of the columns."
+    )
+    describe.add_argument(
+        "--chunk-size", type=int, default=65536, help="Number of rows read at once."
+    )
+    describe.add_argument(
+        "--memory-budget",
+        type=int,
+        default=get_config()["memory_budget"],
+        help="Bytes of temporary memory for blockwise processing.",
+    )
+    describe.add_argument(
+        "--nan-policy",
+        choices=NAN_POLICIES,
+        default=None,
+        help="Handling of missing values, omit by default.",
+    )
+    describe.add_argument(
+        "-j", "--jobs", type=int, default=1, help="Number of worker processes."
+    )
+    describe.add_argument("-o", "--output", help="Output file, stdout by default.")
+    describe.set_defaults(handler=_describe)
+
+    serve = commands.add_parser(
+        "serve", help="Run the local statistics server on a Unix socket."
+    )
+    serve.add_argument("--socket", default=DEFAULT_SOCKET, help="Path of the socket.")
+    serve.add_argument("-w", "--workers", type=int, help="Number of worker processes.")
+    serve.set_defaults(handler=_serve)
+
+    list_ = commands.add_parser("list", help="List names of the statistics.")
+    list_.set_defaults(handler=_list)
+
+    calibrate_ = commands.add_parser(
+        "calibrate", help="Fit the cost model of the algorithms on this machine."
+    )
+    calibrate_.add_argument(
+        "--sizes",
+        type=lambda value: [int(n) for n in value.split(",")],
+        default=(1024, 4096, 16384, 65536, 262144, 1048576),
+        help="Comma separated input sizes.",
+    )
+    calibrate_.add_argument(
+        "--repeat", type=int, default=3, help="Number of runs at every size."
+    )
+    calibrate_.add_argument(
+        "--memory-budget",
+        type=int,
+        default=get_config()["memory_budget"],
+        help="Bytes of temporary memory available to the algorithms.",
+    )
+    calibrate_.add_argument(
+        "-o", "--output", help="Output JSON file of the coefficients."
+    )
+    calibrate_.set_defaults(handler=_calibrate)
+    return parser
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    """Run command line interface.
+
+    Parameters
+    ----------
+    argv : sequence of str, optional
+        Command line arguments, sys.argv is used by default.
+
+    Returns
+    -------
+    code : int
+        Exit code.
+    """
+    args = build_parser().parse_args(argv)
+    return args.handler(args)
@@ -0,0 +1,162 @@
+"""Client of the local statistics server (see obscure_stats.server).
+
+The client depends only on numpy and the standard library, so short-lived
+jobs do not pay the import cost of scipy. Arrays are passed to the server
+through shared memory, paths to .npy files are passed as is.
+
+Examples
+--------
+>>> from obscure_stats.client import Client
+>>> with Client() as client:  # doctest: +SKIP
+...     reports = client.compute([x, "column.npy"], ["midhinge", "trimean"])
+>>> reports[0]["statistics"]["midhinge"]  # doctest: +SKIP
+"""
+
+from __future__ import annotations
+
+import getpass
+import json
+import os
+import pathlib
+import socket
+import sys
+import tempfile
+import typing
+from multiprocessing import resource_tracker, shared_memory
+
+import numpy as np
+
+if typing.TYPE_CHECKING:
+    from collections.abc import Sequence
+    from types import TracebackType
+
+
+def _runtime_dir() -> pathlib.Path:
+    """Get the per-user directory of the socket.
+
+    It is $XDG_RUNTIME_DIR when set, otherwise a private subdirectory
+    of the temporary directory, which the server creates with 0700 mode.
+    """
+    runtime = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime:
+        return pathlib.Path(runtime)
+    return pathlib.Path(tempfile.gettempdir()) / f"obscure_stats-{getpass.getuser()}"
+
+
+DEFAULT_SOCKET = os.fspath(_runtime_dir() / "obscure_stats.sock")
+
+
+def _attach(name: str) -> shared_memory.SharedMemory:
+    """Attach to the shared memory block owned by another process."""
+    shm = shared_memory.SharedMemory(name=name)
+    if sys.version_info < (3, 13):
+        # otherwise the block is unlinked when the attached process exits
+        resource_tracker.unregister(shm._name, "shared_memory")  # type: ignore[attr-defined]  # noqa: SLF001
+    return shm
+
+
+def _encode(message: dict) -> bytes:
+    """Serialize the message into one line."""
+    return json.dumps(message).encode() + b"\n"
+
+
+class Client:
+    """Connection to the local statistics server.
+
+    Parameters
+    ----------
+    path : str, optional
+        Path of the Unix socket of the server, obscure_stats.sock
+        in $XDG_RUNTIME_DIR (or in the private temporary directory) by default.
+    """
+
+    def __init__(self, path: str | os.PathLike = DEFAULT_SOCKET) -> None:
+        self._socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._socket.connect(os.fspath(path))
+        self._file = self._socket.makefile("rwb")
+
+    def _request(self, message: dict) -> dict:
+        """Send the request and wait for the response."""
+        self._file.write(_encode(message))
+        self._file.flush()
+        line = self._file.readline()
+        if not line:
+            msg = "Connection is closed by the server."
+            raise ConnectionError(msg)
+        response = json.loads(line)
+        if "error" in response:
+            raise RuntimeError(response["error"])
+        return response
+
+    def compute(
+        self,
+        arrays: Sequence[np.ndarray | str | os.PathLike],
+        statistics: Sequence[str],
+    ) -> list[dict]:
+        """Calculate the statistics of every array on the server.
+
+        Parameters
+        ----------
+        arrays : sequence of array_like or path
+            Data, arrays are passed through shared memory,
+            paths to .npy files are opened by the server.
+        statistics : sequence of str
+            Names of the statistics.
+
+        Returns
+        -------
+        reports : list of dict
+            Values, timings and warnings of the statistics for every array,
+            in the same format as the reports of `obscure_stats describe`.
+        """
+        specs = []
+        blocks = []
+        try:
+            for x in arrays:
+                if isinstance(x, (str, os.PathLike)):
+                    specs.append({"npy": os.fspath(x)})
+                    continue
+                data = np.asarray(x)
+                shm = shared_memory.SharedMemory(create=True, size=max(data.nbytes, 1))
+                blocks.append(shm)
+                view = np.ndarray(data.shape, dtype=data.dtype, buffer=shm.buf)
+                view[...] = data
+                # the block could not be closed while the view exists
+                del view
+                specs.append(
+                    {"shm": shm.name, "dtype": data.dtype.str, "shape": data.shape}
+                )
+            response = self._request(
+                {"op": "compute", "arrays": specs, "statistics": list(statistics)}
+            )
+        finally:
+            for shm in blocks:
+                shm.close()
+                shm.unlink()
+        return response["results"]
+
+    def ping(self) -> bool:
+        """Check that the server is alive."""
+        return self._request({"op": "ping"}).get("ok", False)
+
+    def shutdown(self) -> None:
+        """Stop the server."""
+        self._request({"op": "shutdown"})
+
+    def close(self) -> None:
+        """Close the connection."""
+        self._file.close()
+        self._socket.close()
+
+    def __enter__(self) -> Client:  # noqa: PYI034
+        """Open the connection."""
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        """Close the connection."""
+        self.close()
@@ -0,0 +1,131 @@
+"""Module for global settings of the library.
+
+Settings are stored in a context variable, so config_context changes them
+only for the current thread (or asyncio task).
+"""
+
+from __future__ import annotations
+
+import contextlib
+import contextvars
+import os
+import typing
+
+if typing.TYPE_CHECKING:
+    from collections.abc import Iterator
+
+_DEFAULTS: dict[str, typing.Any] = {
+    # bytes of temporary memory used while streaming memory-mapped arrays
+    "memory_budget": 256 * 2**20,
+    # number of memoised results and intermediates, 0 disables the cache
+    "cache_entries": 0,
+    # bytes of memory used by the cache
+    "cache_bytes": 256 * 2**20,
+    # directory of the on-disk tier of the cache, None disables it
+    "cache_dir": None,
+    # seconds per unit of work of the algorithms (see obscure_stats.dispatch)
+    "cost_model": {},
+    # float type of the temporary arrays, "preserve" keeps float32 inputs in float32
+    "dtype_policy": "float64",
+    # handling of missing values, "omit" drops them
+    "nan_policy": "omit",
+}
+DTYPE_POLICIES = ("float64", "preserve")
+NAN_POLICIES = ("propagate", "omit", "raise", "assume_none")
+
+_config: contextvars.ContextVar[dict[str, typing.Any]] = contextvars.ContextVar(
+    "obscure_stats_config", default=_DEFAULTS
+)
+
+
+def _validate(settings: dict[str, typing.Any]) -> None:
+    """Check names and values of the settings."""
+    for name, value in settings.items():
+        if name not in _DEFAULTS:
+            msg = f"Unknown setting {name}, should be one of {sorted(_DEFAULTS)}."
+            raise ValueError(msg)
+        if name in {"memory_budget", "cache_bytes"} and (
+            not isinstance(value, int) or value < 1
+        ):
+            msg = f"Setting {name} should be a positive integer."
+            raise ValueError(msg)
+        if name == "cache_entries" and (not isinstance(value, int) or value < 0):
+            msg = "Setting cache_entries should be a non-negative integer."
+            raise ValueError(msg)
+        if name == "cache_dir" and not (
+            value is None or isinstance(value, (str, os.PathLike))
+        ):
+            msg = "Setting cache_dir should be a path or None."
+            raise ValueError(msg)
+        if name == "cost_model":
+            # dispatch depends on this module
+            from obscure_stats.dispatch import _check_costs  # noqa: PLC0415
+
+            _check_costs(value)
+        if name == "dtype_policy" and value not in DTYPE_POLICIES:
+            msg = f"Setting dtype_policy should be one of {DTYPE_POLICIES}."
+            raise ValueError(msg)
+        if name == "nan_policy" and value not in NAN_POLICIES:
+            msg = f"Setting nan_policy should be one of {NAN_POLICIES}."
+            raise ValueError(msg)
+
+
+def get_config() -> dict[str, typing.Any]:
+    """Get current values of the settings.
+
+    Returns
+    -------
+    config : dict
+        Copy of the settings:
+        memory_budget - number of bytes of temporary memory
+        used for blockwise processing of np.memmap inputs;
+        cache_entries - maximal number of memoised values, 0 disables
+        the cache (see obscure_stats.cache);
+        cache_bytes - maximal number of bytes of memoised values;
+        cache_dir - directory of the on-disk tier of the cache;
+        cost_model - coefficients of the cost model that override the defaults
+        (see obscure_stats.dispatch);
+        dtype_policy - "float64" keeps temporary arrays in float64, "preserve"
+        keeps them in float32 for float32 inputs, which halves the memory
+        traffic (sums are accumulated in float64 in both cases);
+        nan_policy - "omit" drops missing values, "propagate" returns missing
+        result for inputs with missing values, "raise" raises ValueError
+        for them and "assume_none" skips the checks of missing values,
+        so the inputs should not have them.
+    """
+    return dict(_config.get())
+
+
+def set_config(**settings: typing.Any) -> None:  # noqa: ANN401
+    """Change the settings for the current context.
+
+    Parameters
+    ----------
+    **settings
+        New values of the settings, see get_config for the names.
+    """
+    _validate(settings)
+    _config.set({**_config.get(), **settings})
+
+
+@contextlib.contextmanager
+def config_context(**settings: typing.Any) -> Iterator[None]:  # noqa: ANN401
+    """Change the settings temporarily.
+
+    Parameters
+    ----------
+    **settings
+        New values of the settings, see get_config for the names.
+
+    Examples
+    --------
+    >>> from obscure_stats.config import config_context
+    >>> with config_context(memory_budget=2**20):
+    ...     pass
+    """
+    _validate(settings)
+    token = _config.set({**_config.get(), **settings})
+    try:
+        yield
+    finally:
+        _config.reset(token)
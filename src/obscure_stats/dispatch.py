@@ -0,0 +1,297 @@
+"""Module for choosing algorithms by the cost model.
+
+Several measures have implementations with different time and memory
+complexity, e.g. the median of pairwise differences over the dense cartesian
+product (O(n^2) time and memory) or by selection in the implicitly sorted
+matrix of differences (O(n log^2 n) time, O(n) memory). The implementation is
+chosen on every call: the estimated time of every candidate is its coefficient
+(seconds per unit of work) times its work for the given input size, number of
+order statistics or range of integer values (the inverse of the tie density),
+and candidates that need more temporary memory than the memory_budget setting
+are skipped.
+
+Default coefficients were measured on a x86-64 desktop. Local ones are fitted
+by calibrate (or ``python -m obscure_stats calibrate -o costs.json``) and are
+used with config_context(cost_model=costs) or for the whole process with
+the OBSCURE_STATS_COST_MODEL environment variable (path to the JSON file).
+"""
+
+from __future__ import annotations
+
+import collections
+import functools
+import json
+import math
+import os
+import time
+import typing
+
+import numpy as np
+
+from obscure_stats.config import _config
+
+if typing.TYPE_CHECKING:
+    from collections.abc import Callable, Sequence
+
+# candidate algorithms of every task
+TASKS: dict[str, tuple[str, ...]] = {
+    "gmd": ("gmd_dense", "gmd_sorted"),
+    "pairwise_median": ("pairwise_median_dense", "pairwise_median_select"),
+    "counts": ("counts_bincount", "counts_unique", "counts_counter"),
+    "quantiles": ("quantile_partition", "quantile_sort"),
+}
+# seconds per unit of work (see _work)
+DEFAULT_COSTS: dict[str, float] = {
+    "gmd_dense": 6.3e-9,
+    "gmd_sorted": 8.1e-10,
+    "pairwise_median_dense": 1.8e-8,
+    "pairwise_median_select": 6.3e-9,
+    "counts_bincount": 7.4e-9,
+    "counts_unique": 1.3e-9,
+    "counts_counter": 1.6e-7,
+    "quantile_partition": 8.1e-9,
+    "quantile_sort": 3.9e-10,
+}
+
+
+def _check_costs(costs: typing.Any) -> None:  # noqa: ANN401
+    """Check names and values of the coefficients."""
+    if not isinstance(costs, dict):
+        msg = "Setting cost_model should be a dict."
+        raise ValueError(msg)  # noqa: TRY004
+    for name, value in costs.items():
+        if name not in DEFAULT_COSTS:
+            msg = f"Unknown algorithm {name}, should be one of {sorted(DEFAULT_COSTS)}."
+            raise ValueError(msg)
+        if (
+            not isinstance(value, (int, float))
+            or not math.isfinite(value)
+            or value <= 0
+        ):
+            msg = f"Cost of {name} should be a positive number."
+            raise ValueError(msg)
+
+
+@functools.lru_cache(maxsize=1)
+def _environment_costs() -> dict[str, float]:
+    """Read the coefficients from the file in OBSCURE_STATS_COST_MODEL."""
+    path = os.environ.get("OBSCURE_STATS_COST_MODEL")
+    if not path:
+        return {}
+    with open(path, encoding="utf-8") as fh:  # noqa: PTH123
+        costs = json.load(fh)
+    _check_costs(costs)
+    return costs
+
+
+def _costs() -> dict[str, float]:
+    """Get the current coefficients of the cost model."""
+    return {**DEFAULT_COSTS, **_environment_costs(), **_config.get()["cost_model"]}
+
+
+def _log2(n: float) -> float:
+    return math.log2(max(n, 2))
+
+
+def _threshold(n: int) -> int:
+    """Get number of candidates that are gathered by the pairwise selection."""
+    return max(4 * n, 1 << 16)
+
+
+def _work(algorithm: str, n: int, k: int, span: int) -> float:
+    """Estimate units of work of the algorithm."""
+    if algorithm in {"gmd_dense", "pairwise_median_dense"}:
+        return float(n) * n
+    if algorithm == "pairwise_median_select":
+        return n * _log2(n) ** 2
+    if algorithm == "counts_bincount":
+        return float(n + span)
+    if algorithm == "counts_counter":
+        return float(n)
+    if algorithm == "quantile_partition":
+        return n * _log2(k + 1)
+    # sorting
+    return n * _log2(n)
+
+
+def _memory(algorithm: str, n: int, span: int) -> float:
+    """Estimate peak temporary memory of the algorithm in bytes."""
+    if algorithm == "gmd_dense":
+        return 20.0 * n * n
+    if algorithm == "pairwise_median_dense":
+        return 16.0 * n * n
+    if algorithm == "pairwise_median_select":
+        return 64.0 * n + 24.0 * _threshold(n)
+    if algorithm == "counts_bincount":
+        return 8.0 * (span + 1)
+    if algorithm == "counts_counter":
+        return 100.0 * n
+    return 16.0 * n
+
+
+def _choose(
+    task: str,
+    n: int,
+    *,
+    candidates: Sequence[str] | None = None,
+    k: int = 1,
+    span: int = 0,
+) -> str:
+    """Choose the cheapest algorithm that fits into the memory budget.
+
+    If none of the candidates fits, the one that needs the least memory
+    is chosen.
+    """
+    names = candidates or TASKS[task]
+    costs = _costs()
+    budget = _config.get()["memory_budget"]
+    fitting = [a for a in names if _memory(a, n, span) <= budget] or [
+        min(names, key=lambda a: _memory(a, n, span))
+    ]
+    return min(fitting, key=lambda a: costs[a] * _work(a, n, k, span))
+
+
+def _benchmark(algorithm: str, n: int) -> Callable[[], typing.Any]:
+    """Prepare the call of the algorithm on random data of size n."""
+    # _utils depends on this module
+    from obscure_stats import _utils  # noqa: PLC0415
+
+    rng = np.random.default_rng(n)
+    x = rng.normal(size=n)
+    # one distinct value per element on average
+    codes = rng.integers(0, n, size=n)
+    kth = np.linspace(0, n - 1, 5).astype(np.intp)
+    calls: dict[str, Callable[[], typing.Any]] = {
+        "gmd_dense": functools.partial(_utils._gmd_dense, x),  # noqa: SLF001
+        "gmd_sorted": functools.partial(_utils._gmd_sorted, x),  # noqa: SLF001
+        "pairwise_median_dense": functools.partial(
+            _utils._pairwise_median_dense,  # noqa: SLF001
+            x,
+            sums=False,
+        ),
+        "pairwise_median_select": functools.partial(
+            _utils._pairwise_median_select,  # noqa: SLF001
+            x,
+            sums=False,
+        ),
+        "counts_bincount": functools.partial(
+            _utils._count_values,  # noqa: SLF001
+            codes,
+            "counts_bincount",
+        ),
+        "counts_unique": functools.partial(
+            _utils._count_values,  # noqa: SLF001
+            codes,
+            "counts_unique",
+        ),
+        "counts_counter": functools.partial(collections.Counter, codes),
+        "quantile_partition": lambda: x.copy().partition(kth),
+        "quantile_sort": lambda: x.copy().sort(),
+    }
+    return calls[algorithm]
+
+
+def calibrate(
+    sizes: Sequence[int] = (1024, 4096, 16384, 65536, 262144, 1048576),
+    repeat: int = 3,
+    max_time: float = 1.0,
+) -> dict[str, float]:
+    """Fit the coefficients of the cost model on the local machine.
+
+    Every algorithm is timed (best of several runs) at the sizes that fit
+    into the memory budget, and its coefficient is the median ratio of the
+    time to the estimated work.
+
+    Parameters
+    ----------
+    sizes : sequence of int
+        Input sizes.
+    repeat : int, default = 3
+        Number of runs at every size.
+    max_time : float, default = 1.0
+        Larger sizes are skipped once a run takes longer (in seconds).
+
+    Returns
+    -------
+    costs : dict
+        Seconds per unit of work of every algorithm,
+        could be used as the cost_model setting.
+
+    See Also
+    --------
+    obscure_stats.dispatch.crossovers - Sizes where the algorithms change.
+    """
+    budget = _config.get()["memory_budget"]
+    costs = {}
+    for algorithm, default in DEFAULT_COSTS.items():
+        ratios = []
+        for n in sorted(sizes):
+            if _memory(algorithm, n, n) > budget:
+                break
+            call = _benchmark(algorithm, n)
+            best = math.inf
+            for _ in range(repeat):
+                start = time.perf_counter()
+                call()
+                best = min(best, time.perf_counter() - start)
+            ratios.append(best / _work(algorithm, n, 5, n))
+            if best > max_time:
+                break
+        costs[algorithm] = float(np.median(ratios)) if ratios else default
+    return costs
+
+
+def _first_size(choice: Callable[[int], str], lo: int, hi: int) -> int:
+    """Find the smallest size in (lo, hi] with the same choice as hi."""
+    algorithm = choice(hi)
+    while hi - lo > 1:
+        mid = (lo + hi) // 2
+        if choice(mid) == algorithm:
+            hi = mid
+        else:
+            lo = mid
+    return hi
+
+
+def crossovers(
+    costs: dict[str, float] | None = None, max_size: int = 1 << 30
+) -> dict[str, list[tuple[int, str]]]:
+    """Find input sizes where the chosen algorithms change.
+
+    Counting is evaluated for one distinct value per element and quantiles
+    for five order statistics, the memory budget is taken into account.
+
+    Parameters
+    ----------
+    costs : dict, optional
+        Coefficients of the cost model, current ones by default.
+    max_size : int, default = 2**30
+        Largest input size.
+
+    Returns
+    -------
+    crossovers : dict
+        Smallest input sizes and chosen algorithms of every task.
+    """
+    settings = _config.get()
+    if costs is not None:
+        _check_costs(costs)
+        settings = {**settings, "cost_model": {**settings["cost_model"], **costs}}
+    token = _config.set(settings)
+    try:
+        result = {}
+        grid = np.unique(np.geomspace(2, max_size, 256).astype(np.int64)).tolist()
+        for task in TASKS:
+
+            def choice(n: int, task: str = task) -> str:
+                return _choose(task, n, k=5, span=n)
+
+            segments = [(grid[0], choice(grid[0]))]
+            for i in range(1, len(grid)):
+                if choice(grid[i]) != segments[-1][1]:
+                    first = _first_size(choice, grid[i - 1], grid[i])
+                    segments.append((first, choice(grid[i])))
+            result[task] = segments
+        return result
+    finally:
+        _config.reset(token)
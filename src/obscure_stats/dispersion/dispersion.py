@@ -3,18 +3,49 @@
 import warnings
 
 import numpy as np
-from scipy import special, stats  # type: ignore[import-untyped]
+
+from obscure_stats._utils import (
+    _gmd,
+    _lazy_import,
+    _nan_policy,
+    _pairwise_median,
+    _pwm,
+    _scratch,
+    _sort,
+)
+from obscure_stats._weighted import (
+    _sample_median,
+    _sample_quantiles,
+    _sample_size,
+    _sample_stats,
+    _weighted_gmd,
+    _weighted_pairwise_median,
+    _weighted_pwm,
+)
+from obscure_stats.cache import _memoize
+from obscure_stats.profiling import _instrument
+
+stats = _lazy_import("scipy.stats")
 
 EPS = 1e-6
 
 
-def studentized_range(x: np.ndarray) -> float:
+@_instrument
+@_nan_policy
+@_memoize
+def studentized_range(x: np.ndarray, *, weights: np.ndarray | None = None) -> float:
     """Calculate range normalized by standard deviation.
 
     Parameters
     ----------
     x : array_like
         Input array.
+    weights : array_like, optional
+        Frequency weights (numbers of occurrences) of the values,
+        the sample is processed without expanding it.
+    nan_policy : {"propagate", "omit", "raise", "assume_none"}, optional
+        Handling of missing values, the nan_policy setting by default
+        (see obscure_stats.config).
 
     Returns
     -------
@@ -27,13 +58,20 @@ def studentized_range(x: np.ndarray) -> float:
     Errors of routine analysis.
     Biometrika. 19 (1/2): 151-164.
     """
-    maximum = np.nanmax(x)
-    minimum = np.nanmin(x)
-    std = np.nanstd(x)
+    maximum, minimum, std = _sample_stats(x, "max", "min", "std", weights=weights)
     return (maximum - minimum) / std
 
 
-def coefficient_of_lvariation(x: np.ndarray) -> float:
+@_instrument
+@_nan_policy
+@_memoize
+def coefficient_of_lvariation(
+    x: np.ndarray,
+    *,
+    overwrite_input: bool = False,
+    buffer: np.ndarray | None = None,
+    weights: np.ndarray | None = None,
+) -> float:
     """Calculate linear coefficient of variation.
 
     L-CV is the L-scale (half of mean absolute deviation) divided
@@ -43,6 +81,19 @@ def coefficient_of_lvariation(x: np.ndarray) -> float:
     ----------
     x : array_like
         Input array.
+    overwrite_input : bool, default = False
+        If True, the input array is sorted or partitioned in place
+        and its contents are undefined after the call.
+    buffer : np.ndarray, optional
+        Writeable 1-d array of at least x.size elements, the values are
+        copied into it and reordered there instead of a new array,
+        so one buffer could be reused by many calls.
+    weights : array_like, optional
+        Frequency weights (numbers of occurrences) of the values,
+        the sample is processed without expanding it.
+    nan_policy : {"propagate", "omit", "raise", "assume_none"}, optional
+        Handling of missing values, the nan_policy setting by default
+        (see obscure_stats.config).
 
     Returns
     -------
@@ -56,25 +107,37 @@ def coefficient_of_lvariation(x: np.ndarray) -> float:
     using linear combinations of order statistics.
     Journal of the Royal Statistical Society, Series B. 52 (1): 105-124.
     """
-    l1 = np.nanmean(x)
+    (l1,) = _sample_stats(x, "mean", weights=weights)
     if abs(l1) <= EPS:
         warnings.warn("Mean is close to 0. Statistic is undefined.", stacklevel=2)
         return np.inf
-    n = len(x)
-    _x = np.sort(x)
-    common = 1 / special.comb(n - 1, 1) / n
-    beta_1 = common * np.nansum(special.comb(np.arange(1, n), 1) * _x[1:])
+    if weights is not None:
+        (beta_1,) = _weighted_pwm(x, weights, (1,))
+    else:
+        _x, owned = _scratch(x, overwrite_input=overwrite_input, buffer=buffer)
+        (beta_1,) = _pwm(_sort(_x, overwrite_input=owned), (1,))
     l2 = 2 * beta_1 - l1
     return l2 / l1
 
 
-def coefficient_of_variation(x: np.ndarray) -> float:
+@_instrument
+@_nan_policy
+@_memoize
+def coefficient_of_variation(
+    x: np.ndarray, *, weights: np.ndarray | None = None
+) -> float:
     """Calculate coefficient of variation (Standard deviation / Mean).
 
     Parameters
     ----------
     x : array_like
         Input array.
+    weights : array_like, optional
+        Frequency weights (numbers of occurrences) of the values,
+        the sample is processed without expanding it.
+    nan_policy : {"propagate", "omit", "raise", "assume_none"}, optional
+        Handling of missing values, the nan_policy setting by default
+        (see obscure_stats.config).
 
     Returns
     -------
@@ -87,14 +150,19 @@ def coefficient_of_variation(x: np.ndarray) -> float:
     Coefficient of Variation.
     Applied Multivariate Statistics in Geohydrology and Related Sciences. Springer.
     """
-    mean = np.nanmean(x)
+    mean, std = _sample_stats(x, "mean", "std", weights=weights)
     if abs(mean) <= EPS:
         warnings.warn("Mean is close to 0. Statistic is undefined.", stacklevel=2)
         return np.inf
-    return np.nanstd(x) / mean
+    return std / mean
 
 
-def robust_coefficient_of_variation(x: np.ndarray) -> float:
+@_instrument
+@_nan_policy
+@_memoize
+def robust_coefficient_of_variation(
+    x: np.ndarray, *, weights: np.ndarray | None = None
+) -> float:
     """Calculate robust coefficient of variation.
 
     It is based on median absolute deviation from the median, i.e. median
@@ -104,6 +172,12 @@ def robust_coefficient_of_variation(x: np.ndarray) -> float:
     ----------
     x : array_like
         Input array.
+    weights : array_like, optional
+        Frequency weights (numbers of occurrences) of the values,
+        the sample is processed without expanding it.
+    nan_policy : {"propagate", "omit", "raise", "assume_none"}, optional
+        Handling of missing values, the nan_policy setting by default
+        (see obscure_stats.config).
 
     Returns
     -------
@@ -116,21 +190,43 @@ def robust_coefficient_of_variation(x: np.ndarray) -> float:
     Statistical Data Analysis Explained: Applied Environmental Statistics with R.
     John Wiley and Sons, New York.
     """
-    med = np.nanmedian(x)
+    med = _sample_median(x, weights)
     if abs(med) <= EPS:
         warnings.warn("Median is close to 0. Statistic is undefined.", stacklevel=2)
         return np.inf
-    med_abs_dev = np.nanmedian(np.abs(x - med))
+    med_abs_dev = _sample_median(np.abs(x - med), weights)
     return med_abs_dev / med
 
 
-def quartile_coefficient_of_dispersion(x: np.ndarray) -> float:
+@_instrument
+@_nan_policy
+@_memoize
+def quartile_coefficient_of_dispersion(
+    x: np.ndarray,
+    *,
+    overwrite_input: bool = False,
+    buffer: np.ndarray | None = None,
+    weights: np.ndarray | None = None,
+) -> float:
     """Calculate quartile coefficient of dispersion (IQR / Midhinge).
 
     Parameters
     ----------
     x : array_like
         Input array.
+    overwrite_input : bool, default = False
+        If True, the input array is sorted or partitioned in place
+        and its contents are undefined after the call.
+    buffer : np.ndarray, optional
+        Writeable 1-d array of at least x.size elements, the values are
+        copied into it and reordered there instead of a new array,
+        so one buffer could be reused by many calls.
+    weights : array_like, optional
+        Frequency weights (numbers of occurrences) of the values,
+        the sample is processed without expanding it.
+    nan_policy : {"propagate", "omit", "raise", "assume_none"}, optional
+        Handling of missing values, the nan_policy setting by default
+        (see obscure_stats.config).
 
     Returns
     -------
@@ -143,13 +239,22 @@ def quartile_coefficient_of_dispersion(x: np.ndarray) -> float:
     Confidence interval for a coefficient of quartile variation.
     Computational Statistics & Data Analysis. 50 (11): 2953-2957.
     """
-    q1, q3 = np.nanquantile(x, [0.25, 0.75])
+    q1, q3 = _sample_quantiles(
+        x,
+        [0.25, 0.75],
+        overwrite_input=overwrite_input,
+        buffer=buffer,
+        weights=weights,
+    )
     if abs(q3 + q1) <= EPS:
         warnings.warn("Midhinge is close to 0. Statistic is undefined.", stacklevel=2)
         return np.inf
     return (q3 - q1) / (q3 + q1)
 
 
+@_instrument
+@_nan_policy
+@_memoize
 def dispersion_ratio(x: np.ndarray) -> float:
     """Calculate dispersion ratio (Mean / GMean).
 
@@ -162,6 +267,9 @@ def dispersion_ratio(x: np.ndarray) -> float:
     ----------
     x : array_like
         Input array.
+    nan_policy : {"propagate", "omit", "raise", "assume_none"}, optional
+        Handling of missing values, the nan_policy setting by default
+        (see obscure_stats.config).
 
     Returns
     -------
@@ -180,7 +288,12 @@ def dispersion_ratio(x: np.ndarray) -> float:
     return np.nanmean(x) / stats.gmean(_x, nan_policy="omit")
 
 
-def fisher_index_of_dispersion(x: np.ndarray) -> float:
+@_instrument
+@_nan_policy
+@_memoize
+def fisher_index_of_dispersion(
+    x: np.ndarray, *, weights: np.ndarray | None = None
+) -> float:
     """Calculate Fisher's index of dispersion.
 
     It is very similar to the coefficient of variation but uses unnormalized
@@ -190,6 +303,12 @@ def fisher_index_of_dispersion(x: np.ndarray) -> float:
     ----------
     x : array_like
         Input array.
+    weights : array_like, optional
+        Frequency weights (numbers of occurrences) of the values,
+        the sample is processed without expanding it.
+    nan_policy : {"propagate", "omit", "raise", "assume_none"}, optional
+        Handling of missing values, the nan_policy setting by default
+        (see obscure_stats.config).
 
     Returns
     -------
@@ -202,14 +321,19 @@ def fisher_index_of_dispersion(x: np.ndarray) -> float:
     Statistical methods for research workers.
     Hafner, New York.
     """
-    mean = np.nanmean(x)
+    mean, var = _sample_stats(x, "mean", "var", weights=weights)
     if abs(mean) <= EPS:
         warnings.warn("Mean is close to 0. Statistic is undefined.", stacklevel=2)
         return np.inf
-    return (len(x) - 1) * np.nanvar(x) / mean
+    return (_sample_size(x, weights) - 1) * var / mean
 
 
-def morisita_index_of_dispersion(x: np.ndarray) -> float:
+@_instrument
+@_nan_policy
+@_memoize
+def morisita_index_of_dispersion(
+    x: np.ndarray, *, weights: np.ndarray | None = None
+) -> float:
     """Calculate Morisita's index of dispersion.
 
     Morisita's index of dispersion is the scaled probability that two
@@ -219,6 +343,12 @@ def morisita_index_of_dispersion(x: np.ndarray) -> float:
     ----------
     x : array_like
         Input array.
+    weights : array_like, optional
+        Frequency weights (numbers of occurrences) of the values,
+        the sample is processed without expanding it.
+    nan_policy : {"propagate", "omit", "raise", "assume_none"}, optional
+        Handling of missing values, the nan_policy setting by default
+        (see obscure_stats.config).
 
     Returns
     -------
@@ -231,11 +361,16 @@ def morisita_index_of_dispersion(x: np.ndarray) -> float:
     Measuring the dispersion and the analysis of distribution patterns.
     Memoirs of the Faculty of Science, Kyushu University Series e. Biol. 2: 215-235
     """
-    x_sum = np.nansum(x)
-    return len(x) * (np.nansum(np.square(x)) - x_sum) / (x_sum**2 - x_sum)
+    x_sum, x_sumsq = _sample_stats(x, "sum", "sumsq", weights=weights)
+    return _sample_size(x, weights) * (x_sumsq - x_sum) / (x_sum**2 - x_sum)
 
 
-def standard_quantile_absolute_deviation(x: np.ndarray) -> float:
+@_instrument
+@_nan_policy
+@_memoize
+def standard_quantile_absolute_deviation(
+    x: np.ndarray, *, weights: np.ndarray | None = None
+) -> float:
     """Calculate standard quantile absolute deviation.
 
     This measure is a robust measure of dispersion, that has higher
@@ -245,6 +380,12 @@ def standard_quantile_absolute_deviation(x: np.ndarray) -> float:
     ----------
     x : array_like
         Input array.
+    weights : array_like, optional
+        Frequency weights (numbers of occurrences) of the values,
+        the sample is processed without expanding it.
+    nan_policy : {"propagate", "omit", "raise", "assume_none"}, optional
+        Handling of missing values, the nan_policy setting by default
+        (see obscure_stats.config).
 
     Returns
     -------
@@ -257,16 +398,24 @@ def standard_quantile_absolute_deviation(x: np.ndarray) -> float:
     Quantile absolute deviation.
     arXiv preprint arXiv:2208.13459.
     """
-    med = np.nanmedian(x)
-    n = len(x)
+    med = _sample_median(x, weights)
+    n = _sample_size(x, weights)
     # finite sample correction
     k = 1.0 + 0.762 / n + 0.967 / n**2
     # constant value that maximizes efficiency for normal distribution
     q = 0.6826894921370850  # stats.norm.cdf(1) - stats.norm.cdf(-1)
-    return k * np.nanquantile(np.abs(x - med), q=q)
-
-
-def shamos_estimator(x: np.ndarray) -> float:
+    return (
+        k
+        * _sample_quantiles(
+            np.abs(x - med), [q], overwrite_input=True, weights=weights
+        )[0]
+    )
+
+
+@_instrument
+@_nan_policy
+@_memoize
+def shamos_estimator(x: np.ndarray, *, weights: np.ndarray | None = None) -> float:
     """Calculate Shamos robust estimator of dispersion.
 
     This measure is complementary to Hodges-Lehmann-Sen estimator.
@@ -275,6 +424,12 @@ def shamos_estimator(x: np.ndarray) -> float:
     ----------
     x : array_like
         Input array.
+    weights : array_like, optional
+        Frequency weights (numbers of occurrences) of the values,
+        the sample is processed without expanding it.
+    nan_policy : {"propagate", "omit", "raise", "assume_none"}, optional
+        Handling of missing values, the nan_policy setting by default
+        (see obscure_stats.config).
 
     Returns
     -------
@@ -289,8 +444,10 @@ def shamos_estimator(x: np.ndarray) -> float:
 
     Notes
     -----
-    This implementation uses cartesian product, so the time and memory complexity
-    are N^2. It is best to not use it on large arrays.
+    Small arrays are processed over the cartesian product (time and memory
+    complexity are N^2), larger ones by selection in the implicitly sorted
+    matrix of pairs (time complexity is N log^2 N, memory complexity is N),
+    see obscure_stats.dispatch.
 
     See Also
     --------
@@ -299,17 +456,27 @@ def shamos_estimator(x: np.ndarray) -> float:
     # In the original paper authors suggest use only upper triangular
     # of the cartesian product, but in this implementation we use
     # whole matrix, which is equvalent.
-    product = np.meshgrid(x, x, sparse=True)
-    return np.nanmedian(np.abs(product[0] - product[1]))
+    if weights is not None:
+        return _weighted_pairwise_median(x, weights, sums=False)
+    return _pairwise_median(x, sums=False)
 
 
-def coefficient_of_range(x: np.ndarray) -> float:
+@_instrument
+@_nan_policy
+@_memoize
+def coefficient_of_range(x: np.ndarray, *, weights: np.ndarray | None = None) -> float:
     """Calculate coefficient of range (Range / Midrange).
 
     Parameters
     ----------
     x : array_like
         Input array.
+    weights : array_like, optional
+        Frequency weights (numbers of occurrences) of the values,
+        the sample is processed without expanding it.
+    nan_policy : {"propagate", "omit", "raise", "assume_none"}, optional
+        Handling of missing values, the nan_policy setting by default
+        (see obscure_stats.config).
 
     Returns
     -------
@@ -322,15 +489,19 @@ def coefficient_of_range(x: np.ndarray) -> float:
     Measures of Dispersion.
     In Biomedical Statistics (pp. 59-70). Springer, Singapore
     """
-    min_ = np.nanmin(x)
-    max_ = np.nanmax(x)
+    min_, max_ = _sample_stats(x, "min", "max", weights=weights)
     if abs(min_ + max_) <= EPS:
         warnings.warn("Midrange is close to 0. Statistic is undefined.", stacklevel=2)
         return np.inf
     return (max_ - min_) / (max_ + min_)
 
 
-def cole_index_of_dispersion(x: np.ndarray) -> float:
+@_instrument
+@_nan_policy
+@_memoize
+def cole_index_of_dispersion(
+    x: np.ndarray, *, weights: np.ndarray | None = None
+) -> float:
     """Calculate Cole's index of dispersion.
 
     Higher values mean higher dispersion.
@@ -339,6 +510,12 @@ def cole_index_of_dispersion(x: np.ndarray) -> float:
     ----------
     x : array_like
         Input array.
+    weights : array_like, optional
+        Frequency weights (numbers of occurrences) of the values,
+        the sample is processed without expanding it.
+    nan_policy : {"propagate", "omit", "raise", "assume_none"}, optional
+        Handling of missing values, the nan_policy setting by default
+        (see obscure_stats.config).
 
     Returns
     -------
@@ -351,10 +528,14 @@ def cole_index_of_dispersion(x: np.ndarray) -> float:
     A theory for analyzing contagiously distributed populations.
     Ecology. 27 (4): 329-341.
     """
-    return np.nansum(np.square(x)) / np.nansum(x) ** 2
+    sumsq, total = _sample_stats(x, "sumsq", "sum", weights=weights)
+    return sumsq / total**2
 
 
-def gini_mean_difference(x: np.ndarray) -> float:
+@_instrument
+@_nan_policy
+@_memoize
+def gini_mean_difference(x: np.ndarray, *, weights: np.ndarray | None = None) -> float:
     """Calculate Gini Mean Difference.
 
     Alternative measure of variability to the usual standard deviation.
@@ -363,6 +544,12 @@ def gini_mean_difference(x: np.ndarray) -> float:
     ----------
     x : array_like
         Input array.
+    weights : array_like, optional
+        Frequency weights (numbers of occurrences) of the values,
+        the sample is processed without expanding it.
+    nan_policy : {"propagate", "omit", "raise", "assume_none"}, optional
+        Handling of missing values, the nan_policy setting by default
+        (see obscure_stats.config).
 
     Returns
     -------
@@ -377,9 +564,10 @@ def gini_mean_difference(x: np.ndarray) -> float:
 
     Notes
     -----
-    This implementation uses cartesian product, so the time and memory complexity
-    are N^2. It is best to not use it on large arrays.
+    Small arrays are processed over the cartesian product (time and memory
+    complexity are N^2), larger ones as a weighted sum of the order statistics
+    (time complexity is N log N), see obscure_stats.dispatch.
     """
-    n = len(x)
-    product = np.meshgrid(x, x, sparse=True)
-    return np.nansum(np.abs(product[0] - product[1])) / (n * (n - 1))
+    if weights is not None:
+        return _weighted_gmd(x, weights)
+    return _gmd(x)
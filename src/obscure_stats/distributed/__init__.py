@@ -0,0 +1,17 @@
+"""Distributed module."""
+
+from .distributed import (
+    distributed_bowley_skew,
+    distributed_midhinge,
+    distributed_quantiles,
+    distributed_quartile_coefficient_of_dispersion,
+    distributed_trimean,
+)
+
+__all__ = [
+    "distributed_bowley_skew",
+    "distributed_midhinge",
+    "distributed_quantiles",
+    "distributed_quartile_coefficient_of_dispersion",
+    "distributed_trimean",
+]
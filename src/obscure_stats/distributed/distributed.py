@@ -0,0 +1,302 @@
+"""Module for exact quantile measures over sharded data.
+
+Every shard is an array or a path to a .npy file. Shards are processed
+independently (optionally in parallel via map_func), and only small
+mergeable summaries are transferred from them:
+
+1. Histograms of the leading bits of the order-preserving integer keys of
+   the values. Bin edges do not depend on the data, so histograms from
+   different shards are simply added up.
+2. If the bin with the target rank is too populated,
+   it is split by the next bits in the following pass.
+3. Values of the bins with the target ranks are collected and the order
+   statistics are selected among them.
+
+Results are bit-identical to np.nanquantile on the concatenation of shards.
+"""
+
+from __future__ import annotations
+
+import functools
+import os
+import typing
+import warnings
+
+import numpy as np
+
+from obscure_stats._utils import _lerp, _quantile_indexes
+from obscure_stats.profiling import _instrument
+
+if typing.TYPE_CHECKING:
+    from collections.abc import Callable, Iterable, Sequence
+
+    Shard = np.ndarray | Sequence[float] | str | os.PathLike
+
+EPS = 1e-6
+_KEY_BITS = 64
+_SIGN = np.uint64(1 << 63)
+
+
+def _load(shard: Shard) -> np.ndarray:
+    """Get values of the shard without missing values."""
+    if isinstance(shard, (str, os.PathLike)):
+        shard = np.load(shard, mmap_mode="r")
+    x = np.asarray(shard).ravel()
+    if x.dtype.kind in "fc":
+        x = x[~np.isnan(x)]
+    return x
+
+
+def _to_keys(x: np.ndarray) -> np.ndarray:
+    """Map values to unsigned integers with the same order."""
+    # adding zero turns -0.0 into 0.0, so equal values get equal keys
+    u = (np.asarray(x, dtype=np.float64) + 0.0).view(np.uint64)
+    return np.where(u & _SIGN, ~u, u | _SIGN)
+
+
+def _from_keys(keys: np.ndarray | np.uint64) -> np.ndarray:
+    """Map keys back to values."""
+    keys = np.asarray(keys, dtype=np.uint64)
+    return np.where(keys & _SIGN, keys & ~_SIGN, ~keys).view(np.float64)
+
+
+def _shard_histograms(
+    shard: Shard, prefixes: np.ndarray, used: int, bits: int
+) -> tuple[np.ndarray, np.dtype]:
+    """Count values by the next bits of the keys with the given prefixes."""
+    x = _load(shard)
+    keys = _to_keys(x)
+    counts = np.zeros((len(prefixes), 1 << bits), dtype=np.int64)
+    if used:
+        head = keys >> np.uint64(_KEY_BITS - used)
+    for i, prefix in enumerate(prefixes):
+        sub = keys[head == prefix] if used else keys
+        sub <<= np.uint64(used)
+        counts[i] += np.bincount(
+            (sub >> np.uint64(_KEY_BITS - bits)).astype(np.intp), minlength=1 << bits
+        )
+    return counts, x.dtype
+
+
+def _shard_candidates(
+    shard: Shard, prefixes: np.ndarray, used: int
+) -> list[np.ndarray]:
+    """Collect values of the keys with the given prefixes."""
+    x = _load(shard)
+    head = _to_keys(x) >> np.uint64(_KEY_BITS - used)
+    return [x[head == prefix] for prefix in prefixes]
+
+
+@_instrument(phase="quantile")
+def _select(
+    shards: Sequence[Shard],
+    q: Sequence[float] | np.ndarray,
+    map_func: Callable,
+    bits: int,
+    max_candidates: int,
+) -> np.ndarray:
+    """Find the order statistics needed for the quantiles."""
+    # target rank -> (key prefix, rank inside the prefix)
+    pending: dict[int, tuple[np.uint64, int]] = {}
+    found: dict[int, typing.Any] = {}
+    used = 0
+    prefixes = np.zeros(1, dtype=np.uint64)
+    while True:
+        step = min(bits, _KEY_BITS - used)
+        func = functools.partial(
+            _shard_histograms, prefixes=prefixes, used=used, bits=step
+        )
+        summaries = list(map_func(func, shards))
+        counts = sum(s[0] for s in summaries)
+        if not used:
+            dtype = np.result_type(*(s[1] for s in summaries))
+            n = int(counts.sum())
+            if not n:
+                return np.full(len(q), np.nan)
+            lo, hi, gamma = _quantile_indexes(n, q)
+            pending = {k: (np.uint64(0), k) for k in np.unique(np.r_[lo, hi])}
+        used += step
+        rows = {prefix: i for i, prefix in enumerate(prefixes)}
+        refine = {}
+        collect = {}
+        for k, (prefix, rank) in pending.items():
+            bins = counts[rows[prefix]]
+            cumulative = np.cumsum(bins)
+            b = int(np.searchsorted(cumulative, rank, side="right"))
+            inner = rank - (int(cumulative[b - 1]) if b else 0)
+            key = (prefix << np.uint64(step)) | np.uint64(b)
+            if used == _KEY_BITS and dtype.kind == "f":
+                # all values of the bin are equal
+                found[k] = _from_keys(key).astype(dtype)
+            elif bins[b] <= max_candidates or used == _KEY_BITS:
+                collect[k] = (key, inner)
+            else:
+                refine[k] = (key, inner)
+        if collect:
+            wanted = np.unique([key for key, _ in collect.values()])
+            gather = functools.partial(_shard_candidates, prefixes=wanted, used=used)
+            parts = list(map_func(gather, shards))
+            for k, (key, inner) in collect.items():
+                i = int(np.searchsorted(wanted, key))
+                values = np.concatenate([p[i] for p in parts]).astype(dtype)
+                found[k] = np.partition(values, inner)[inner]
+        if not refine:
+            break
+        pending = refine
+        prefixes = np.unique([key for key, _ in refine.values()])
+    ranks = np.asarray(sorted(found))
+    values = np.asarray([found[k] for k in ranks], dtype=dtype)
+    return _lerp(
+        values[np.searchsorted(ranks, lo)], values[np.searchsorted(ranks, hi)], gamma
+    )
+
+
+@_instrument
+def distributed_quantiles(
+    shards: Iterable[Shard],
+    q: Sequence[float] | np.ndarray,
+    *,
+    map_func: Callable = map,
+    bits: int = 16,
+    max_candidates: int = 1 << 16,
+) -> np.ndarray:
+    """Calculate exact quantiles of the data split into shards.
+
+    Missing values are ignored, the result is bit-identical to
+    np.nanquantile of the concatenated shards with the linear method.
+
+    Parameters
+    ----------
+    shards : iterable of array_like or path
+        Parts of the data. Paths to .npy files are opened as memory maps.
+    q : array_like
+        Probabilities of the quantiles.
+    map_func : callable, default = map
+        Function with the signature of the builtin map used to process shards,
+        e.g. map method of an executor for the parallel processing.
+    bits : int, default = 16
+        Number of key bits resolved by one histogram pass,
+        every histogram has 2 ** bits bins.
+    max_candidates : int, default = 65536
+        Maximum number of values collected for every order statistic.
+        Bins with more values are split in the next histogram pass.
+
+    Returns
+    -------
+    quantiles : np.ndarray
+        The values of the quantiles.
+
+    References
+    ----------
+    Greenwald, M.; Khanna, S. (2004).
+    Power-conserving computation of order-statistics over sensor networks.
+    Proceedings of the 23rd ACM SIGMOD-SIGACT-SIGART Symposium on Principles
+    of Database Systems, 275-285.
+    """
+    if not 1 <= bits <= 24:  # noqa: PLR2004
+        msg = "Parameter bits should be in range [1, 24]."
+        raise ValueError(msg)
+    return _select(list(shards), q, map_func, bits, max_candidates)
+
+
+@_instrument
+def distributed_midhinge(shards: Iterable[Shard], *, map_func: Callable = map) -> float:
+    """Calculate midhinge of the data split into shards.
+
+    Parameters
+    ----------
+    shards : iterable of array_like or path
+        Parts of the data. Paths to .npy files are opened as memory maps.
+    map_func : callable, default = map
+        Function with the signature of the builtin map used to process shards.
+
+    Returns
+    -------
+    midh : float
+        The value of midhinge.
+
+    See Also
+    --------
+    obscure_stats.central_tendency.midhinge - Midhinge.
+    """
+    q1, q3 = distributed_quantiles(shards, [0.25, 0.75], map_func=map_func)
+    return (q3 + q1) * 0.5
+
+
+@_instrument
+def distributed_trimean(shards: Iterable[Shard], *, map_func: Callable = map) -> float:
+    """Calculate Tukey's trimean of the data split into shards.
+
+    Parameters
+    ----------
+    shards : iterable of array_like or path
+        Parts of the data. Paths to .npy files are opened as memory maps.
+    map_func : callable, default = map
+        Function with the signature of the builtin map used to process shards.
+
+    Returns
+    -------
+    trimean : float
+        The value of trimean.
+
+    See Also
+    --------
+    obscure_stats.central_tendency.trimean - Trimean.
+    """
+    q1, q2, q3 = distributed_quantiles(shards, [0.25, 0.5, 0.75], map_func=map_func)
+    return 0.5 * q2 + 0.25 * q1 + 0.25 * q3
+
+
+@_instrument
+def distributed_quartile_coefficient_of_dispersion(
+    shards: Iterable[Shard], *, map_func: Callable = map
+) -> float:
+    """Calculate quartile coefficient of dispersion of the data split into shards.
+
+    Parameters
+    ----------
+    shards : iterable of array_like or path
+        Parts of the data. Paths to .npy files are opened as memory maps.
+    map_func : callable, default = map
+        Function with the signature of the builtin map used to process shards.
+
+    Returns
+    -------
+    qcd : float
+        The value of quartile coefficient of dispersion.
+
+    See Also
+    --------
+    obscure_stats.dispersion.quartile_coefficient_of_dispersion - QCD.
+    """
+    q1, q3 = distributed_quantiles(shards, [0.25, 0.75], map_func=map_func)
+    if abs(q3 + q1) <= EPS:
+        warnings.warn("Midhinge is close to 0. Statistic is undefined.", stacklevel=2)
+        return np.inf
+    return (q3 - q1) / (q3 + q1)
+
+
+@_instrument
+def distributed_bowley_skew(
+    shards: Iterable[Shard], *, map_func: Callable = map
+) -> float:
+    """Calculate Bowley's skewness coefficient of the data split into shards.
+
+    Parameters
+    ----------
+    shards : iterable of array_like or path
+        Parts of the data. Paths to .npy files are opened as memory maps.
+    map_func : callable, default = map
+        Function with the signature of the builtin map used to process shards.
+
+    Returns
+    -------
+    bs : float
+        The value of Bowley's skewness coefficient.
+
+    See Also
+    --------
+    obscure_stats.skewness.bowley_skew - Bowley's skewness.
+    """
+    q1, q2, q3 = distributed_quantiles(shards, [0.25, 0.5, 0.75], map_func=map_func)
+    return (q3 + q1 - 2 * q2) / (q3 - q1)
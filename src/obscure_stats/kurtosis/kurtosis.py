@@ -1,10 +1,41 @@
 """Module for measures of kurtosis."""
 
 import numpy as np
-from scipy import special, stats  # type: ignore[import-untyped]
 
-
-def l_kurt(x: np.ndarray) -> float:
+from obscure_stats._chunked import _nanstats
+from obscure_stats._utils import (
+    _center,
+    _lerp,
+    _nan_policy,
+    _partition,
+    _pwm,
+    _scratch,
+    _sort,
+    _tail_sums,
+    _work_dtype,
+)
+from obscure_stats._weighted import (
+    _compress,
+    _sample_quantiles,
+    _sample_stats,
+    _weighted_pwm,
+    _weighted_quantiles,
+    _weighted_tail_sums,
+)
+from obscure_stats.cache import _memoize
+from obscure_stats.profiling import _instrument
+
+
+@_instrument
+@_nan_policy
+@_memoize
+def l_kurt(
+    x: np.ndarray,
+    *,
+    overwrite_input: bool = False,
+    buffer: np.ndarray | None = None,
+    weights: np.ndarray | None = None,
+) -> float:
     """Calculate standardized linear kurtosis.
 
     This measure is a 4th linear moment, which is an
@@ -14,6 +45,19 @@ def l_kurt(x: np.ndarray) -> float:
     ----------
     x : array_like
         Input array.
+    overwrite_input : bool, default = False
+        If True, the input array is sorted or partitioned in place
+        and its contents are undefined after the call.
+    buffer : np.ndarray, optional
+        Writeable 1-d array of at least x.size elements, the values are
+        copied into it and reordered there instead of a new array,
+        so one buffer could be reused by many calls.
+    weights : array_like, optional
+        Frequency weights (numbers of occurrences) of the values,
+        the sample is processed without expanding it.
+    nan_policy : {"propagate", "omit", "raise", "assume_none"}, optional
+        Handling of missing values, the nan_policy setting by default
+        (see obscure_stats.config).
 
     Returns
     -------
@@ -27,19 +71,20 @@ def l_kurt(x: np.ndarray) -> float:
     using linear combinations of order statistics.
     Journal of the Royal Statistical Society, Series B. 52 (1): 105-124.
     """
-    n = len(x)
-    _x = np.sort(x)
-    common = 1 / special.comb(n - 1, (0, 1, 2, 4)) / n
-    betas = [
-        common[i] * np.nansum(special.comb(np.arange(i, n), i) * _x[i:])
-        for i in range(4)
-    ]
+    if weights is not None:
+        betas = _weighted_pwm(x, weights, (0, 1, 2, 3))
+    else:
+        _x, owned = _scratch(x, overwrite_input=overwrite_input, buffer=buffer)
+        betas = _pwm(_sort(_x, overwrite_input=owned), (0, 1, 2, 3))
     l4 = 20 * betas[3] - 30 * betas[2] + 12 * betas[1] - betas[0]
     l2 = 2 * betas[1] - betas[0]
     return l4 / l2
 
 
-def moors_kurt(x: np.ndarray) -> float:
+@_instrument
+@_nan_policy
+@_memoize
+def moors_kurt(x: np.ndarray, *, weights: np.ndarray | None = None) -> float:
     """Calculate Moor's vision of kurtosis, based on Z score.
 
     The kurtosis can now be seen as a measure of the dispersion of
@@ -51,6 +96,12 @@ def moors_kurt(x: np.ndarray) -> float:
     ----------
     x : array_like
         Input array.
+    weights : array_like, optional
+        Frequency weights (numbers of occurrences) of the values,
+        the sample is processed without expanding it.
+    nan_policy : {"propagate", "omit", "raise", "assume_none"}, optional
+        Handling of missing values, the nan_policy setting by default
+        (see obscure_stats.config).
 
     Returns
     -------
@@ -63,10 +114,34 @@ def moors_kurt(x: np.ndarray) -> float:
     The meaning of kurtosis: Darlington reexamined.
     The American Statistician, 40 (4): 283-284,
     """
-    return np.nanvar(stats.zscore(x, nan_policy="omit") ** 2) + 1
-
-
-def moors_octile_kurt(x: np.ndarray) -> float:
+    if weights is not None:
+        _x = np.asarray(x, dtype=np.float64)
+        (mean,) = _sample_stats(_x, "mean", weights=weights)
+        d2 = np.square(_x - mean)
+        (var,) = _sample_stats(d2, "mean", weights=weights)
+        z2 = d2 / var
+        (z2_mean,) = _sample_stats(z2, "mean", weights=weights)
+        (kurt,) = _sample_stats(np.square(z2 - z2_mean), "mean", weights=weights)
+        return kurt + 1
+    _x = np.asarray(x)
+    _x = _x.astype(_work_dtype(_x), copy=False)
+    # squared z scores, variances are accumulated in float64
+    d2 = np.square(_center(_x))
+    (var,) = _nanstats(d2, "mean")
+    (kurt,) = _nanstats(np.square(_center(d2 / d2.dtype.type(var))), "mean")
+    return kurt + 1
+
+
+@_instrument
+@_nan_policy
+@_memoize
+def moors_octile_kurt(
+    x: np.ndarray,
+    *,
+    overwrite_input: bool = False,
+    buffer: np.ndarray | None = None,
+    weights: np.ndarray | None = None,
+) -> float:
     """Calculate Moors measure of kurtosis based on octiles (uncentered, unscaled).
 
     This measure should be more robust than moment based kurtosis.
@@ -75,6 +150,19 @@ def moors_octile_kurt(x: np.ndarray) -> float:
     ----------
     x : array_like
         Input array.
+    overwrite_input : bool, default = False
+        If True, the input array is sorted or partitioned in place
+        and its contents are undefined after the call.
+    buffer : np.ndarray, optional
+        Writeable 1-d array of at least x.size elements, the values are
+        copied into it and reordered there instead of a new array,
+        so one buffer could be reused by many calls.
+    weights : array_like, optional
+        Frequency weights (numbers of occurrences) of the values,
+        the sample is processed without expanding it.
+    nan_policy : {"propagate", "omit", "raise", "assume_none"}, optional
+        Handling of missing values, the nan_policy setting by default
+        (see obscure_stats.config).
 
     Returns
     -------
@@ -87,14 +175,26 @@ def moors_octile_kurt(x: np.ndarray) -> float:
     A quantile alternative for kurtosis.
     Journal of the Royal Statistical Society. Series D, 37(1):25-32.
     """
-    o1, o2, o3, o5, o6, o7 = np.nanquantile(
+    o1, o2, o3, o5, o6, o7 = _sample_quantiles(
         x,
         [0.125, 0.25, 0.375, 0.625, 0.750, 0.875],
+        overwrite_input=overwrite_input,
+        buffer=buffer,
+        weights=weights,
     )
     return ((o7 - o5) + (o3 - o1)) / (o6 - o2)
 
 
-def hogg_kurt(x: np.ndarray) -> float:
+@_instrument
+@_nan_policy
+@_memoize
+def hogg_kurt(
+    x: np.ndarray,
+    *,
+    overwrite_input: bool = False,
+    buffer: np.ndarray | None = None,
+    weights: np.ndarray | None = None,
+) -> float:
     """Calculatie Hogg's kurtosis coefficient.
 
     It is based on means of values between different percentiles (uncentered, unscaled).
@@ -104,6 +204,19 @@ def hogg_kurt(x: np.ndarray) -> float:
     ----------
     x : array_like
         Input array.
+    overwrite_input : bool, default = False
+        If True, the input array is sorted or partitioned in place
+        and its contents are undefined after the call.
+    buffer : np.ndarray, optional
+        Writeable 1-d array of at least x.size elements, the values are
+        copied into it and reordered there instead of a new array,
+        so one buffer could be reused by many calls.
+    weights : array_like, optional
+        Frequency weights (numbers of occurrences) of the values,
+        the sample is processed without expanding it.
+    nan_policy : {"propagate", "omit", "raise", "assume_none"}, optional
+        Handling of missing values, the nan_policy setting by default
+        (see obscure_stats.config).
 
     Returns
     -------
@@ -116,17 +229,36 @@ def hogg_kurt(x: np.ndarray) -> float:
     More light on the kurtosis and related statistics.
     Journal of the American Statistical Association, 67(338):422-424.
     """
-    p05, p50, p95 = np.nanquantile(x, [0.05, 0.5, 0.95])
-    masked_p95 = np.where(x >= p95, x, np.nan)
-    masked_p05 = np.where(x <= p05, x, np.nan)
-    masked_p50g = np.where(x >= p50, x, np.nan)
-    masked_p50l = np.where(x <= p50, x, np.nan)
-    return (np.nanmean(masked_p95) - np.nanmean(masked_p05)) / (
-        np.nanmean(masked_p50g) - np.nanmean(masked_p50l)
-    )
-
-
-def crow_siddiqui_kurt(x: np.ndarray) -> float:
+    # means of x >= p95, x <= p05, x >= p50 and x <= p50
+    idx = [2, 0, 1, 1]
+    upper = [True, False, True, False]
+    if weights is not None:
+        xs, ws, _ = _compress(x, weights)
+        if not len(xs):
+            return np.nan
+        qs = _weighted_quantiles(x, weights, [0.05, 0.5, 0.95])
+        sums, counts = _weighted_tail_sums(xs, ws, qs[idx], upper)
+    else:
+        _x, owned = _scratch(x, overwrite_input=overwrite_input, buffer=buffer)
+        xs, lo, hi, gamma = _partition(_x, [0.05, 0.5, 0.95], overwrite_input=owned)
+        if not len(xs):
+            return np.nan
+        qs = _lerp(xs[lo], xs[hi], gamma)
+        sums, counts = _tail_sums(xs, lo[idx], hi[idx], qs[idx], upper)
+    mean_p95, mean_p05, mean_p50g, mean_p50l = sums / counts
+    return (mean_p95 - mean_p05) / (mean_p50g - mean_p50l)
+
+
+@_instrument
+@_nan_policy
+@_memoize
+def crow_siddiqui_kurt(
+    x: np.ndarray,
+    *,
+    overwrite_input: bool = False,
+    buffer: np.ndarray | None = None,
+    weights: np.ndarray | None = None,
+) -> float:
     """Calculate Crow & Siddiqui kurtosis coefficient.
 
     It is based on quartiles and percentiles (uncentered, unscaled) and
@@ -138,6 +270,19 @@ def crow_siddiqui_kurt(x: np.ndarray) -> float:
     ----------
     x : array_like
         Input array.
+    overwrite_input : bool, default = False
+        If True, the input array is sorted or partitioned in place
+        and its contents are undefined after the call.
+    buffer : np.ndarray, optional
+        Writeable 1-d array of at least x.size elements, the values are
+        copied into it and reordered there instead of a new array,
+        so one buffer could be reused by many calls.
+    weights : array_like, optional
+        Frequency weights (numbers of occurrences) of the values,
+        the sample is processed without expanding it.
+    nan_policy : {"propagate", "omit", "raise", "assume_none"}, optional
+        Handling of missing values, the nan_policy setting by default
+        (see obscure_stats.config).
 
     Returns
     -------
@@ -150,11 +295,26 @@ def crow_siddiqui_kurt(x: np.ndarray) -> float:
     Robust estimation of location.
     Journal of the American Statistical Association, 62(318):353-389.
     """
-    p025, p25, p75, p975 = np.nanquantile(x, [0.025, 0.25, 0.75, 0.975])
+    p025, p25, p75, p975 = _sample_quantiles(
+        x,
+        [0.025, 0.25, 0.75, 0.975],
+        overwrite_input=overwrite_input,
+        buffer=buffer,
+        weights=weights,
+    )
     return (p975 + p025) / (p75 - p25)
 
 
-def reza_ma_kurt(x: np.ndarray) -> float:
+@_instrument
+@_nan_policy
+@_memoize
+def reza_ma_kurt(
+    x: np.ndarray,
+    *,
+    overwrite_input: bool = False,
+    buffer: np.ndarray | None = None,
+    weights: np.ndarray | None = None,
+) -> float:
     """Calculatie Reza & Ma kurtosis coefficient.
 
     It is based on hexadeciles (uncentered, unscaled) and is very
@@ -165,6 +325,19 @@ def reza_ma_kurt(x: np.ndarray) -> float:
     ----------
     x : array_like
         Input array.
+    overwrite_input : bool, default = False
+        If True, the input array is sorted or partitioned in place
+        and its contents are undefined after the call.
+    buffer : np.ndarray, optional
+        Writeable 1-d array of at least x.size elements, the values are
+        copied into it and reordered there instead of a new array,
+        so one buffer could be reused by many calls.
+    weights : array_like, optional
+        Frequency weights (numbers of occurrences) of the values,
+        the sample is processed without expanding it.
+    nan_policy : {"propagate", "omit", "raise", "assume_none"}, optional
+        Handling of missing values, the nan_policy setting by default
+        (see obscure_stats.config).
 
     Returns
     -------
@@ -177,5 +350,11 @@ def reza_ma_kurt(x: np.ndarray) -> float:
     ICA and PCA integrated feature extraction for classification.
     2016 IEEE 13th International Conference on Signal Processing (ICSP), 1083-1088.
     """
-    h1, h7, h9, h15 = np.nanquantile(x, [0.0625, 0.4375, 0.5625, 0.9375])
+    h1, h7, h9, h15 = _sample_quantiles(
+        x,
+        [0.0625, 0.4375, 0.5625, 0.9375],
+        overwrite_input=overwrite_input,
+        buffer=buffer,
+        weights=weights,
+    )
     return ((h15 - h9) + (h7 - h1)) / (h15 - h1)
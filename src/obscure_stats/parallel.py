@@ -0,0 +1,244 @@
+"""Module for parallel evaluation of the measures over many columns.
+
+The matrix is copied once into shared memory in the column-major order,
+worker processes attach to it at the start and get only the ranges of columns,
+so the data is never pickled. Kernels that spend most of the time in numpy
+(sorting, partitioning, reductions) release the GIL, so for long columns and
+such measures the columns are processed by threads without any copies.
+
+Examples
+--------
+>>> from obscure_stats.parallel import compute_many
+>>> x = np.random.default_rng(0).normal(size=(1000, 5000))  # doctest: +SKIP
+>>> result = compute_many(x, ["midhinge", "l_skew"], n_jobs=8)  # doctest: +SKIP
+>>> result.shape  # doctest: +SKIP
+(2, 5000)
+"""
+
+from __future__ import annotations
+
+import concurrent.futures
+import contextvars
+import math
+import os
+import typing
+import warnings
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from obscure_stats._registry import ESTIMATORS
+from obscure_stats._utils import _shared_nan_policy
+from obscure_stats.config import config_context, get_config, set_config
+
+if typing.TYPE_CHECKING:
+    from collections.abc import Sequence
+
+BACKENDS = ("auto", "threads", "processes")
+# measures dominated by Python code that holds the GIL
+_GIL_BOUND = frozenset(
+    {
+        "auc_skew_gamma",
+        "avdev",
+        "b_index",
+        "gibbs_m1",
+        "gibbs_m2",
+        "half_sample_mode",
+        "mcintosh_d",
+        "mod_vr",
+        "negative_extropy",
+        "range_vr",
+        "renyi_entropy",
+        "standard_trimmed_harrell_davis_quantile",
+    }
+)
+# shorter columns are dominated by the overhead of the calls
+_MIN_THREAD_ROWS = 1 << 15
+# number of tasks per worker, balances uneven columns
+_TASKS_PER_JOB = 4
+
+# columns of the shared matrix in the worker processes
+_columns: np.ndarray | None = None
+_block: shared_memory.SharedMemory | None = None
+
+
+def _choose_backend(statistics: Sequence[str], n_rows: int) -> str:
+    """Use threads when the kernels release the GIL for most of the time."""
+    if n_rows >= _MIN_THREAD_ROWS and not _GIL_BOUND.intersection(statistics):
+        return "threads"
+    return "processes"
+
+
+def _compute_chunk(
+    columns: np.ndarray, start: int, stop: int, statistics: Sequence[str]
+) -> np.ndarray:
+    """Calculate the statistics of the columns in [start, stop).
+
+    Every column is checked for missing values once for all the statistics.
+    """
+    result = np.empty((len(statistics), stop - start))
+    for j in range(start, stop):
+        policy = _shared_nan_policy(columns[j])
+        if policy == "propagate":
+            result[:, j - start] = np.nan
+            continue
+        with config_context(nan_policy=policy):
+            for i, name in enumerate(statistics):
+                result[i, j - start] = ESTIMATORS[name](columns[j])
+    return result
+
+
+def _init_worker(name: str, shape: tuple[int, int], dtype: str, config: dict) -> None:
+    """Attach the worker process to the shared matrix."""
+    global _columns, _block  # noqa: PLW0603
+    # workers share the resource tracker of the parent, which unlinks the block
+    _block = shared_memory.SharedMemory(name=name)
+    _columns = np.ndarray(shape, dtype=dtype, buffer=_block.buf)
+    _columns.flags.writeable = False
+    set_config(**config)
+
+
+def _compute_shared(
+    start: int, stop: int, statistics: Sequence[str]
+) -> tuple[np.ndarray, list[tuple[str, type[Warning]]]]:
+    """Calculate the statistics of the shared columns, warnings are returned."""
+    if _columns is None:
+        msg = "Worker is not attached to the shared matrix."
+        raise RuntimeError(msg)
+    with warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter("always")
+        result = _compute_chunk(_columns, start, stop, statistics)
+    unique = {(str(w.message), w.category) for w in caught}
+    return result, sorted(unique, key=lambda w: w[0])
+
+
+def _run_threads(
+    columns: np.ndarray,
+    chunks: list[tuple[int, int]],
+    statistics: Sequence[str],
+    n_jobs: int,
+) -> list[np.ndarray]:
+    """Process the chunks of columns in the thread pool."""
+    with concurrent.futures.ThreadPoolExecutor(n_jobs) as executor:
+        # threads do not inherit the settings of the caller
+        futures = [
+            executor.submit(
+                contextvars.copy_context().run,
+                _compute_chunk,
+                columns,
+                start,
+                stop,
+                statistics,
+            )
+            for start, stop in chunks
+        ]
+        return [future.result() for future in futures]
+
+
+def _run_processes(
+    x: np.ndarray,
+    chunks: list[tuple[int, int]],
+    statistics: Sequence[str],
+    n_jobs: int,
+) -> list[np.ndarray]:
+    """Process the chunks of columns in the process pool over shared memory."""
+    shape = (x.shape[1], x.shape[0])
+    block = shared_memory.SharedMemory(create=True, size=max(x.nbytes, 1))
+    try:
+        columns = np.ndarray(shape, dtype=x.dtype, buffer=block.buf)
+        columns[...] = x.T
+        # the block could not be closed while the view exists
+        del columns
+        initargs = (block.name, shape, x.dtype.str, get_config())
+        with concurrent.futures.ProcessPoolExecutor(
+            n_jobs, initializer=_init_worker, initargs=initargs
+        ) as executor:
+            futures = [
+                executor.submit(_compute_shared, start, stop, statistics)
+                for start, stop in chunks
+            ]
+            outputs = [future.result() for future in futures]
+    finally:
+        block.close()
+        block.unlink()
+    replayed = set()
+    for _, caught in outputs:
+        for message, category in caught:
+            if (message, category) not in replayed:
+                replayed.add((message, category))
+                warnings.warn(message, category, stacklevel=3)
+    return [result for result, _ in outputs]
+
+
+def compute_many(
+    x: np.ndarray,
+    statistics: Sequence[str],
+    *,
+    n_jobs: int | None = None,
+    backend: str = "auto",
+    nan_policy: str | None = None,
+) -> np.ndarray:
+    """Calculate the statistics of every column of the matrix in parallel.
+
+    Parameters
+    ----------
+    x : array_like
+        Numeric matrix, rows are observations and columns are variables
+        (e.g. values of a DataFrame).
+    statistics : sequence of str
+        Names of the statistics, see `obscure_stats list`.
+    n_jobs : int, optional
+        Number of workers, number of CPUs by default.
+        With one worker the columns are processed in the calling thread.
+    backend : {"auto", "threads", "processes"}, default = "auto"
+        Threads share the matrix without copies, processes attach
+        to its copy in shared memory. Threads are chosen for long columns
+        when none of the statistics holds the GIL for long.
+    nan_policy : {"propagate", "omit", "raise", "assume_none"}, optional
+        Handling of missing values, the nan_policy setting by default
+        (see obscure_stats.config). Every column is checked once.
+
+    Returns
+    -------
+    result : np.ndarray
+        Matrix of the values, rows are the statistics and columns are
+        the columns of x.
+
+    Notes
+    -----
+    Warnings of the worker processes are emitted once per message.
+    """
+    _x = np.asarray(x)
+    if _x.ndim != 2:  # noqa: PLR2004
+        msg = "Input should be a 2-d array."
+        raise ValueError(msg)
+    if _x.dtype.kind not in "biuf":
+        msg = "Input should be a numeric array."
+        raise ValueError(msg)
+    unknown = [name for name in statistics if name not in ESTIMATORS]
+    if unknown:
+        msg = f"Unknown statistics {unknown}."
+        raise ValueError(msg)
+    if backend not in BACKENDS:
+        msg = f"Parameter backend should be one of {BACKENDS}, got {backend}."
+        raise ValueError(msg)
+    n_jobs = n_jobs or os.cpu_count() or 1
+    if n_jobs < 1:
+        msg = "Parameter n_jobs should be a positive integer."
+        raise ValueError(msg)
+    n_rows, n_columns = _x.shape
+    n_jobs = min(n_jobs, max(n_columns, 1))
+    settings = {} if nan_policy is None else {"nan_policy": nan_policy}
+    with config_context(**settings):
+        if n_jobs == 1:
+            return _compute_chunk(_x.T, 0, n_columns, statistics)
+        step = math.ceil(n_columns / (n_jobs * _TASKS_PER_JOB))
+        chunks = [
+            (start, min(start + step, n_columns)) for start in range(0, n_columns, step)
+        ]
+        if backend == "auto":
+            backend = _choose_backend(statistics, n_rows)
+        run = _run_threads if backend == "threads" else _run_processes
+        columns = _x.T if backend == "threads" else _x
+        results = run(columns, chunks, statistics, n_jobs)
+    return np.concatenate(results, axis=1)
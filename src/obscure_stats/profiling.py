@@ -0,0 +1,315 @@
+"""Module for opt-in profiling of the library calls.
+
+Every public function (and shared internals, e.g. validation of the inputs)
+is instrumented. Profiling is enabled by the profile context manager or for
+the whole process by the environment variables:
+
+- OBSCURE_STATS_PROFILE - path of the report written at exit;
+- OBSCURE_STATS_PROFILE_FORMAT - "json" (default) or "chrome";
+- OBSCURE_STATS_PROFILE_MEMORY - "0" disables tracing of the allocations.
+
+For every function the report contains number of calls, number of input
+elements, wall time (in seconds, including nested calls), time spent in
+the sort, quantile and validation phases and peak allocated bytes.
+Chrome traces could be opened in chrome://tracing or ui.perfetto.dev.
+
+When profiling is disabled an instrumented call costs one global lookup.
+Memory is traced by tracemalloc, which slows down the profiled code;
+allocations of concurrent threads are mixed up.
+"""
+
+from __future__ import annotations
+
+import atexit
+import contextlib
+import functools
+import json
+import os
+import pathlib
+import threading
+import time
+import tracemalloc
+import typing
+
+import numpy as np
+
+if typing.TYPE_CHECKING:
+    from collections.abc import Callable, Iterator
+
+_F = typing.TypeVar("_F", bound="Callable[..., typing.Any]")
+
+PHASES = ("validation", "sort", "quantile")
+FORMATS = ("json", "chrome")
+
+_session: Profiler | None = None
+
+
+def _size(x: typing.Any) -> int:  # noqa: ANN401
+    """Count elements of the input, shards are summed up."""
+    if isinstance(x, np.ndarray):
+        return x.size
+    if isinstance(x, (list, tuple)):
+        return sum(_size(v) for v in x)
+    return int(isinstance(x, (int, float, np.number)))
+
+
+class _Frame:
+    """State of one instrumented call."""
+
+    __slots__ = ("name", "peak", "phase", "phases", "start", "start_memory")
+
+    def __init__(self, name: str, phase: str | None) -> None:
+        self.name = name
+        self.phase = phase
+        self.phases = dict.fromkeys(PHASES, 0.0)
+        self.peak = 0
+        self.start_memory = 0
+        self.start = 0.0
+
+
+class Profiler:
+    """Collector of the statistics of instrumented calls.
+
+    Parameters
+    ----------
+    memory : bool, default = True
+        Trace peak allocations with tracemalloc.
+    max_events : int, default = 1000000
+        Number of calls kept for the Chrome trace, later calls
+        are only aggregated.
+    """
+
+    def __init__(self, *, memory: bool = True, max_events: int = 1_000_000) -> None:
+        self.memory = memory
+        self.max_events = max_events
+        self.records: dict[str, dict[str, typing.Any]] = {}
+        self.events: list[dict[str, typing.Any]] = []
+        self.dropped_events = 0
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._origin = time.perf_counter()
+        self._started_tracing = False
+
+    def start(self) -> None:
+        """Start tracing of the allocations if needed."""
+        if self.memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+
+    def stop(self) -> None:
+        """Stop tracing of the allocations started by the profiler."""
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+    def call(
+        self,
+        func: Callable,
+        phase: str | None,
+        args: tuple,
+        kwargs: dict[str, typing.Any],
+    ) -> typing.Any:  # noqa: ANN401
+        """Call the function and record its statistics."""
+        stack: list[_Frame] = self._local.__dict__.setdefault("stack", [])
+        frame = _Frame(func.__name__, phase)
+        tracing = self.memory and tracemalloc.is_tracing()
+        if tracing:
+            current, peak = tracemalloc.get_traced_memory()
+            if stack:
+                stack[-1].peak = max(stack[-1].peak, peak)
+            tracemalloc.reset_peak()
+            frame.start_memory = current
+        stack.append(frame)
+        frame.start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            elapsed = time.perf_counter() - frame.start
+            stack.pop()
+            allocated = 0
+            if tracing:
+                frame.peak = max(frame.peak, tracemalloc.get_traced_memory()[1])
+                allocated = max(frame.peak - frame.start_memory, 0)
+                if stack:
+                    stack[-1].peak = max(stack[-1].peak, frame.peak)
+            # time of nested phases is attributed only to the outermost phase
+            if phase is not None and not any(f.phase for f in stack):
+                for outer in stack:
+                    outer.phases[phase] += elapsed
+            self._record(frame, elapsed, allocated, _size(args[0]) if args else 0)
+
+    def _record(self, frame: _Frame, elapsed: float, allocated: int, n: int) -> None:
+        """Aggregate statistics of the finished call."""
+        with self._lock:
+            record = self.records.get(frame.name)
+            if record is None:
+                record = self.records[frame.name] = {
+                    "calls": 0,
+                    "elements": 0,
+                    "max_elements": 0,
+                    "time": 0.0,
+                    "phases": dict.fromkeys(PHASES, 0.0),
+                    "peak_memory": 0,
+                }
+            record["calls"] += 1
+            record["elements"] += n
+            record["max_elements"] = max(record["max_elements"], n)
+            record["time"] += elapsed
+            for name, value in frame.phases.items():
+                record["phases"][name] += value
+            record["peak_memory"] = max(record["peak_memory"], allocated)
+            if len(self.events) >= self.max_events:
+                self.dropped_events += 1
+                return
+            self.events.append(
+                {
+                    "name": frame.name,
+                    "cat": frame.phase or "function",
+                    "ph": "X",
+                    "ts": (frame.start - self._origin) * 1e6,
+                    "dur": elapsed * 1e6,
+                    "pid": os.getpid(),
+                    "tid": threading.get_ident(),
+                    "args": {"elements": n, "peak_memory": allocated},
+                }
+            )
+
+    def stats(self) -> dict[str, dict[str, typing.Any]]:
+        """Get aggregated statistics of every instrumented function.
+
+        Returns
+        -------
+        stats : dict
+            Function name -> calls, elements (total number of input elements),
+            max_elements, time (seconds), phases (seconds spent in sort,
+            quantile and validation) and peak_memory (bytes).
+        """
+        with self._lock:
+            return {
+                name: {**record, "phases": dict(record["phases"])}
+                for name, record in sorted(self.records.items())
+            }
+
+    def to_json(self, path: str | os.PathLike) -> None:
+        """Write aggregated statistics as JSON."""
+        pathlib.Path(path).write_text(json.dumps(self.stats(), indent=2))
+
+    def to_chrome_trace(self, path: str | os.PathLike) -> None:
+        """Write every recorded call in the Chrome trace event format."""
+        with self._lock:
+            trace = {
+                "traceEvents": list(self.events),
+                "displayTimeUnit": "ms",
+                "otherData": {"dropped_events": self.dropped_events},
+            }
+        pathlib.Path(path).write_text(json.dumps(trace))
+
+    def export(self, path: str | os.PathLike, trace_format: str = "json") -> None:
+        """Write the report in the format, "json" or "chrome"."""
+        if trace_format not in FORMATS:
+            msg = f"Parameter trace_format should be one of {FORMATS}."
+            raise ValueError(msg)
+        if trace_format == "chrome":
+            self.to_chrome_trace(path)
+        else:
+            self.to_json(path)
+
+
+@typing.overload
+def _instrument(func: _F) -> _F: ...
+
+
+@typing.overload
+def _instrument(*, phase: str) -> Callable[[_F], _F]: ...
+
+
+def _instrument(
+    func: _F | None = None, *, phase: str | None = None
+) -> _F | Callable[[_F], _F]:
+    """Record calls of the function while profiling is enabled.
+
+    Used as @_instrument or as @_instrument(phase=...) for helpers,
+    which time is added to the phases of the calling functions.
+    """
+
+    def decorator(f: _F) -> _F:
+        @functools.wraps(f)
+        def wrapper(*args: typing.Any, **kwargs: typing.Any) -> typing.Any:  # noqa: ANN401
+            if _session is None:
+                return f(*args, **kwargs)
+            return _session.call(f, phase, args, kwargs)
+
+        return typing.cast("_F", wrapper)
+
+    if func is None:
+        return decorator
+    return decorator(func)
+
+
+@contextlib.contextmanager
+def profile(
+    path: str | os.PathLike | None = None,
+    *,
+    trace_format: str = "json",
+    memory: bool = True,
+) -> Iterator[Profiler]:
+    """Profile calls of the library functions.
+
+    Parameters
+    ----------
+    path : str or PathLike, optional
+        File to write the report to on exit.
+    trace_format : str, default = "json"
+        Format of the report, "json" (aggregated statistics)
+        or "chrome" (Chrome trace of every call).
+    memory : bool, default = True
+        Trace peak allocations with tracemalloc.
+
+    Yields
+    ------
+    profiler : Profiler
+        Collected statistics, see Profiler.stats.
+
+    Examples
+    --------
+    >>> from obscure_stats.profiling import profile
+    >>> from obscure_stats.central_tendency import midhinge
+    >>> with profile() as profiler:
+    ...     _ = midhinge([1.0, 2.0, 3.0, 4.0])
+    >>> profiler.stats()["midhinge"]["calls"]
+    1
+    """
+    global _session  # noqa: PLW0603
+    if trace_format not in FORMATS:
+        msg = f"Parameter trace_format should be one of {FORMATS}."
+        raise ValueError(msg)
+    profiler = Profiler(memory=memory)
+    previous = _session
+    profiler.start()
+    _session = profiler
+    try:
+        yield profiler
+    finally:
+        _session = previous
+        profiler.stop()
+        if path is not None:
+            profiler.export(path, trace_format)
+
+
+def _start_from_environment() -> None:
+    """Enable profiling of the whole process by the environment variables."""
+    global _session  # noqa: PLW0603
+    path = os.environ.get("OBSCURE_STATS_PROFILE")
+    if not path:
+        return
+    trace_format = os.environ.get("OBSCURE_STATS_PROFILE_FORMAT", "json")
+    if trace_format not in FORMATS:
+        msg = f"OBSCURE_STATS_PROFILE_FORMAT should be one of {FORMATS}."
+        raise ValueError(msg)
+    profiler = Profiler(memory=os.environ.get("OBSCURE_STATS_PROFILE_MEMORY") != "0")
+    profiler.start()
+    _session = profiler
+    atexit.register(profiler.export, path, trace_format)
+
+
+_start_from_environment()
@@ -0,0 +1,17 @@
+"""Rolling module."""
+
+from .rolling import (
+    rolling_chatterjeexi,
+    rolling_coefficient_of_lvariation,
+    rolling_gini_mean_difference,
+    rolling_l_kurt,
+    rolling_l_skew,
+)
+
+__all__ = [
+    "rolling_chatterjeexi",
+    "rolling_coefficient_of_lvariation",
+    "rolling_gini_mean_difference",
+    "rolling_l_kurt",
+    "rolling_l_skew",
+]
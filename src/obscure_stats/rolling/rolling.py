@@ -0,0 +1,576 @@
+"""Module for rolling (sliding window) measures."""
+
+from __future__ import annotations
+
+import typing
+import warnings
+
+import numpy as np
+
+from obscure_stats._utils import _argsort
+from obscure_stats.cache import _memoize
+from obscure_stats.profiling import _instrument
+
+EPS = 1e-6
+# L-scale of constant windows is a rounding error of the sums of this relative size
+_ROUNDING = 1e-10
+
+
+class _FenwickTree:
+    """Binary indexed tree with point updates and prefix sums."""
+
+    def __init__(self, size: int) -> None:
+        self.tree = [0.0] * (size + 1)
+
+    def add(self, i: int, value: float) -> None:
+        """Add value to the element with index i."""
+        i += 1
+        size = len(self.tree)
+        while i < size:
+            self.tree[i] += value
+            i += i & -i
+
+    def prefix(self, i: int) -> float:
+        """Sum elements with indexes lower than i."""
+        total = 0.0
+        while i > 0:
+            total += self.tree[i]
+            i -= i & -i
+        return total
+
+    def kth(self, k: float) -> int:
+        """Find the lowest index at which prefix sum reaches k."""
+        i = 0
+        size = len(self.tree)
+        step = 1 << size.bit_length()
+        while step:
+            j = i + step
+            if j < size and self.tree[j] < k:
+                i = j
+                k -= self.tree[j]
+            step >>= 1
+        return i
+
+
+class _PairwiseDifferences:
+    """Sum of absolute pairwise differences of the values inside the window.
+
+    Counts and sums of the values are kept in Fenwick trees over value ranks,
+    so that every insert and evict is O(log N).
+    """
+
+    def __init__(self, size: int) -> None:
+        self.counts = _FenwickTree(size)
+        self.sums = _FenwickTree(size)
+        self.n = 0
+        self.total = 0.0
+        self.diffs = 0.0
+
+    def _contribution(self, slot: int, value: float) -> float:
+        below_n = self.counts.prefix(slot)
+        below_sum = self.sums.prefix(slot)
+        above_n = self.n - below_n
+        above_sum = self.total - below_sum
+        return value * (below_n - above_n) - below_sum + above_sum
+
+    def insert(self, slot: int, value: float) -> None:
+        """Insert value with the given rank."""
+        self.diffs += self._contribution(slot, value)
+        self.counts.add(slot, 1.0)
+        self.sums.add(slot, value)
+        self.n += 1
+        self.total += value
+
+    def remove(self, slot: int, value: float) -> None:
+        """Remove value with the given rank."""
+        self.counts.add(slot, -1.0)
+        self.sums.add(slot, -value)
+        self.n -= 1
+        self.total -= value
+        self.diffs -= self._contribution(slot, value)
+
+
+class _LMomentTree:
+    """Segment tree over value ranks with probability weighted moments.
+
+    Every node keeps the number of values in its range and the sums
+    B_p = sum(C(j, p) * x_j), where j is a rank of the value inside the node.
+    Sums of the parent are merged from the children with Vandermonde's identity,
+    so every insert and evict is O(log N) and the root holds B_p of the window.
+    Supported orders are 2 and 3.
+    """
+
+    def __init__(self, size: int, order: int) -> None:
+        self.size = 1 << max(size - 1, 1).bit_length()
+        self.order = order
+        self.counts = [0] * (2 * self.size)
+        self.sums = [[0.0] * (2 * self.size) for _ in range(order + 1)]
+
+    def _update(self, slot: int, count: int, value: float) -> None:
+        counts = self.counts
+        s0, s1, s2 = self.sums[:3]
+        s3 = self.sums[3] if self.order > 2 else None  # noqa: PLR2004
+        i = slot + self.size
+        counts[i] = count
+        s0[i] = value
+        i >>= 1
+        while i:
+            left = 2 * i
+            right = left + 1
+            c = counts[left]
+            counts[i] = c + counts[right]
+            r0 = s0[right]
+            r1 = s1[right]
+            r2 = s2[right]
+            c2 = c * (c - 1) // 2
+            s0[i] = s0[left] + r0
+            s1[i] = s1[left] + r1 + c * r0
+            s2[i] = s2[left] + r2 + c * r1 + c2 * r0
+            if s3 is not None:
+                c3 = c2 * (c - 2) // 3
+                s3[i] = s3[left] + s3[right] + c * r2 + c2 * r1 + c3 * r0
+            i >>= 1
+
+    def insert(self, slot: int, value: float) -> None:
+        """Insert value with the given rank."""
+        self._update(slot, 1, value)
+
+    def remove(self, slot: int, value: float) -> None:  # noqa: ARG002
+        """Remove value with the given rank."""
+        self._update(slot, 0, 0.0)
+
+    @property
+    def n(self) -> int:
+        """Number of values in the window."""
+        return self.counts[1]
+
+    def betas(self) -> list[float]:
+        """Calculate probability weighted moments of the window."""
+        n = self.n
+        betas = []
+        norm = float(n)
+        for p in range(self.order + 1):
+            betas.append(self.sums[p][1] / norm)
+            norm = norm * (n - 1 - p) / (p + 1)
+        return betas
+
+
+class _XiState:
+    """Sums of the Chatterjee xi correlation of the pairs inside the window.
+
+    Pairs are ordered by x (ties are broken by order of arrival) and
+    the numerator sum(|r_(i+1) - r_i|) is updated only for the neighbours of
+    the inserted or evicted pair, plus the number of neighbouring pairs
+    whose y ranks straddle its y value. The denominator sum(l_i * (n - l_i))
+    is updated from counts and squared multiplicities of the y values.
+    All of them are kept in Fenwick trees, so every step is O(log N).
+    """
+
+    def __init__(self, size: int, y_ranks: list[int], n_unique: int) -> None:
+        self.order = _FenwickTree(size)
+        self.y_ranks = y_ranks
+        self.counts = _FenwickTree(n_unique)
+        self.squares = _FenwickTree(n_unique)
+        self.multiplicity = [0] * n_unique
+        self.intervals = _FenwickTree(n_unique + 1)
+        self.n = 0
+        self.squares_total = 0.0
+        self.numerator = 0.0
+        self.denominator = 0.0
+
+    def _between(self, ra: int, rb: int) -> float:
+        """Calculate |r_b - r_a| from counts of y values."""
+        lo, hi = (ra, rb) if ra < rb else (rb, ra)
+        return self.counts.prefix(hi + 1) - self.counts.prefix(lo + 1)
+
+    def _link(self, ra: int, rb: int, sign: float) -> None:
+        """Add or remove pair of neighbours and its interval of y ranks."""
+        self.numerator += sign * self._between(ra, rb)
+        if ra != rb:
+            lo, hi = (ra, rb) if ra < rb else (rb, ra)
+            self.intervals.add(lo + 1, sign)
+            self.intervals.add(hi + 1, -sign)
+
+    def _triples(self, r: int) -> float:
+        """Calculate change of the denominator caused by y value with rank r."""
+        n = self.n
+        lt = self.counts.prefix(r)
+        le = self.counts.prefix(r + 1)
+        sq_le = self.squares.prefix(r + 1)
+        sq_gt = self.squares_total - sq_le
+        # new value as the middle, the highest and the lowest one of the triple
+        as_middle = (n - lt + 1) * lt
+        as_highest = (le * le - sq_le) * 0.5
+        as_lowest = ((n - le) ** 2 + sq_gt) * 0.5
+        return as_middle + as_highest + as_lowest
+
+    def _neighbours(self, slot: int) -> tuple[int, int]:
+        """Find y ranks of the preceding and following pairs in x order."""
+        k = self.order.prefix(slot)
+        pred = self.y_ranks[self.order.kth(k)] if k > 0 else -1
+        succ = self.y_ranks[self.order.kth(k + 1)] if k < self.n else -1
+        return pred, succ
+
+    def insert(self, slot: int, r: int) -> None:
+        """Insert pair with the given x and y ranks."""
+        self.denominator += self._triples(r)
+        m = self.multiplicity[r]
+        self.multiplicity[r] = m + 1
+        self.squares.add(r, 2 * m + 1)
+        self.squares_total += 2 * m + 1
+        pred, succ = self._neighbours(slot)
+        # every neighbouring pair straddling y gets its rank difference increased
+        self.numerator += self.intervals.prefix(r + 1)
+        self.counts.add(r, 1.0)
+        if pred >= 0 and succ >= 0:
+            self._link(pred, succ, -1.0)
+        if pred >= 0:
+            self._link(pred, r, 1.0)
+        if succ >= 0:
+            self._link(r, succ, 1.0)
+        self.order.add(slot, 1.0)
+        self.n += 1
+
+    def remove(self, slot: int, r: int) -> None:
+        """Remove pair with the given x and y ranks."""
+        self.order.add(slot, -1.0)
+        self.n -= 1
+        pred, succ = self._neighbours(slot)
+        if pred >= 0:
+            self._link(pred, r, -1.0)
+        if succ >= 0:
+            self._link(r, succ, -1.0)
+        if pred >= 0 and succ >= 0:
+            self._link(pred, succ, 1.0)
+        self.counts.add(r, -1.0)
+        self.numerator -= self.intervals.prefix(r + 1)
+        m = self.multiplicity[r]
+        self.multiplicity[r] = m - 1
+        self.squares.add(r, -(2 * m - 1))
+        self.squares_total -= 2 * m - 1
+        self.denominator -= self._triples(r)
+
+    def xi(self) -> float:
+        """Calculate xi correlation coefficient of the window."""
+        if self.n < 2 or self.denominator <= 0:  # noqa: PLR2004
+            return np.nan
+        return 1.0 - 0.5 * self.n * self.numerator / self.denominator
+
+
+_State = typing.TypeVar("_State", _PairwiseDifferences, _LMomentTree)
+
+
+@_instrument(phase="validation")
+def _check_window(n: int, window: int) -> None:
+    """Check size of the window."""
+    if window < 2 or window > n:  # noqa: PLR2004
+        msg = "Parameter window should be in range [2, len(x)]."
+        raise ValueError(msg)
+
+
+def _roll(
+    x: np.ndarray,
+    window: int,
+    state: typing.Callable[[int], _State],
+    statistic: typing.Callable[[_State], float],
+) -> np.ndarray:
+    """Slide the window over the array and evaluate statistic at every step."""
+    _x = np.asarray(x, dtype=np.float64)
+    n = len(_x)
+    _check_window(n, window)
+    slots = np.empty(n, dtype=np.intp)
+    slots[_argsort(_x, stable=True)] = np.arange(n)
+    finite = np.isfinite(_x).tolist()
+    values = _x.tolist()
+    ranks = slots.tolist()
+    current = state(n)
+    result = np.empty(n - window + 1)
+    for i in range(n):
+        if finite[i]:
+            current.insert(ranks[i], values[i])
+        j = i - window
+        if j >= 0 and finite[j]:
+            current.remove(ranks[j], values[j])
+        if j >= -1:
+            result[j + 1] = statistic(current)
+    return result
+
+
+def _gmd(state: _PairwiseDifferences) -> float:
+    n = state.n
+    if n < 2:  # noqa: PLR2004
+        return np.nan
+    return 2 * state.diffs / (n * (n - 1))
+
+
+def _lcv(state: _PairwiseDifferences) -> float:
+    n = state.n
+    if n < 2:  # noqa: PLR2004
+        return np.nan
+    l1 = state.total / n
+    if abs(l1) <= EPS:
+        return np.inf
+    l2 = state.diffs / (n * (n - 1))
+    return l2 / l1
+
+
+def _lskew(state: _LMomentTree) -> float:
+    if state.n < 3:  # noqa: PLR2004
+        return np.nan
+    b0, b1, b2 = state.betas()
+    l3 = 6 * b2 - 6 * b1 + b0
+    l2 = 2 * b1 - b0
+    if abs(l2) <= _ROUNDING * abs(b0):
+        return np.nan
+    return l3 / l2
+
+
+def _lkurt(state: _LMomentTree) -> float:
+    if state.n < 4:  # noqa: PLR2004
+        return np.nan
+    b0, b1, b2, b3 = state.betas()
+    l4 = 20 * b3 - 30 * b2 + 12 * b1 - b0
+    l2 = 2 * b1 - b0
+    if abs(l2) <= _ROUNDING * abs(b0):
+        return np.nan
+    return l4 / l2
+
+
+@_instrument
+@_memoize
+def rolling_gini_mean_difference(x: np.ndarray, window: int) -> np.ndarray:
+    """Calculate Gini Mean Difference over a sliding window.
+
+    Every step of the window is updated in O(log N) instead of
+    recomputing the statistic from scratch.
+
+    Parameters
+    ----------
+    x : array_like
+        Input array.
+    window : int
+        Size of the sliding window.
+
+    Returns
+    -------
+    gmd : np.ndarray
+        The values of the Gini Mean Difference, one for every window
+        x[i : i + window].
+
+    References
+    ----------
+    Yitzhaki, S.; Schechtman, E. (2013).
+    The Gini Methodology.
+    Springer, New York.
+
+    Notes
+    -----
+    Missing values are skipped, so the statistic of each window is calculated
+    only on the finite values in it.
+    Sums are updated incrementally, so the rounding errors accumulate
+    with the length of the array.
+
+    See Also
+    --------
+    obscure_stats.dispersion.gini_mean_difference - Gini Mean Difference.
+    """
+    return _roll(x, window, _PairwiseDifferences, _gmd)
+
+
+@_instrument
+@_memoize
+def rolling_coefficient_of_lvariation(x: np.ndarray, window: int) -> np.ndarray:
+    """Calculate linear coefficient of variation over a sliding window.
+
+    Every step of the window is updated in O(log N) instead of
+    recomputing the statistic from scratch.
+
+    Parameters
+    ----------
+    x : array_like
+        Input array.
+    window : int
+        Size of the sliding window.
+
+    Returns
+    -------
+    lcv : np.ndarray
+        The values of the linear coefficient of variation, one for every window
+        x[i : i + window].
+
+    References
+    ----------
+    Hosking, J. R. M. (1990).
+    L-moments: analysis and estimation of distributions
+    using linear combinations of order statistics.
+    Journal of the Royal Statistical Society, Series B. 52 (1): 105-124.
+
+    Notes
+    -----
+    Missing values are skipped, so the statistic of each window is calculated
+    only on the finite values in it.
+    Sums are updated incrementally, so the rounding errors accumulate
+    with the length of the array.
+
+    See Also
+    --------
+    obscure_stats.dispersion.coefficient_of_lvariation - Linear CV.
+    """
+    result = _roll(x, window, _PairwiseDifferences, _lcv)
+    if np.isinf(result).any():
+        warnings.warn(
+            "Mean is close to 0 in some of the windows. Statistic is undefined.",
+            stacklevel=2,
+        )
+    return result
+
+
+@_instrument
+@_memoize
+def rolling_l_skew(x: np.ndarray, window: int) -> np.ndarray:
+    """Calculate standardized linear skewness over a sliding window.
+
+    Every step of the window is updated in O(log N) instead of
+    recomputing the statistic from scratch.
+
+    Parameters
+    ----------
+    x : array_like
+        Input array.
+    window : int
+        Size of the sliding window.
+
+    Returns
+    -------
+    lsk : np.ndarray
+        The values of L-Skewness, one for every window x[i : i + window].
+
+    References
+    ----------
+    Hosking, J. R. M. (1990).
+    L-moments: analysis and estimation of distributions
+    using linear combinations of order statistics.
+    Journal of the Royal Statistical Society, Series B. 52 (1): 105-124.
+
+    Notes
+    -----
+    Missing values are skipped, so the statistic of each window is calculated
+    only on the finite values in it.
+
+    See Also
+    --------
+    obscure_stats.skewness.l_skew - L-Skewness.
+    """
+    return _roll(x, window, lambda size: _LMomentTree(size, 2), _lskew)
+
+
+@_instrument
+@_memoize
+def rolling_l_kurt(x: np.ndarray, window: int) -> np.ndarray:
+    """Calculate standardized linear kurtosis over a sliding window.
+
+    Every step of the window is updated in O(log N) instead of
+    recomputing the statistic from scratch.
+
+    Parameters
+    ----------
+    x : array_like
+        Input array.
+    window : int
+        Size of the sliding window.
+
+    Returns
+    -------
+    lkr : np.ndarray
+        The values of L-Kurtosis, one for every window x[i : i + window].
+
+    References
+    ----------
+    Hosking, J. R. M. (1990).
+    L-moments: analysis and estimation of distributions
+    using linear combinations of order statistics.
+    Journal of the Royal Statistical Society, Series B. 52 (1): 105-124.
+
+    Notes
+    -----
+    Missing values are skipped, so the statistic of each window is calculated
+    only on the finite values in it.
+
+    See Also
+    --------
+    obscure_stats.kurtosis.l_kurt - L-Kurtosis.
+    """
+    return _roll(x, window, lambda size: _LMomentTree(size, 3), _lkurt)
+
+
+@_instrument
+@_memoize
+def rolling_chatterjeexi(x: np.ndarray, y: np.ndarray, window: int) -> np.ndarray:
+    """Calculate Xi correlation coefficient over a sliding window.
+
+    Every step of the window is updated in O(log N) instead of
+    sorting and ranking the whole window from scratch.
+
+    This implementation does not break ties at random, instead
+    it break ties depending on order. This makes it dependent on
+    data sorting, which could be useful in application like time
+    series.
+
+    Parameters
+    ----------
+    x : array_like
+        Input array.
+    y : array_like
+        Input array.
+    window : int
+        Size of the sliding window.
+
+    Returns
+    -------
+    xi : np.ndarray
+        The values of the xi correlation coefficient, one for every window
+        (x[i : i + window], y[i : i + window]).
+
+    References
+    ----------
+    Chatterjee, S. (2021).
+    A new coefficient of correlation.
+    Journal of the American Statistical Association, 116(536), 2009-2022.
+
+    Notes
+    -----
+    This measure is assymetric: (x, y) != (y, x).
+    Pairs with missing or infinite values are skipped, so the statistic of each
+    window is calculated only on the finite pairs in it.
+
+    See Also
+    --------
+    obscure_stats.association.chatterjeexi - Chatterjee Xi coefficient.
+    """
+    _x = np.asarray(x, dtype=np.float64)
+    _y = np.asarray(y, dtype=np.float64)
+    n = len(_x)
+    if len(_y) != n:
+        msg = "Lengths of the inputs do not match, please check the arrays."
+        raise ValueError(msg)
+    _check_window(n, window)
+    finite = np.isfinite(_x) & np.isfinite(_y)
+    _, y_ranks = np.unique(np.where(finite, _y, 0.0), return_inverse=True)
+    slots = np.empty(n, dtype=np.intp)
+    slots[_argsort(_x, stable=True)] = np.arange(n)
+    y_by_slot = np.empty(n, dtype=np.intp)
+    y_by_slot[slots] = y_ranks
+    current = _XiState(n, y_by_slot.tolist(), int(y_ranks.max()) + 1)
+    is_finite = finite.tolist()
+    x_slots = slots.tolist()
+    ranks = y_ranks.tolist()
+    result = np.empty(n - window + 1)
+    for i in range(n):
+        if is_finite[i]:
+            current.insert(x_slots[i], ranks[i])
+        j = i - window
+        if j >= 0 and is_finite[j]:
+            current.remove(x_slots[j], ranks[j])
+        if j >= -1:
+            result[j + 1] = current.xi()
+    return result
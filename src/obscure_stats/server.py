@@ -0,0 +1,150 @@
+"""Local statistics server.
+
+Long-running server for short-lived jobs: estimators (and scipy) are
+imported once by the worker processes, and clients (see obscure_stats.client)
+send batches of arrays through shared memory or as paths to .npy files.
+
+The server listens on a Unix socket, every request and response is one line
+of JSON::
+
+    {"op": "compute", "statistics": ["midhinge"],
+     "arrays": [{"shm": "psm_1", "dtype": "<f8", "shape": [100]},
+                {"npy": "/data/column.npy"}]}
+    {"results": [{"count": 100, "statistics": {...}, "timings": {...}}, ...]}
+
+Other operations are "ping" and "shutdown". Clients are not authenticated,
+so the socket is accessible only by its owner: it is created in the per-user
+runtime directory by default and its mode is set to 0600.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import concurrent.futures
+import functools
+import json
+import os
+import pathlib
+import typing
+
+import numpy as np
+
+from obscure_stats._registry import ESTIMATORS
+from obscure_stats.cli import _describe_column
+from obscure_stats.client import DEFAULT_SOCKET, _attach, _encode, _runtime_dir
+
+if typing.TYPE_CHECKING:
+    from collections.abc import Sequence
+
+# requests with inline arrays could be long
+_LINE_LIMIT = 2**26
+
+
+def _compute(spec: dict, statistics: Sequence[str]) -> dict:
+    """Calculate the statistics of one array in the worker process."""
+    if "npy" in spec:
+        return _describe_column(np.load(spec["npy"], mmap_mode="r"), statistics)
+    shm = _attach(spec["shm"])
+    try:
+        return _describe_column(
+            np.ndarray(spec["shape"], dtype=spec["dtype"], buffer=shm.buf), statistics
+        )
+    finally:
+        shm.close()
+
+
+async def _respond(
+    request: dict, executor: concurrent.futures.Executor, stop: asyncio.Event
+) -> dict:
+    """Process one request."""
+    op = request.get("op")
+    if op == "ping":
+        return {"ok": True}
+    if op == "shutdown":
+        stop.set()
+        return {"ok": True}
+    if op != "compute":
+        return {"error": f"Unknown operation {op}."}
+    statistics = request.get("statistics", [])
+    unknown = [name for name in statistics if name not in ESTIMATORS]
+    if unknown:
+        return {"error": f"Unknown statistics {unknown}."}
+    loop = asyncio.get_running_loop()
+    try:
+        results = await asyncio.gather(
+            *(
+                loop.run_in_executor(executor, _compute, spec, statistics)
+                for spec in request.get("arrays", [])
+            )
+        )
+    except (OSError, ValueError, KeyError, TypeError) as e:
+        return {"error": f"{type(e).__name__}: {e}"}
+    return {"results": results}
+
+
+async def _handle(
+    reader: asyncio.StreamReader,
+    writer: asyncio.StreamWriter,
+    executor: concurrent.futures.Executor,
+    stop: asyncio.Event,
+) -> None:
+    """Serve requests of one connection."""
+    try:
+        while line := await reader.readline():
+            try:
+                request = json.loads(line)
+            except ValueError:
+                response = {"error": "Request should be one line of JSON."}
+            else:
+                response = await _respond(request, executor, stop)
+            writer.write(_encode(response))
+            await writer.drain()
+            if stop.is_set():
+                break
+    finally:
+        writer.close()
+
+
+def _private_dir(directory: pathlib.Path) -> None:
+    """Create the default directory of the socket, accessible only by the user."""
+    directory.mkdir(mode=0o700, exist_ok=True)
+    info = directory.lstat()
+    if not directory.is_dir() or directory.is_symlink():
+        msg = f"Socket directory {directory} is not a directory."
+        raise OSError(msg)
+    if info.st_uid != os.getuid() or info.st_mode & 0o077:
+        msg = f"Socket directory {directory} should be private to the user."
+        raise OSError(msg)
+
+
+async def _serve(path: str, workers: int | None) -> None:
+    """Run the server until the shutdown request."""
+    directory = pathlib.Path(path).parent
+    if directory == _runtime_dir():
+        _private_dir(directory)
+    stop = asyncio.Event()
+    with concurrent.futures.ProcessPoolExecutor(workers) as executor:
+        handler = functools.partial(_handle, executor=executor, stop=stop)
+        server = await asyncio.start_unix_server(handler, path, limit=_LINE_LIMIT)
+        # requests are not authenticated, only the owner could connect
+        os.chmod(path, 0o600)  # noqa: PTH101
+        async with server:
+            await stop.wait()
+
+
+def serve(path: str | os.PathLike = DEFAULT_SOCKET, workers: int | None = None) -> None:
+    """Run the statistics server.
+
+    Parameters
+    ----------
+    path : str, optional
+        Path of the Unix socket, obscure_stats.sock in $XDG_RUNTIME_DIR
+        (or in the private temporary directory) by default.
+        Its mode is set to 0600.
+    workers : int, optional
+        Number of worker processes, number of CPUs by default.
+    """
+    try:
+        asyncio.run(_serve(os.fspath(path), workers))
+    finally:
+        pathlib.Path(path).unlink(missing_ok=True)
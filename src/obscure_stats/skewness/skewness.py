@@ -2,13 +2,49 @@
 
 from __future__ import annotations
 
+import functools
+import typing
+
 import numpy as np
-from scipy import integrate, special, stats  # type: ignore[import-untyped]
 
+from obscure_stats._chunked import _nanstats
+from obscure_stats._utils import (
+    _count_values,
+    _counting_candidates,
+    _dot,
+    _nan_policy,
+    _pwm,
+    _scratch,
+    _sort,
+    _sorted_quantiles,
+    _strip_nans,
+    _work_dtype,
+)
+from obscure_stats._weighted import (
+    _sample_median,
+    _sample_quantiles,
+    _sample_stats,
+    _weighted_pwm,
+)
+from obscure_stats.cache import _memoize
 from obscure_stats.central_tendency import half_sample_mode
-
-
-def l_skew(x: np.ndarray) -> float:
+from obscure_stats.dispatch import _choose
+from obscure_stats.profiling import _instrument
+
+if typing.TYPE_CHECKING:
+    from collections.abc import Sequence
+
+
+@_instrument
+@_nan_policy
+@_memoize
+def l_skew(
+    x: np.ndarray,
+    *,
+    overwrite_input: bool = False,
+    buffer: np.ndarray | None = None,
+    weights: np.ndarray | None = None,
+) -> float:
     """Calculate standardized linear skewness.
 
     This measure is a 3rd linear moment, which is an
@@ -18,6 +54,19 @@ def l_skew(x: np.ndarray) -> float:
     ----------
     x : array_like
         Input array.
+    overwrite_input : bool, default = False
+        If True, the input array is sorted or partitioned in place
+        and its contents are undefined after the call.
+    buffer : np.ndarray, optional
+        Writeable 1-d array of at least x.size elements, the values are
+        copied into it and reordered there instead of a new array,
+        so one buffer could be reused by many calls.
+    weights : array_like, optional
+        Frequency weights (numbers of occurrences) of the values,
+        the sample is processed without expanding it.
+    nan_policy : {"propagate", "omit", "raise", "assume_none"}, optional
+        Handling of missing values, the nan_policy setting by default
+        (see obscure_stats.config).
 
     Returns
     -------
@@ -31,27 +80,93 @@ def l_skew(x: np.ndarray) -> float:
     using linear combinations of order statistics.
     Journal of the Royal Statistical Society, Series B. 52 (1): 105-124.
     """
-    n = len(x)
-    _x = np.sort(x)
-    common = 1 / special.comb(n - 1, (0, 1, 2)) / n
-    betas = [
-        common[i] * np.nansum(special.comb(np.arange(i, n), i) * _x[i:])
-        for i in range(3)
-    ]
+    if weights is not None:
+        betas = _weighted_pwm(x, weights, (0, 1, 2))
+    else:
+        _x, owned = _scratch(x, overwrite_input=overwrite_input, buffer=buffer)
+        betas = _pwm(_sort(_x, overwrite_input=owned), (0, 1, 2))
     l3 = 6 * betas[2] - 6 * betas[1] + betas[0]
     l2 = 2 * betas[1] - betas[0]
     return l3 / l2
 
 
-def pearson_mode_skew(x: np.ndarray) -> float:
+_MODE_METHODS = ("exact", "hist", "kde", "hsm")
+
+
+def _exact_mode(xs: np.ndarray) -> float:
+    """Find the smallest of the most frequent values."""
+    algorithm = "counts_unique"
+    if xs.dtype.kind in "iu":
+        # counting is cheaper than sorting while the value range is small
+        candidates, span = _counting_candidates(xs)
+        algorithm = _choose("counts", len(xs), candidates=candidates, span=span)
+    values, counts = _count_values(xs, algorithm)
+    return values[np.argmax(counts)]
+
+
+def _binned_mode(xs: np.ndarray, bins: int, *, smooth: bool) -> float:
+    """Find the center of the densest bin of the (smoothed) histogram."""
+    counts, edges = np.histogram(xs, bins=bins)
+    if smooth:
+        # Gaussian kernel with Silverman's rule bandwidth in the units of bins
+        width = edges[1] - edges[0]
+        bandwidth = 0.9 * np.std(xs) * len(xs) ** -0.2 / width if width else 0.0
+        if bandwidth > 0:
+            radius = min(int(np.ceil(4 * bandwidth)), bins)
+            grid = np.arange(-radius, radius + 1)
+            kernel = np.exp(-0.5 * (grid / bandwidth) ** 2)
+            # the kernel could be longer than the histogram, "same" mode
+            # would return the longer of them
+            full = np.convolve(counts, kernel, mode="full")
+            counts = full[radius : radius + len(counts)]
+    i = np.argmax(counts)
+    return 0.5 * (edges[i] + edges[i + 1])
+
+
+def _estimate_mode(x: np.ndarray, method: str, bins: int) -> float:
+    """Estimate the mode of the data without missing values."""
+    if method not in _MODE_METHODS:
+        msg = f"Parameter method should be one of {_MODE_METHODS}."
+        raise ValueError(msg)
+    if method == "hsm":
+        return half_sample_mode(x)
+    xs = _strip_nans(x, copy=False)
+    if not len(xs):
+        return np.nan
+    if method == "exact":
+        return _exact_mode(xs)
+    if bins < 1:
+        msg = "Parameter bins should be a positive integer."
+        raise ValueError(msg)
+    return _binned_mode(xs, bins, smooth=method == "kde")
+
+
+@_instrument
+@_nan_policy
+@_memoize
+def pearson_mode_skew(x: np.ndarray, method: str = "exact", bins: int = 256) -> float:
     """Calculate Pearson's mode skew coefficient.
 
     This measure could be unstable due mode instability.
+    Exact mode is meaningful only for discrete data,
+    for continuous data one of the estimators should be used instead.
 
     Parameters
     ----------
     x : array_like
         Input array.
+    method : str, default = "exact"
+        Mode estimation method, one of:
+        "exact" - the most frequent value (the smallest one in case of ties),
+        "hist" - the center of the most populated histogram bin,
+        "kde" - the peak of the Gaussian kernel density estimate
+        computed on the histogram,
+        "hsm" - the half-sample mode.
+    bins : int, default = 256
+        Number of histogram bins for "hist" and "kde" methods.
+    nan_policy : {"propagate", "omit", "raise", "assume_none"}, optional
+        Handling of missing values, the nan_policy setting by default
+        (see obscure_stats.config).
 
     Returns
     -------
@@ -63,13 +178,20 @@ def pearson_mode_skew(x: np.ndarray) -> float:
     Pearson, E. S.; Hartley, H. O. (1966).
     Biometrika Tables for Statisticians, vols. I and II.
     Cambridge University Press, Cambridge.
+
+    Bickel, D. R.; Fruehwirth, R. (2006).
+    On a fast, robust estimator of the mode: Comparisons to other robust
+    estimators with applications.
+    Computational Statistics & Data Analysis, 50(12), 3500-3530.
     """
-    mean = np.nanmean(x)
-    mode = stats.mode(x)[0]
-    std = np.nanstd(x)
+    mean, std = _nanstats(x, "mean", "std")
+    mode = _estimate_mode(x, method, bins)
     return (mean - mode) / std
 
 
+@_instrument
+@_nan_policy
+@_memoize
 def bickel_mode_skew(x: np.ndarray) -> float:
     """Calculate Robust Mode skew with half sample mode.
 
@@ -80,6 +202,9 @@ def bickel_mode_skew(x: np.ndarray) -> float:
     ----------
     x : array_like
         Input array.
+    nan_policy : {"propagate", "omit", "raise", "assume_none"}, optional
+        Handling of missing values, the nan_policy setting by default
+        (see obscure_stats.config).
 
     Returns
     -------
@@ -93,16 +218,26 @@ def bickel_mode_skew(x: np.ndarray) -> float:
     Computational Statistics & Data Analysis, Elsevier, 39(2), 153-163.
     """
     mode = half_sample_mode(x)
-    return np.nanmean(np.sign(x - mode))
+    (bms,) = _nanstats(np.sign(x - mode), "mean")
+    return bms
 
 
-def pearson_median_skew(x: np.ndarray) -> float:
+@_instrument
+@_nan_policy
+@_memoize
+def pearson_median_skew(x: np.ndarray, *, weights: np.ndarray | None = None) -> float:
     """Calculatie Pearson's median skew coefficient.
 
     Parameters
     ----------
     x : array_like
         Input array.
+    weights : array_like, optional
+        Frequency weights (numbers of occurrences) of the values,
+        the sample is processed without expanding it.
+    nan_policy : {"propagate", "omit", "raise", "assume_none"}, optional
+        Handling of missing values, the nan_policy setting by default
+        (see obscure_stats.config).
 
     Returns
     -------
@@ -115,13 +250,15 @@ def pearson_median_skew(x: np.ndarray) -> float:
     Biometrika Tables for Statisticians, vols. I and II.
     Cambridge University Press, Cambridge.
     """
-    mean = np.nanmean(x)
-    median = np.nanmedian(x)
-    std = np.nanstd(x)
+    mean, std = _sample_stats(x, "mean", "std", weights=weights)
+    median = _sample_median(x, weights)
     return 3 * (mean - median) / std
 
 
-def medeen_skew(x: np.ndarray) -> float:
+@_instrument
+@_nan_policy
+@_memoize
+def medeen_skew(x: np.ndarray, *, weights: np.ndarray | None = None) -> float:
     """Calculate Medeen's skewness statistic.
 
     This measure is similar to Pearson median skewness coefficient
@@ -132,6 +269,12 @@ def medeen_skew(x: np.ndarray) -> float:
     ----------
     x : array_like
         Input array.
+    weights : array_like, optional
+        Frequency weights (numbers of occurrences) of the values,
+        the sample is processed without expanding it.
+    nan_policy : {"propagate", "omit", "raise", "assume_none"}, optional
+        Handling of missing values, the nan_policy setting by default
+        (see obscure_stats.config).
 
     Returns
     -------
@@ -144,12 +287,22 @@ def medeen_skew(x: np.ndarray) -> float:
     Measuring Skewness and Kurtosis.
     The Statistician. 33 (4): 391-399.
     """
-    median = np.nanmedian(x)
-    mean = np.nanmean(x)
-    return (mean - median) / np.nanmean(np.abs(x - median))
-
-
-def bowley_skew(x: np.ndarray) -> float:
+    median = _sample_median(x, weights)
+    (mean,) = _sample_stats(x, "mean", weights=weights)
+    (mad,) = _sample_stats(np.abs(x - median), "mean", weights=weights)
+    return (mean - median) / mad
+
+
+@_instrument
+@_nan_policy
+@_memoize
+def bowley_skew(
+    x: np.ndarray,
+    *,
+    overwrite_input: bool = False,
+    buffer: np.ndarray | None = None,
+    weights: np.ndarray | None = None,
+) -> float:
     """Calculate Bowley's skewness coefficinet.
 
     Also known as Yule-Kendall skewness coefficient.
@@ -161,6 +314,19 @@ def bowley_skew(x: np.ndarray) -> float:
     ----------
     x : array_like
         Input array.
+    overwrite_input : bool, default = False
+        If True, the input array is sorted or partitioned in place
+        and its contents are undefined after the call.
+    buffer : np.ndarray, optional
+        Writeable 1-d array of at least x.size elements, the values are
+        copied into it and reordered there instead of a new array,
+        so one buffer could be reused by many calls.
+    weights : array_like, optional
+        Frequency weights (numbers of occurrences) of the values,
+        the sample is processed without expanding it.
+    nan_policy : {"propagate", "omit", "raise", "assume_none"}, optional
+        Handling of missing values, the nan_policy setting by default
+        (see obscure_stats.config).
 
     Returns
     -------
@@ -173,11 +339,26 @@ def bowley_skew(x: np.ndarray) -> float:
     Elements of Statistics.
     P.S. King and Son, London.
     """
-    q1, q2, q3 = np.nanquantile(x, [0.25, 0.5, 0.75])
+    q1, q2, q3 = _sample_quantiles(
+        x,
+        [0.25, 0.5, 0.75],
+        overwrite_input=overwrite_input,
+        buffer=buffer,
+        weights=weights,
+    )
     return (q3 + q1 - 2 * q2) / (q3 - q1)
 
 
-def groeneveld_skew(x: np.ndarray) -> float:
+@_instrument
+@_nan_policy
+@_memoize
+def groeneveld_skew(
+    x: np.ndarray,
+    *,
+    overwrite_input: bool = False,
+    buffer: np.ndarray | None = None,
+    weights: np.ndarray | None = None,
+) -> float:
     """Calculate Groeneveld's skewness coefficinet.
 
     It is based on quartiles (uncentered, unscaled).
@@ -189,6 +370,19 @@ def groeneveld_skew(x: np.ndarray) -> float:
     ----------
     x : array_like
         Input array.
+    overwrite_input : bool, default = False
+        If True, the input array is sorted or partitioned in place
+        and its contents are undefined after the call.
+    buffer : np.ndarray, optional
+        Writeable 1-d array of at least x.size elements, the values are
+        copied into it and reordered there instead of a new array,
+        so one buffer could be reused by many calls.
+    weights : array_like, optional
+        Frequency weights (numbers of occurrences) of the values,
+        the sample is processed without expanding it.
+    nan_policy : {"propagate", "omit", "raise", "assume_none"}, optional
+        Handling of missing values, the nan_policy setting by default
+        (see obscure_stats.config).
 
     Returns
     -------
@@ -201,13 +395,28 @@ def groeneveld_skew(x: np.ndarray) -> float:
     Measuring Skewness and Kurtosis.
     The Statistician. 33 (4): 391-399.
     """
-    q1, q2, q3 = np.nanquantile(x, [0.25, 0.5, 0.75])
+    q1, q2, q3 = _sample_quantiles(
+        x,
+        [0.25, 0.5, 0.75],
+        overwrite_input=overwrite_input,
+        buffer=buffer,
+        weights=weights,
+    )
     rs = (q3 + q1 - 2 * q2) / (q2 - q1)
     ls = (q3 + q1 - 2 * q2) / (q3 - q2)
     return rs if abs(rs) > abs(ls) else ls
 
 
-def kelly_skew(x: np.ndarray) -> float:
+@_instrument
+@_nan_policy
+@_memoize
+def kelly_skew(
+    x: np.ndarray,
+    *,
+    overwrite_input: bool = False,
+    buffer: np.ndarray | None = None,
+    weights: np.ndarray | None = None,
+) -> float:
     """Calculate Kelly's skewness coefficinet.
 
     It is based on deciles (uncentered, unscaled).
@@ -219,6 +428,19 @@ def kelly_skew(x: np.ndarray) -> float:
     ----------
     x : array_like
         Input array.
+    overwrite_input : bool, default = False
+        If True, the input array is sorted or partitioned in place
+        and its contents are undefined after the call.
+    buffer : np.ndarray, optional
+        Writeable 1-d array of at least x.size elements, the values are
+        copied into it and reordered there instead of a new array,
+        so one buffer could be reused by many calls.
+    weights : array_like, optional
+        Frequency weights (numbers of occurrences) of the values,
+        the sample is processed without expanding it.
+    nan_policy : {"propagate", "omit", "raise", "assume_none"}, optional
+        Handling of missing values, the nan_policy setting by default
+        (see obscure_stats.config).
 
     Returns
     -------
@@ -231,11 +453,20 @@ def kelly_skew(x: np.ndarray) -> float:
     Some tests of significance with ordered variables.
     J. R. Stat. Soc. Ser. B Stat. Methodol. 18, 1-31.
     """
-    d1, d5, d9 = np.nanquantile(x, [0.1, 0.5, 0.9])
+    d1, d5, d9 = _sample_quantiles(
+        x,
+        [0.1, 0.5, 0.9],
+        overwrite_input=overwrite_input,
+        buffer=buffer,
+        weights=weights,
+    )
     return (d9 + d1 - 2 * d5) / (d9 - d1)
 
 
-def hossain_adnan_skew(x: np.ndarray) -> float:
+@_instrument
+@_nan_policy
+@_memoize
+def hossain_adnan_skew(x: np.ndarray, *, weights: np.ndarray | None = None) -> float:
     """Calculate Houssain and Adnan skewness coefficient.
 
     It is based on differences from the median, and is somewhar similar
@@ -246,6 +477,12 @@ def hossain_adnan_skew(x: np.ndarray) -> float:
     ----------
     x : array_like
         Input array.
+    weights : array_like, optional
+        Frequency weights (numbers of occurrences) of the values,
+        the sample is processed without expanding it.
+    nan_policy : {"propagate", "omit", "raise", "assume_none"}, optional
+        Handling of missing values, the nan_policy setting by default
+        (see obscure_stats.config).
 
     Returns
     -------
@@ -258,10 +495,15 @@ def hossain_adnan_skew(x: np.ndarray) -> float:
     A New Approach to Determine the Asymmetry of a Distribution.
     Journal of Applied St atistical Science, Vol.15, pp. 127-134.
     """
-    diff = x - np.nanmedian(x)
-    return np.nanmean(diff) / np.nanmean(np.abs(diff))
+    diff = x - _sample_median(x, weights)
+    (mean,) = _sample_stats(diff, "mean", weights=weights)
+    (mad,) = _sample_stats(np.abs(diff), "mean", weights=weights)
+    return mean / mad
 
 
+@_instrument
+@_nan_policy
+@_memoize
 def forhad_shorna_rank_skew(x: np.ndarray) -> float:
     """Calculate Forhad-Shorna coefficient of rank skewness.
 
@@ -273,6 +515,9 @@ def forhad_shorna_rank_skew(x: np.ndarray) -> float:
     ----------
     x : array_like
         Input array.
+    nan_policy : {"propagate", "omit", "raise", "assume_none"}, optional
+        Handling of missing values, the nan_policy setting by default
+        (see obscure_stats.config).
 
     Returns
     -------
@@ -286,28 +531,88 @@ def forhad_shorna_rank_skew(x: np.ndarray) -> float:
     An Alternative Form of Boxplot.
     arXiv preprint arXiv:1908.06400.
     """
-    mr = (np.nanmin(x) + np.nanmax(x)) * 0.5
-    arr = np.r_[x, mr]
-    arr_ranked = stats.rankdata(arr, method="min", nan_policy="omit")
-    diff = arr_ranked[-1] - arr_ranked
-    diff = diff[:-1]
-    return np.nansum(diff) / np.nansum(np.abs(diff))
-
-
-def _auc_skew_gamma(x: np.ndarray, dp: float, w: np.ndarray | float) -> float:
-    """Calculate AUC skew."""
+    xs = _strip_nans(x)
+    xs = _sort(xs, overwrite_input=True)
+    n = len(xs)
+    if not n:
+        return np.nan
+    mr = (xs[0] + xs[-1]) * 0.5
+    # min-rank differences between the midrange and every value are
+    # n_below - n_lower(x) for values below it and n_below - n_lower(x) - 1 above,
+    # where n_lower(x) is the position of the first occurrence of x
+    n_below = np.searchsorted(xs, mr, side="left")
+    n_above = n - np.searchsorted(xs, mr, side="right")
+    starts = np.flatnonzero(np.r_[True, xs[1:] != xs[:-1]])
+    lower = starts * np.diff(np.r_[starts, n])
+    lower_below = np.sum(lower[starts < n_below])
+    lower_above = np.sum(lower[starts >= n - n_above])
+    total = n * n_below - np.sum(lower) - n_above
+    total_abs = n_below * n_below - lower_below + lower_above + n_above * (1 - n_below)
+    return total / total_abs
+
+
+@functools.lru_cache(maxsize=32)
+def _auc_grid(dp: float) -> np.ndarray:
+    """Calculate probabilities used in AUC skew (the median is the last one)."""
     n = int(1 / dp)
-    half_n = n // 2
-    qs = np.nanquantile(x, np.r_[np.linspace(0, 1, n), 0.5])
-    med = qs[-1]
-    qs = qs[:-1]
-    qs_low = qs[:half_n]
-    qs_high = qs[-half_n:]
-    skews = (qs_low + qs_high - 2 * med) / (qs_high - qs_low) * w
-    return integrate.trapezoid(skews, dx=dp)
-
-
-def auc_skew_gamma(x: np.ndarray, dp: float = 0.01) -> float:
+    grid = np.r_[np.linspace(0, 1, n), 0.5]
+    grid.flags.writeable = False
+    return grid
+
+
+def _quantile_function(
+    x: np.ndarray, bin_edges: np.ndarray | None
+) -> typing.Callable[[np.ndarray], np.ndarray]:
+    """Sort the data (or accumulate the histogram) once for all quantile grids."""
+    if bin_edges is not None:
+        cum_counts = np.r_[0, np.cumsum(x)]
+        edges = np.asarray(bin_edges)
+        if len(edges) != len(cum_counts):
+            msg = "Parameter bin_edges should be one element longer than counts."
+            raise ValueError(msg)
+        return lambda p: np.interp(p * cum_counts[-1], cum_counts, edges)
+    xs = _strip_nans(x)
+    if not len(xs):
+        return lambda p: np.full(len(p), np.nan)
+    xs = _sort(xs, overwrite_input=True)
+    return lambda p: _sorted_quantiles(xs, p)
+
+
+@_instrument
+def _auc_skew_gamma(
+    x: np.ndarray,
+    dp: float | Sequence[float],
+    bin_edges: np.ndarray | None,
+    *,
+    weighted: bool,
+) -> float | np.ndarray:
+    """Calculate AUC skew for one or several steps."""
+    quantile_function = _quantile_function(x, bin_edges)
+    dps = np.asarray(dp, dtype=np.float64)
+    aucs = []
+    for _dp in dps.ravel().tolist():
+        n = int(1 / _dp)
+        half_n = n // 2
+        w = (np.arange(half_n) / half_n)[::-1] if weighted else 1.0
+        qs = quantile_function(_auc_grid(_dp))
+        med = qs[-1]
+        qs = qs[:-1]
+        qs_low = qs[:half_n]
+        qs_high = qs[-half_n:]
+        skews = (qs_low + qs_high - 2 * med) / (qs_high - qs_low) * w
+        aucs.append((_dp * (skews[1:] + skews[:-1]) / 2.0).sum())
+    return aucs[0] if dps.ndim == 0 else np.reshape(aucs, dps.shape)
+
+
+@_instrument
+@_nan_policy
+@_memoize
+def auc_skew_gamma(
+    x: np.ndarray,
+    dp: float | Sequence[float] = 0.01,
+    *,
+    bin_edges: np.ndarray | None = None,
+) -> float | np.ndarray:
     """Calculate area under the curve of generalized Bowley skewness coefficients.
 
     This measure tries to combine multiple generalized Bowley skewness coefficients
@@ -316,14 +621,22 @@ def auc_skew_gamma(x: np.ndarray, dp: float = 0.01) -> float:
     Parameters
     ----------
     x : array_like
-        Input array.
-    dp : float, default = 0.01
+        Input array, or counts of the histogram if bin_edges are given.
+    dp : float or sequence of floats, default = 0.01
         Step used in calculating area under the curve (integrating).
+        If several steps are given, the data is sorted only once.
+    bin_edges : array_like, optional
+        Edges of the histogram bins (as returned by np.histogram).
+        If given, quantiles are interpolated from the pre-binned
+        histogram or quantile sketch, so the raw data is not needed.
+    nan_policy : {"propagate", "omit", "raise", "assume_none"}, optional
+        Handling of missing values, the nan_policy setting by default
+        (see obscure_stats.config).
 
     Returns
     -------
-    aucbs : float
-        The value of AUC Bowley skewness.
+    aucbs : float or np.ndarray
+        The value of AUC Bowley skewness (one for every step).
 
     References
     ----------
@@ -331,11 +644,18 @@ def auc_skew_gamma(x: np.ndarray, dp: float = 0.01) -> float:
     Mean skewness measures.
     arXiv preprint arXiv:1912.06996.
     """
-    w = 1.0
-    return _auc_skew_gamma(x, dp, w)
-
-
-def wauc_skew_gamma(x: np.ndarray, dp: float = 0.01) -> float:
+    return _auc_skew_gamma(x, dp, bin_edges, weighted=False)
+
+
+@_instrument
+@_nan_policy
+@_memoize
+def wauc_skew_gamma(
+    x: np.ndarray,
+    dp: float | Sequence[float] = 0.01,
+    *,
+    bin_edges: np.ndarray | None = None,
+) -> float | np.ndarray:
     """
     Calculate weighted area under the curve of generalized Bowley skewness coefficients.
 
@@ -345,14 +665,22 @@ def wauc_skew_gamma(x: np.ndarray, dp: float = 0.01) -> float:
     Parameters
     ----------
     x : array_like
-        Input array.
-    dp : float, default = 0.01
+        Input array, or counts of the histogram if bin_edges are given.
+    dp : float or sequence of floats, default = 0.01
         Step used in calculating area under the curve (integrating).
+        If several steps are given, the data is sorted only once.
+    bin_edges : array_like, optional
+        Edges of the histogram bins (as returned by np.histogram).
+        If given, quantiles are interpolated from the pre-binned
+        histogram or quantile sketch, so the raw data is not needed.
+    nan_policy : {"propagate", "omit", "raise", "assume_none"}, optional
+        Handling of missing values, the nan_policy setting by default
+        (see obscure_stats.config).
 
     Returns
     -------
-    waucbs : float
-        The value of weighted AUC Bowley skewness.
+    waucbs : float or np.ndarray
+        The value of weighted AUC Bowley skewness (one for every step).
 
     References
     ----------
@@ -360,26 +688,68 @@ def wauc_skew_gamma(x: np.ndarray, dp: float = 0.01) -> float:
     Mean skewness measures.
     arXiv preprint arXiv:1912.06996.
     """
-    n = int(1 / dp)
-    half_n = n // 2
-    w = (np.arange(half_n) / half_n)[::-1]
-    return _auc_skew_gamma(x, dp, w)
+    return _auc_skew_gamma(x, dp, bin_edges, weighted=True)
 
 
-def cumulative_skew(x: np.ndarray) -> float:
+def _cumulative_sums(
+    s: np.ndarray, start: int, n: int
+) -> tuple[np.ndarray | float, ...]:
+    """Calculate sums of the sorted chunk weighted by the rank polynomials.
+
+    Chunk s should be writable float array without missing values,
+    start is the rank of its first element along the last axis.
+    """
+    j = np.arange(start, start + s.shape[-1], dtype=s.dtype)
+    return s.sum(axis=-1, dtype=np.float64), _dot(s, n - j), _dot(s, (j - 1) * (n - j))
+
+
+@_instrument
+@_nan_policy
+@_memoize
+def cumulative_skew(  # noqa: PLR0913
+    x: np.ndarray,
+    axis: int = -1,
+    *,
+    presorted: bool = False,
+    chunk_size: int | None = None,
+    overwrite_input: bool = False,
+    buffer: np.ndarray | None = None,
+) -> float | np.ndarray:
     """
     Calculate cumulative measure of skewness.
 
     It is based on calculating the cumulative statistics of the Lorenz curve.
+    Sums over the Lorenz curve are calculated in the closed form,
+    so only the sorted copy of the data is allocated.
 
     Parameters
     ----------
     x : array_like
         Input array.
+    axis : int, default = -1
+        Axis along which the statistic is calculated.
+    presorted : bool, default = False
+        If True, x is assumed to be already sorted along the axis
+        (with missing values at the end, as np.sort does) and is not copied.
+        Together with chunk_size it allows to process np.memmap arrays
+        that do not fit into memory.
+    chunk_size : int, optional
+        Number of elements along the axis processed at once.
+        By default the whole axis is processed at once.
+    overwrite_input : bool, default = False
+        If True, the input array is sorted or partitioned in place
+        and its contents are undefined after the call.
+    buffer : np.ndarray, optional
+        Writeable 1-d array of at least x.size elements, the values are
+        copied into it and reordered there instead of a new array,
+        so one buffer could be reused by many calls.
+    nan_policy : {"propagate", "omit", "raise", "assume_none"}, optional
+        Handling of missing values, the nan_policy setting by default
+        (see obscure_stats.config).
 
     Returns
     -------
-    csc : float
+    csc : float or np.ndarray
         The value of cumulative skew.
 
     References
@@ -388,11 +758,31 @@ def cumulative_skew(x: np.ndarray) -> float:
     A robust measure of skewness using cumulative statistic calculation.
     arXiv preprint arXiv:2209.10699.
     """
-    n = len(x)
-    p = np.nancumsum(np.sort(x))
-    p = p / p[-1]
-    r = np.arange(n)
-    q = r / n
-    d = q - p
-    w = (2 * r - n) * 3 / n
-    return np.sum(d * w) / np.sum(d)
+    if chunk_size is not None and chunk_size < 1:
+        msg = "Parameter chunk_size should be a positive integer."
+        raise ValueError(msg)
+    if presorted:
+        s = np.moveaxis(np.asarray(x), axis, -1)
+    else:
+        _x, owned = _scratch(x, overwrite_input=overwrite_input, buffer=buffer)
+        _x = np.asarray(_x)
+        work = _x.astype(_work_dtype(_x), copy=False)
+        # converted copies are sorted in place as well
+        sorted_x = _sort(work, axis=axis, overwrite_input=owned or work is not _x)
+        s = np.moveaxis(sorted_x, axis, -1)
+    n = s.shape[-1]
+    step = chunk_size or n
+    total = s1 = s2 = np.zeros(s.shape[:-1])
+    for start in range(0, n, step):
+        chunk = s[..., start : start + step]
+        # the input and cached sorted copies are not modified
+        if presorted or not chunk.flags.writeable:
+            chunk = np.array(chunk, dtype=_work_dtype(chunk))
+        # missing values are not added to the cumulative sums
+        chunk[np.isnan(chunk)] = 0
+        sums = _cumulative_sums(chunk, start, n)
+        total, s1, s2 = total + sums[0], s1 + sums[1], s2 + sums[2]
+    # sums of d = q - p and of (2 * r - n) * d over the Lorenz curve (times total)
+    d = (n - 1) / 2 * total - s1
+    dw = (n - 1) * (n - 2) / 6 * total - s2
+    return 3 / n * dw / d
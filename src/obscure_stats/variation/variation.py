@@ -1,12 +1,19 @@
 """Module for measures of categorical variations."""
 
 import math
-from collections import Counter
 
 import numpy as np
-from scipy import stats  # type: ignore[import-untyped]
 
+from obscure_stats._utils import _counts, _lazy_import, _nan_policy
+from obscure_stats.cache import _memoize
+from obscure_stats.profiling import _instrument
 
+stats = _lazy_import("scipy.stats")
+
+
+@_instrument
+@_nan_policy
+@_memoize
 def mod_vr(x: np.ndarray) -> float:
     """Calculate Mode Variation Ratio.
 
@@ -20,6 +27,9 @@ def mod_vr(x: np.ndarray) -> float:
     ----------
     x : array_like
         Input array.
+    nan_policy : {"propagate", "omit", "raise", "assume_none"}, optional
+        Handling of missing values, the nan_policy setting by default
+        (see obscure_stats.config).
 
     Returns
     -------
@@ -32,10 +42,13 @@ def mod_vr(x: np.ndarray) -> float:
     Indices of Qualitative Variation and Political Measurement.
     The Western Political Quarterly. 26 (2): 325-343.
     """
-    cnts = np.asarray(list(Counter(x).values()))
+    cnts = _counts(x)
     return 1 - np.max(cnts) / len(x)
 
 
+@_instrument
+@_nan_policy
+@_memoize
 def range_vr(x: np.ndarray) -> float:
     """Calculate Range Variation Ratio.
 
@@ -49,6 +62,9 @@ def range_vr(x: np.ndarray) -> float:
     ----------
     x : array_like
         Input array.
+    nan_policy : {"propagate", "omit", "raise", "assume_none"}, optional
+        Handling of missing values, the nan_policy setting by default
+        (see obscure_stats.config).
 
     Returns
     -------
@@ -61,10 +77,13 @@ def range_vr(x: np.ndarray) -> float:
     Indices of Qualitative Variation and Political Measurement.
     The Western Political Quarterly. 26 (2): 325-343.
     """
-    cnts = np.asarray(list(Counter(x).values()))
+    cnts = _counts(x)
     return np.min(cnts) / np.max(cnts)
 
 
+@_instrument
+@_nan_policy
+@_memoize
 def gibbs_m1(x: np.ndarray) -> float:
     """Calculate Gibbs M1 Index.
 
@@ -79,6 +98,9 @@ def gibbs_m1(x: np.ndarray) -> float:
     ----------
     x : array_like
         Input array.
+    nan_policy : {"propagate", "omit", "raise", "assume_none"}, optional
+        Handling of missing values, the nan_policy setting by default
+        (see obscure_stats.config).
 
     Returns
     -------
@@ -103,10 +125,13 @@ def gibbs_m1(x: np.ndarray) -> float:
     Blau's index in sociology, psychology and management studies;
     Special case of Tsallis entropy (alpha = 2).
     """
-    freq = np.asarray(list(Counter(x).values())) / len(x)
+    freq = _counts(x) / len(x)
     return 1 - np.sum(freq**2)
 
 
+@_instrument
+@_nan_policy
+@_memoize
 def gibbs_m2(x: np.ndarray) -> float:
     """Calculate Gibbs M2 Index.
 
@@ -120,6 +145,9 @@ def gibbs_m2(x: np.ndarray) -> float:
     ----------
     x : array_like
         Input array.
+    nan_policy : {"propagate", "omit", "raise", "assume_none"}, optional
+        Handling of missing values, the nan_policy setting by default
+        (see obscure_stats.config).
 
     Returns
     -------
@@ -132,11 +160,14 @@ def gibbs_m2(x: np.ndarray) -> float:
     The Division of Labor: Conceptualization and Related Measures.
     Social Forces, 53 (3): 468-476.
     """
-    freq = np.asarray(list(Counter(x).values())) / len(x)
+    freq = _counts(x) / len(x)
     k = len(freq)
     return (k / (k - 1)) * (1 - np.sum(freq**2))
 
 
+@_instrument
+@_nan_policy
+@_memoize
 def b_index(x: np.ndarray) -> float:
     """Calculate B Index.
 
@@ -149,6 +180,9 @@ def b_index(x: np.ndarray) -> float:
     ----------
     x : array_like
         Input array.
+    nan_policy : {"propagate", "omit", "raise", "assume_none"}, optional
+        Handling of missing values, the nan_policy setting by default
+        (see obscure_stats.config).
 
     Returns
     -------
@@ -162,10 +196,13 @@ def b_index(x: np.ndarray) -> float:
     The Western Political Quarterly. 26 (2): 325-343.
     """
     n = len(x)
-    freq = np.asarray(list(Counter(x).values())) / n
+    freq = _counts(x) / n
     return 1 - (1 - (stats.gmean(freq * len(freq) / n)) ** 2) ** 0.5
 
 
+@_instrument
+@_nan_policy
+@_memoize
 def avdev(x: np.ndarray) -> float:
     """Calculate Average Deviation Analogue.
 
@@ -178,6 +215,9 @@ def avdev(x: np.ndarray) -> float:
     ----------
     x : array_like
         Input array.
+    nan_policy : {"propagate", "omit", "raise", "assume_none"}, optional
+        Handling of missing values, the nan_policy setting by default
+        (see obscure_stats.config).
 
     Returns
     -------
@@ -191,12 +231,15 @@ def avdev(x: np.ndarray) -> float:
     The Western Political Quarterly. 26 (2): 325-343.
     """
     n = len(x)
-    freq = np.asarray(list(Counter(x).values())) / n
+    freq = _counts(x) / n
     k = len(freq)
     mean = n / k
     return 1 - (np.sum(np.abs(freq - mean)) / (2 * mean * max(k - 1, 1)))
 
 
+@_instrument
+@_nan_policy
+@_memoize
 def renyi_entropy(x: np.ndarray, alpha: float = 2) -> float:
     """Calculate Renyi entropy (bits).
 
@@ -212,6 +255,9 @@ def renyi_entropy(x: np.ndarray, alpha: float = 2) -> float:
         Input array.
     alpha : float
         Order of the Rényi entropy
+    nan_policy : {"propagate", "omit", "raise", "assume_none"}, optional
+        Handling of missing values, the nan_policy setting by default
+        (see obscure_stats.config).
 
     Returns
     -------
@@ -228,13 +274,16 @@ def renyi_entropy(x: np.ndarray, alpha: float = 2) -> float:
     if alpha < 0:
         msg = "Parameter alpha should be positive!"
         raise ValueError(msg)
-    freq = np.asarray(list(Counter(x).values())) / len(x)
+    freq = _counts(x) / len(x)
     if alpha == 1:
         # return Shannon entropy to avoid division by 0
         return -np.sum(freq * np.log2(freq))
     return 1 / (1 - alpha) * math.log2(np.sum(freq**alpha))
 
 
+@_instrument
+@_nan_policy
+@_memoize
 def negative_extropy(x: np.ndarray) -> float:
     """Calculate Negative Information Extropy (bits).
 
@@ -249,6 +298,9 @@ def negative_extropy(x: np.ndarray) -> float:
     ----------
     x : array_like
         Input array.
+    nan_policy : {"propagate", "omit", "raise", "assume_none"}, optional
+        Handling of missing values, the nan_policy setting by default
+        (see obscure_stats.config).
 
     Returns
     -------
@@ -261,11 +313,14 @@ def negative_extropy(x: np.ndarray) -> float:
     Extropy: Complementary dual of entropy.
     Statistical Science, 30(1), 40-58.
     """
-    freq = np.asarray(list(Counter(x).values())) / len(x)
+    freq = _counts(x) / len(x)
     p_inv = 1.0 - freq
     return -np.sum(p_inv * np.log2(p_inv))
 
 
+@_instrument
+@_nan_policy
+@_memoize
 def mcintosh_d(x: np.ndarray) -> float:
     """Calculate McIntosh's D.
 
@@ -276,6 +331,9 @@ def mcintosh_d(x: np.ndarray) -> float:
     ----------
     x : array_like
         Input array.
+    nan_policy : {"propagate", "omit", "raise", "assume_none"}, optional
+        Handling of missing values, the nan_policy setting by default
+        (see obscure_stats.config).
 
     Returns
     -------
@@ -289,5 +347,5 @@ def mcintosh_d(x: np.ndarray) -> float:
     Ecology, 48(3), 392-404.
     """
     n = len(x)
-    counts = np.asarray(list(Counter(x).values()))
+    counts = _counts(x)
     return (n - np.sum(counts**2) ** 0.5) / (n - n**0.5)
@@ -0,0 +1,210 @@
+"""Collection of tests of asyncio module."""
+
+import asyncio
+import typing
+
+import numpy as np
+import pytest
+from obscure_stats import aio
+from obscure_stats.association import chatterjeexi
+from obscure_stats.cache import cache_info, clear_cache
+from obscure_stats.central_tendency import (
+    hodges_lehmann_sen_location,
+    standard_trimmed_harrell_davis_quantile,
+)
+from obscure_stats.config import config_context
+from obscure_stats.profiling import profile
+
+
+def test_awaitable_variants(
+    x_array_float: np.ndarray, y_array_float: np.ndarray
+) -> None:
+    """Test that awaitable variants give the same results as direct calls."""
+
+    async def main() -> list:
+        results = await asyncio.gather(
+            aio.hodges_lehmann_sen_location(x_array_float),
+            aio.chatterjeexi(x_array_float, y_array_float),
+            aio.compute("standard_trimmed_harrell_davis_quantile", x_array_float),
+        )
+        return list(results)
+
+    result = asyncio.run(main())
+    expected = [
+        hodges_lehmann_sen_location(x_array_float),
+        chatterjeexi(x_array_float, y_array_float),
+        standard_trimmed_harrell_davis_quantile(x_array_float),
+    ]
+    if not np.allclose(result, np.asarray(expected)):
+        msg = "Awaitable variants give different results."
+        raise ValueError(msg)
+    if aio.midhinge.__name__ != "midhinge":
+        msg = "Awaitable variant should keep the name of the measure."
+        raise ValueError(msg)
+
+
+def test_micro_batching(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that concurrent calls are coalesced and vectorised."""
+    rng = np.random.default_rng(0)
+    samples = [rng.normal(size=100) for _ in range(10)]
+    q = np.array([0.25, 0.75])
+    batches: list[int] = []
+    run_batch = aio._run_batch  # noqa: SLF001
+
+    def spy(name: str, calls: typing.Sequence) -> list:
+        batches.append(len(calls))
+        return run_batch(name, calls)
+
+    monkeypatch.setattr(aio, "_run_batch", spy)
+
+    async def main() -> list:
+        with aio.BatchExecutor(max_batch=4, max_delay=0.05) as executor:
+            return await asyncio.gather(
+                *(
+                    executor.compute(standard_trimmed_harrell_davis_quantile, x, q=q)
+                    for x in samples
+                )
+            )
+
+    result = asyncio.run(main())
+    if batches != [4, 4, 2]:
+        msg = f"Calls should be coalesced into batches, got {batches}."
+        raise ValueError(msg)
+    expected = [standard_trimmed_harrell_davis_quantile(x, q=q) for x in samples]
+    if not np.allclose(result, np.asarray(expected)):
+        msg = "Vectorised batch gives different results."
+        raise ValueError(msg)
+
+
+def test_batch_settings(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that only calls with equal settings are vectorised together."""
+    rng = np.random.default_rng(0)
+    samples = [rng.normal(size=50) for _ in range(6)]
+    groups: list[int] = []
+    batched = aio._BATCHED["standard_trimmed_harrell_davis_quantile"]  # noqa: SLF001
+
+    def spy(calls: typing.Sequence) -> list | None:
+        groups.append(len(calls))
+        return batched(calls)
+
+    monkeypatch.setitem(
+        aio._BATCHED,  # noqa: SLF001
+        "standard_trimmed_harrell_davis_quantile",
+        spy,
+    )
+
+    async def call(x: np.ndarray, policy: str, executor: aio.BatchExecutor) -> float:
+        with config_context(dtype_policy=policy):
+            return await executor.compute(standard_trimmed_harrell_davis_quantile, x)
+
+    async def main() -> list:
+        with aio.BatchExecutor(max_delay=0.05) as executor:
+            return await asyncio.gather(
+                *(
+                    call(x, ("float64", "preserve")[i % 2], executor)
+                    for i, x in enumerate(samples)
+                )
+            )
+
+    result = asyncio.run(main())
+    if sorted(groups) != [3, 3]:
+        msg = f"Calls with different settings should not be mixed, got {groups}."
+        raise ValueError(msg)
+    expected = [standard_trimmed_harrell_davis_quantile(x) for x in samples]
+    if not np.allclose(result, np.asarray(expected)):
+        msg = "Vectorised batches give different results."
+        raise ValueError(msg)
+
+
+def test_batch_wrappers() -> None:
+    """Test that vectorised results are memoised and profiled as direct calls."""
+    rng = np.random.default_rng(0)
+    samples = [rng.normal(size=50) for _ in range(4)]
+
+    async def main() -> list:
+        with aio.BatchExecutor(max_delay=0.05) as executor:
+            return await asyncio.gather(
+                *(
+                    executor.compute(standard_trimmed_harrell_davis_quantile, x)
+                    for x in samples
+                )
+            )
+
+    clear_cache()
+    with profile() as profiler, config_context(cache_entries=16):
+        result = asyncio.run(main())
+        direct = [standard_trimmed_harrell_davis_quantile(x) for x in samples]
+        hits = cache_info()["hits"]
+    clear_cache()
+    if hits != len(samples) or not np.allclose(result, np.asarray(direct)):
+        msg = "Direct calls should reuse the memoised results of the batch."
+        raise ValueError(msg)
+    calls = profiler.stats()["standard_trimmed_harrell_davis_quantile"]["calls"]
+    if calls != 2 * len(samples):
+        msg = f"Every vectorised call should be profiled, got {calls} calls."
+        raise ValueError(msg)
+
+
+def test_weighted_batch() -> None:
+    """Test that weighted calls are not vectorised without their weights."""
+    rng = np.random.default_rng(0)
+    x = rng.normal(size=100)
+    weights = [rng.integers(0, 5, size=100) for _ in range(3)]
+
+    async def main() -> list:
+        with aio.BatchExecutor(max_delay=0.05) as executor:
+            return await asyncio.gather(
+                *(
+                    executor.compute(
+                        standard_trimmed_harrell_davis_quantile, x, weights=w
+                    )
+                    for w in weights
+                )
+            )
+
+    expected = [
+        standard_trimmed_harrell_davis_quantile(np.repeat(x, w)) for w in weights
+    ]
+    if not np.allclose(asyncio.run(main()), np.asarray(expected)):
+        msg = "Weights of the batched calls should be used."
+        raise ValueError(msg)
+
+
+def test_cancellation_and_timeout(x_array_float: np.ndarray) -> None:
+    """Test that cancelled calls are dropped and timeouts are raised."""
+
+    async def main() -> float:
+        with aio.BatchExecutor(max_delay=0.05) as executor:
+            cancelled = asyncio.ensure_future(executor.compute("midhinge", [1, 2]))
+            kept = asyncio.ensure_future(executor.compute("midhinge", x_array_float))
+            await asyncio.sleep(0)
+            cancelled.cancel()
+            with pytest.raises(asyncio.TimeoutError):
+                await executor.compute("midhinge", x_array_float, timeout=0.001)
+            return await kept
+
+    if not np.isclose(asyncio.run(main()), aio.FUNCTIONS["midhinge"](x_array_float)):
+        msg = "Other calls of the batch should not be affected by cancellation."
+        raise ValueError(msg)
+
+
+def test_settings_and_errors(x_array_float: np.ndarray) -> None:
+    """Test that settings of the caller are used and errors are raised."""
+
+    async def main() -> None:
+        with config_context(cache_entries=16):
+            await aio.shamos_estimator(x_array_float)
+        with pytest.raises(ValueError, match="Parameter q"):
+            await aio.standard_trimmed_harrell_davis_quantile(x_array_float, q=2.0)
+        with pytest.raises(ValueError, match="Unknown measure"):
+            await aio.compute("foo", x_array_float)
+
+    clear_cache()
+    asyncio.run(main())
+    entries = cache_info()["entries"]
+    clear_cache()
+    if not entries:
+        msg = "Settings of the caller should be used by the workers."
+        raise ValueError(msg)
+    with pytest.raises(AttributeError):
+        _ = aio.foo
@@ -0,0 +1,189 @@
+"""Collection of tests of memoisation."""
+
+import pathlib
+import typing
+import warnings
+
+import numpy as np
+import obscure_stats
+import pytest
+from obscure_stats._utils import _sort
+from obscure_stats.association import chatterjeexi
+from obscure_stats.cache import cache_info, clear_cache
+from obscure_stats.config import config_context, set_config
+from obscure_stats.dispersion import shamos_estimator
+from obscure_stats.kurtosis import l_kurt
+from obscure_stats.rolling import rolling_l_skew
+from obscure_stats.skewness import cumulative_skew, l_skew, pearson_mode_skew
+
+
+@pytest.fixture(autouse=True)
+def _empty_cache() -> typing.Iterator[None]:
+    """Start every test with the empty cache."""
+    clear_cache()
+    yield
+    clear_cache()
+
+
+@pytest.mark.parametrize(
+    ("func", "args"),
+    [
+        (l_skew, ()),
+        (shamos_estimator, ()),
+        (chatterjeexi, ("y",)),
+        (pearson_mode_skew, ()),
+    ],
+)
+def test_cached_values(
+    func: typing.Callable,
+    args: tuple,
+    x_array_float: np.ndarray,
+    y_array_float: np.ndarray,
+) -> None:
+    """Test that cached values are equal to computed ones."""
+    params = [y_array_float for _ in args]
+    expected = func(x_array_float, *params)
+    with config_context(cache_entries=16):
+        first = func(x_array_float, *params)
+        second = func(x_array_float.copy(), *params)
+        info = cache_info()
+    if not (np.isclose(first, expected) and np.isclose(second, expected)):
+        msg = f"Cached value of {func.__name__} differs from computed one."
+        raise ValueError(msg)
+    if not info["hits"]:
+        msg = f"Value of {func.__name__} is not taken from the cache."
+        raise ValueError(msg)
+
+
+def test_cache_keys(x_array_float: np.ndarray) -> None:
+    """Test that modified inputs and other parameters are not mixed up."""
+    x = x_array_float.copy()
+    with config_context(cache_entries=16):
+        first = pearson_mode_skew(x)
+        other = pearson_mode_skew(x, method="hist", bins=4)
+        x[0] += 100
+        modified = pearson_mode_skew(x)
+        positional = pearson_mode_skew(x, "exact")
+    if first in (modified, other):
+        msg = "Cache key should depend on the data and the parameters."
+        raise ValueError(msg)
+    if positional != modified:
+        msg = "Cache key should not depend on how the arguments are passed."
+        raise ValueError(msg)
+
+
+def test_cache_settings_keys(
+    x_array_float: np.ndarray, tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test that settings choosing the algorithms and the version are in the key."""
+    with config_context(cache_entries=16, cache_dir=tmp_path):
+        l_skew(x_array_float)
+        with config_context(memory_budget=2**20):
+            l_skew(x_array_float)
+        with config_context(cost_model={"gmd_dense": 1e3}):
+            l_skew(x_array_float)
+        clear_cache()
+        monkeypatch.setattr(obscure_stats, "__version__", "0.0.0")
+        l_skew(x_array_float)
+    if cache_info()["hits"] != 0:
+        msg = "Cache key should depend on the settings and the library version."
+        raise ValueError(msg)
+
+
+def test_version() -> None:
+    """Test that the version is the same as in the package metadata."""
+    pyproject = pathlib.Path(__file__).parents[1] / "pyproject.toml"
+    if f'version = "{obscure_stats.__version__}"' not in pyproject.read_text():
+        msg = "Version should be the same as in pyproject.toml."
+        raise ValueError(msg)
+
+
+def test_cache_disabled(x_array_float: np.ndarray) -> None:
+    """Test that nothing is cached by default."""
+    l_skew(x_array_float)
+    if cache_info()["entries"]:
+        msg = "Cache should be disabled by default."
+        raise ValueError(msg)
+
+
+def test_cache_eviction() -> None:
+    """Test that the cache is bounded by entries and bytes."""
+    rng = np.random.default_rng(0)
+    with config_context(cache_entries=3):
+        for _ in range(10):
+            l_skew(rng.normal(size=100))
+        if cache_info()["entries"] > 3:  # noqa: PLR2004
+            msg = "Number of entries should be bounded."
+            raise ValueError(msg)
+    with config_context(cache_entries=100, cache_bytes=10_000):
+        for _ in range(10):
+            l_skew(rng.normal(size=1000))
+        if cache_info()["bytes"] > 10_000:  # noqa: PLR2004
+            msg = "Bytes of the cache should be bounded."
+            raise ValueError(msg)
+
+
+def test_shared_intermediates(x_array_float: np.ndarray) -> None:
+    """Test that sorted copies are shared and protected from modification."""
+    with config_context(cache_entries=16):
+        l_skew(x_array_float)
+        l_kurt(x_array_float)
+        # both the sorted copy and the values
+        if cache_info()["entries"] != 3:  # noqa: PLR2004
+            msg = "Sorted copy should be shared between the measures."
+            raise ValueError(msg)
+        xs = _sort(x_array_float)
+        if xs.flags.writeable:
+            msg = "Cached intermediates should be read-only."
+            raise ValueError(msg)
+        result = cumulative_skew(x_array_float)
+    if not np.isclose(result, cumulative_skew(x_array_float)):
+        msg = "Cached sorted copy should not be modified."
+        raise ValueError(msg)
+
+
+def test_cached_arrays_are_copied(x_array_float: np.ndarray) -> None:
+    """Test that array results could be modified by the caller."""
+    with config_context(cache_entries=16):
+        first = rolling_l_skew(x_array_float, window=3)
+        expected = first.copy()
+        first[:] = 0
+        second = rolling_l_skew(x_array_float, window=3)
+    if not np.array_equal(second, expected, equal_nan=True):
+        msg = "Cached results should not be shared with the caller."
+        raise ValueError(msg)
+
+
+def test_cached_warnings(x_array_float: np.ndarray) -> None:
+    """Test that warnings are emitted on cache hits."""
+    with config_context(cache_entries=16):
+        for _ in range(2):
+            with pytest.warns(UserWarning, match="constant"):
+                chatterjeexi(x_array_float, np.ones_like(x_array_float))
+
+
+def test_disk_cache(x_array_float: np.ndarray, tmp_path: pathlib.Path) -> None:
+    """Test the on-disk tier of the cache."""
+    with config_context(cache_entries=16, cache_dir=tmp_path):
+        expected = l_skew(x_array_float)
+        clear_cache()
+        with warnings.catch_warnings():
+            warnings.simplefilter("error")
+            result = l_skew(x_array_float)
+        if result != expected or cache_info()["misses"] != 1:
+            msg = "Value should be read from the disk."
+            raise ValueError(msg)
+        clear_cache(disk=True)
+    if list(tmp_path.glob("*.npy")):
+        msg = "Files of the on-disk tier should be deleted."
+        raise ValueError(msg)
+
+
+def test_cache_settings() -> None:
+    """Test validation of the cache settings."""
+    with pytest.raises(ValueError, match="cache_entries"):
+        set_config(cache_entries=-1)
+    with pytest.raises(ValueError, match="cache_bytes"):
+        set_config(cache_bytes=0)
+    with pytest.raises(ValueError, match="cache_dir"):
+        set_config(cache_dir=1)
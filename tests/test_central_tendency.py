@@ -16,6 +16,7 @@ from obscure_stats.central_tendency import (
     standard_trimmed_harrell_davis_quantile,
     trimean,
 )
+from obscure_stats.central_tendency.central_tendency import _thd_weights
 
 all_functions = [
     contraharmonic_mean,
@@ -121,3 +122,69 @@ def test_statistic_with_nans(
     if np.isnan(func(x_array_nan)):
         msg = "Statistic should not return nans."
         raise ValueError(msg)
+
+
+@pytest.mark.parametrize(
+    ("q", "expected"),
+    [
+        (0.01, -0.5576858780317815),
+        (0.1, -0.40237994609895317),
+        (0.25, 0.005844448971993071),
+        (0.5, 0.6268069427582937),
+        (0.75, 2178.7363395207726),
+        (0.9, 64740.40857603444),
+        (0.99, 98406.54153175661),
+    ],
+)
+def test_sthdq_reference(
+    thdme_test_data: np.ndarray, q: float, expected: float
+) -> None:
+    """Test quantiles against the direct beta CDF formula from the paper."""
+    scalar = standard_trimmed_harrell_davis_quantile(thdme_test_data, q=q)
+    vector = np.asarray(
+        standard_trimmed_harrell_davis_quantile(thdme_test_data, q=np.r_[q, 0.5])
+    )
+    if scalar != pytest.approx(expected) or vector[0] != pytest.approx(expected):
+        msg = "Results from the test and the reference formula do not match."
+        raise ValueError(msg)
+
+
+@pytest.mark.parametrize("size", [101, 200_001])
+@pytest.mark.parametrize("levels", [2, 5, 100])
+def test_midmean_ties(size: int, levels: int) -> None:
+    """Test tied and missing values against the masked mean of the definition."""
+    rng = np.random.default_rng(size + levels)
+    x = rng.integers(0, levels, size=size).astype(np.float64)
+    x[rng.random(size) < 0.05] = np.nan  # noqa: PLR2004
+    q1, q3 = np.nanquantile(x, [0.25, 0.75])
+    expected = np.nanmean(np.where((x >= q1) & (x <= q3), x, np.nan))
+    if midmean(x) != pytest.approx(expected, rel=1e-9):
+        msg = "Results with ties and missing values do not match the definition."
+        raise ValueError(msg)
+    if midmean(x[~np.isnan(x)].astype(np.int64)) != pytest.approx(expected, rel=1e-9):
+        msg = "Results for integers do not match the definition."
+        raise ValueError(msg)
+
+
+def test_thd_weights_read_only() -> None:
+    """Test that cached weights could not be changed by the callers."""
+    weights = _thd_weights(50, (0.25, 0.5))
+    expected = weights.toarray()
+    with pytest.raises(ValueError, match="read-only"):
+        weights.data *= 2
+    weights.data = np.zeros_like(weights.data)
+    if not np.array_equal(_thd_weights(50, (0.25, 0.5)).toarray(), expected):
+        msg = "Cached weights should not be shared between the callers."
+        raise ValueError(msg)
+
+
+def test_vector_q_in_sthdq(thdme_test_data: np.ndarray) -> None:
+    """Simple test case for vectorised quantiles."""
+    qs = np.linspace(0.01, 0.99, 99)
+    result = standard_trimmed_harrell_davis_quantile(thdme_test_data, q=qs)
+    expected = [standard_trimmed_harrell_davis_quantile(thdme_test_data, q) for q in qs]
+    if result != pytest.approx(expected):
+        msg = "Vectorised quantiles do not match the scalar ones."
+        raise ValueError(msg)
+    with pytest.raises(ValueError, match="Parameter q should be in range"):
+        standard_trimmed_harrell_davis_quantile(thdme_test_data, q=np.r_[0.5, 1.0])
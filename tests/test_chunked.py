@@ -0,0 +1,93 @@
+"""Collection of tests of blockwise processing of memory-mapped inputs."""
+
+import pathlib
+import typing
+
+import numpy as np
+import pytest
+from obscure_stats.central_tendency import (
+    contraharmonic_mean,
+    midhinge,
+    midrange,
+    trimean,
+)
+from obscure_stats.config import config_context, get_config, set_config
+from obscure_stats.dispersion import (
+    coefficient_of_range,
+    coefficient_of_variation,
+    cole_index_of_dispersion,
+    fisher_index_of_dispersion,
+    morisita_index_of_dispersion,
+    quartile_coefficient_of_dispersion,
+    studentized_range,
+)
+from obscure_stats.kurtosis import crow_siddiqui_kurt, moors_octile_kurt
+from obscure_stats.skewness import bowley_skew, kelly_skew
+
+moment_functions = [
+    coefficient_of_range,
+    coefficient_of_variation,
+    cole_index_of_dispersion,
+    contraharmonic_mean,
+    fisher_index_of_dispersion,
+    midrange,
+    morisita_index_of_dispersion,
+    studentized_range,
+]
+quantile_functions = [
+    bowley_skew,
+    crow_siddiqui_kurt,
+    kelly_skew,
+    midhinge,
+    moors_octile_kurt,
+    quartile_coefficient_of_dispersion,
+    trimean,
+]
+
+
+@pytest.fixture
+def x_memmap(tmp_path: pathlib.Path) -> np.ndarray:
+    """Memory-mapped array with missing values."""
+    rng = np.random.default_rng(42)
+    x = np.round(rng.exponential(size=(50, 400)), 2).astype(np.float32)
+    x[::7, 3] = np.nan
+    np.save(tmp_path / "x.npy", x)
+    return np.load(tmp_path / "x.npy", mmap_mode="r")
+
+
+@pytest.mark.parametrize("func", moment_functions)
+def test_streamed_moments(func: typing.Callable, x_memmap: np.ndarray) -> None:
+    """Test that blockwise statistics match the in-memory ones."""
+    expected = func(np.asarray(x_memmap))
+    with config_context(memory_budget=2**14):
+        result = func(x_memmap)
+    if result != pytest.approx(expected, rel=1e-6):
+        msg = f"Results do not match, got {result} != {expected}."
+        raise ValueError(msg)
+
+
+@pytest.mark.parametrize("func", quantile_functions)
+def test_streamed_quantiles(func: typing.Callable, x_memmap: np.ndarray) -> None:
+    """Test that blockwise quantiles are exact."""
+    expected = func(np.asarray(x_memmap))
+    with config_context(memory_budget=2**14):
+        result = func(x_memmap)
+    if result != expected:
+        msg = f"Results do not match, got {result} != {expected}."
+        raise ValueError(msg)
+
+
+def test_config() -> None:
+    """Test for changing the settings."""
+    default = get_config()["memory_budget"]
+    with config_context(memory_budget=100):
+        if get_config()["memory_budget"] != 100:  # noqa: PLR2004
+            msg = "Setting was not changed."
+            raise ValueError(msg)
+    if get_config()["memory_budget"] != default:
+        msg = "Setting was not restored."
+        raise ValueError(msg)
+    with pytest.raises(ValueError, match="Unknown setting"):
+        set_config(budget=100)
+    with pytest.raises(ValueError, match="Setting memory_budget should be"):
+        set_config(memory_budget=0)
@@ -0,0 +1,135 @@
+"""Collection of tests of command line interface."""
+
+import json
+import pathlib
+
+import numpy as np
+import pytest
+from obscure_stats.central_tendency import midhinge
+from obscure_stats._registry import ESTIMATORS
+from obscure_stats.cli import DEFAULT_STATISTICS, describe_file, main
+from obscure_stats.dispersion import coefficient_of_variation
+
+
+@pytest.fixture
+def data_files(tmp_path: pathlib.Path) -> dict[str, pathlib.Path]:
+    """Save the same data in different formats."""
+    rng = np.random.default_rng(42)
+    x = np.round(rng.exponential(size=(100, 2)), 2)
+    x[5, 1] = np.nan
+    files = {
+        "csv": tmp_path / "x.csv",
+        "npy": tmp_path / "x.npy",
+        "raw": tmp_path / "x.bin",
+    }
+    lines = [",".join("" if np.isnan(v) else str(v) for v in row) for row in x]
+    files["csv"].write_text("a,b\n" + "\n".join(lines) + "\n")
+    np.save(files["npy"], x)
+    x.tofile(files["raw"])
+    return files
+
+
+def test_describe_formats(data_files: dict[str, pathlib.Path]) -> None:
+    """Test that all formats give the same results."""
+    x = np.load(data_files["npy"])
+    stats = ["midhinge", "coefficient_of_variation"]
+    reports = [
+        describe_file(data_files["csv"], stats, chunk_size=7),
+        describe_file(data_files["npy"], stats, chunk_size=7),
+        describe_file(data_files["raw"], stats, n_columns=2, memory_budget=1024),
+    ]
+    for report in reports:
+        values = [column["statistics"] for column in report["columns"].values()]
+        for i, column in enumerate(values):
+            expected = [midhinge(x[:, i]), coefficient_of_variation(x[:, i])]
+            result = [column["midhinge"], column["coefficient_of_variation"]]
+            if result != pytest.approx(expected):
+                msg = f"Results do not match, got {result} != {expected}."
+                raise ValueError(msg)
+
+
+def test_main(
+    data_files: dict[str, pathlib.Path],
+    tmp_path: pathlib.Path,
+    capsys: pytest.CaptureFixture,
+) -> None:
+    """Test for command line arguments and JSON output."""
+    output = tmp_path / "report.json"
+    files = [str(data_files["csv"]), str(data_files["npy"])]
+    code = main(["describe", *files, "-j", "2", "-o", str(output)])
+    reports = json.loads(output.read_text())
+    if code != 0 or len(reports) != len(files):
+        msg = "Every file should be described."
+        raise ValueError(msg)
+    column = reports[1]["columns"]["0"]
+    if set(column["statistics"]) != set(DEFAULT_STATISTICS) or set(
+        column["timings"]
+    ) != set(DEFAULT_STATISTICS):
+        msg = "Every statistic should be reported with timings."
+        raise ValueError(msg)
+    main(["list"])
+    if len(capsys.readouterr().out.splitlines()) != len(ESTIMATORS):
+        msg = "Every statistic should be listed."
+        raise ValueError(msg)
+    if main(["describe", str(data_files["csv"]), "-c", "z"]) != 1:
+        msg = "Missing column should be reported."
+        raise ValueError(msg)
+    with pytest.raises(SystemExit):
+        main(["describe", str(data_files["csv"]), "-s", "foo"])
+
+
+def test_describe_warnings(tmp_path: pathlib.Path) -> None:
+    """Test that warnings and undefined values are reported."""
+    path = tmp_path / "zeros.csv"
+    path.write_text("0\n0\n0\n")
+    report = describe_file(path, ["coefficient_of_variation", "midhinge"])
+    column = report["columns"]["0"]
+    if column["statistics"]["coefficient_of_variation"] is not None:
+        msg = "Infinite values should be reported as null."
+        raise ValueError(msg)
+    if "coefficient_of_variation" not in column["warnings"]:
+        msg = "Warnings should be reported."
+        raise ValueError(msg)
+
+
+def test_describe_quoted_header(tmp_path: pathlib.Path) -> None:
+    """Test that quoted column names are found."""
+    path = tmp_path / "quoted.csv"
+    path.write_text('"a";" b c ";"d;e"\n1;2;3\n4;5;6\n')
+    report = describe_file(path, ["midrange"], delimiter=";", columns=["b c", "d;e"])
+    result = {
+        name: column["statistics"]["midrange"]
+        for name, column in report["columns"].items()
+    }
+    if result != {"b c": 3.5, "d;e": 4.5}:
+        msg = f"Quoted columns are read incorrectly, got {result}."
+        raise ValueError(msg)
+
+
+def test_describe_nan_policy(data_files: dict[str, pathlib.Path]) -> None:
+    """Test that columns with missing values are handled by the policy."""
+    stats = ["midhinge", "coefficient_of_variation"]
+    report = describe_file(data_files["npy"], stats, nan_policy="raise")
+    clean, missing = report["columns"]["0"], report["columns"]["1"]
+    if "errors" in clean or set(missing["errors"]) != set(stats):
+        msg = "Only the column with missing values should raise."
+        raise ValueError(msg)
+    report = describe_file(data_files["npy"], stats, nan_policy="propagate")
+    if any(v is None for v in report["columns"]["0"]["statistics"].values()) or any(
+        v is not None for v in report["columns"]["1"]["statistics"].values()
+    ):
+        msg = "Only the column with missing values should be missing."
+        raise ValueError(msg)
+
+
+def test_calibrate(tmp_path: pathlib.Path, capsys: pytest.CaptureFixture) -> None:
+    """Test that coefficients of the cost model are written."""
+    output = tmp_path / "costs.json"
+    code = main(["calibrate", "--sizes", "64,128", "--repeat", "1", "-o", str(output)])
+    report = json.loads(capsys.readouterr().out)
+    if code != 0 or json.loads(output.read_text()) != report["costs"]:
+        msg = "Coefficients should be written to the output."
+        raise ValueError(msg)
+    if set(report["crossovers"]) != {"gmd", "pairwise_median", "counts", "quantiles"}:
+        msg = "Crossovers of every task should be reported."
+        raise ValueError(msg)
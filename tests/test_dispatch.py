@@ -0,0 +1,175 @@
+"""Collection of tests of dispatch module."""
+
+import json
+import os
+import pathlib
+import subprocess
+import sys
+import typing
+
+import numpy as np
+import obscure_stats
+import pytest
+from obscure_stats._utils import _counts, _nanquantile
+from obscure_stats.central_tendency import hodges_lehmann_sen_location
+from obscure_stats.config import config_context, set_config
+from obscure_stats.dispatch import TASKS, _choose, calibrate, crossovers
+from obscure_stats.dispersion import gini_mean_difference, shamos_estimator
+from obscure_stats.skewness import pearson_mode_skew
+
+
+def _forced(algorithm: str) -> dict[str, float]:
+    """Make the algorithm the cheapest one of its task."""
+    task = next(task for task, names in TASKS.items() if algorithm in names)
+    return {name: 1e-12 if name == algorithm else 1.0 for name in TASKS[task]}
+
+
+@pytest.mark.parametrize(
+    ("func", "dense", "fast"),
+    [
+        (gini_mean_difference, "gmd_dense", "gmd_sorted"),
+        (shamos_estimator, "pairwise_median_dense", "pairwise_median_select"),
+        (
+            hodges_lehmann_sen_location,
+            "pairwise_median_dense",
+            "pairwise_median_select",
+        ),
+    ],
+)
+def test_pairwise_algorithms(
+    func: typing.Callable,
+    dense: str,
+    fast: str,
+    x_array_nan: np.ndarray,
+    x_array_int: np.ndarray,
+) -> None:
+    """Test that cheap algorithms are equal to the cartesian product."""
+    rng = np.random.default_rng(0)
+    samples = [
+        x_array_nan,
+        x_array_int,
+        x_array_nan[1:].astype(np.float32),
+        rng.normal(size=501),
+        rng.integers(0, 5, size=400),
+    ]
+    for x in samples:
+        with config_context(cost_model=_forced(dense)):
+            expected = func(x)
+        with config_context(cost_model=_forced(fast)):
+            result = func(x)
+        if not np.isclose(result, expected, rtol=1e-6):
+            msg = f"Results of {fast} and {dense} differ, {result} != {expected}."
+            raise ValueError(msg)
+
+
+def test_pairwise_selection() -> None:
+    """Test selection that narrows the candidates before gathering them."""
+    x = np.random.default_rng(1).standard_t(2, size=3000)
+    with config_context(cost_model=_forced("pairwise_median_dense")):
+        expected = shamos_estimator(x), hodges_lehmann_sen_location(x)
+    with config_context(memory_budget=2**20):
+        result = shamos_estimator(x), hodges_lehmann_sen_location(x)
+    if not np.allclose(result, expected):
+        msg = "Selection of the pairwise median is wrong."
+        raise ValueError(msg)
+
+
+@pytest.mark.parametrize(
+    "algorithm", ["counts_bincount", "counts_unique", "counts_counter"]
+)
+def test_counting_algorithms(algorithm: str, x_array_int: np.ndarray) -> None:
+    """Test that all counting algorithms agree."""
+    samples: list[typing.Any] = [
+        x_array_int,
+        x_array_int.astype(np.int8) - 50,
+        np.array(["a", "b", "a", "c"]),
+        np.array([1.0, np.nan, np.nan, 1.0]),
+        [1, 2, 2],
+    ]
+    for x in samples:
+        expected = np.sort(_counts(x))
+        with config_context(cost_model=_forced(algorithm)):
+            result = np.sort(_counts(x))
+        if not np.array_equal(result, expected):
+            msg = f"Counts of {algorithm} are wrong."
+            raise ValueError(msg)
+    with config_context(cost_model=_forced(algorithm)):
+        mode = pearson_mode_skew(x_array_int)
+    if not np.isclose(mode, pearson_mode_skew(x_array_int)):
+        msg = f"Mode found by {algorithm} is wrong."
+        raise ValueError(msg)
+
+
+@pytest.mark.parametrize("algorithm", ["quantile_partition", "quantile_sort"])
+def test_quantile_algorithms(algorithm: str, x_array_nan: np.ndarray) -> None:
+    """Test that sorting and partitioning give the same quantiles."""
+    q = np.linspace(0, 1, 11)
+    with config_context(cost_model=_forced(algorithm)):
+        result = _nanquantile(x_array_nan, q)
+    if not np.allclose(result, np.nanquantile(x_array_nan, q)):
+        msg = f"Quantiles found by {algorithm} are wrong."
+        raise ValueError(msg)
+
+
+def test_memory_budget() -> None:
+    """Test that algorithms that do not fit into the budget are skipped."""
+    if _choose("pairwise_median", 10**5) != "pairwise_median_select":
+        msg = "Cartesian product of large input should not be chosen."
+        raise ValueError(msg)
+    with config_context(memory_budget=1):
+        if _choose("counts", 1000, span=10**6) == "counts_bincount":
+            msg = "Counting over large value range should not be chosen."
+            raise ValueError(msg)
+
+
+def test_crossovers() -> None:
+    """Test that crossovers follow the coefficients."""
+    costs = {"gmd_dense": 1e-9, "gmd_sorted": 1e-8}
+    segments = crossovers(costs)["gmd"]
+    size, algorithm = segments[1]
+    if segments[0][1] != "gmd_dense" or algorithm != "gmd_sorted":
+        msg = "Cartesian product should be chosen for small inputs only."
+        raise ValueError(msg)
+    with config_context(cost_model=costs):
+        if _choose("gmd", size - 1) != "gmd_dense" or _choose("gmd", size) != algorithm:
+            msg = "Crossover is not the smallest size of the algorithm."
+            raise ValueError(msg)
+
+
+def test_calibrate() -> None:
+    """Test that every coefficient is fitted."""
+    costs = calibrate(sizes=(64, 128), repeat=1)
+    if set(costs) != {name for names in TASKS.values() for name in names}:
+        msg = "Every algorithm should be calibrated."
+        raise ValueError(msg)
+    if not all(value > 0 for value in costs.values()):
+        msg = "Coefficients should be positive."
+        raise ValueError(msg)
+
+
+def test_cost_model_settings() -> None:
+    """Test validation of the cost model."""
+    with pytest.raises(ValueError, match="Unknown algorithm"):
+        set_config(cost_model={"foo": 1.0})
+    with pytest.raises(ValueError, match="positive number"):
+        set_config(cost_model={"gmd_sorted": -1.0})
+    with pytest.raises(ValueError, match="should be a dict"):
+        set_config(cost_model=1.0)
+
+
+def test_cost_model_environment(tmp_path: pathlib.Path) -> None:
+    """Test that the cost model is read from the environment variable."""
+    path = tmp_path / "costs.json"
+    path.write_text(json.dumps({"gmd_dense": 1e-20}))
+    code = "from obscure_stats.dispatch import _choose; print(_choose('gmd', 10))"
+    env = {
+        **os.environ,
+        "PYTHONPATH": str(pathlib.Path(obscure_stats.__file__).parents[1]),
+        "OBSCURE_STATS_COST_MODEL": str(path),
+    }
+    result = subprocess.run(  # noqa: S603
+        [sys.executable, "-c", code], env=env, check=True, capture_output=True
+    )
+    if result.stdout.decode().strip() != "gmd_dense":
+        msg = "Cost model should be read from OBSCURE_STATS_COST_MODEL."
+        raise ValueError(msg)
@@ -0,0 +1,99 @@
+"""Collection of tests of distributed module."""
+
+import pathlib
+import typing
+
+import numpy as np
+import pytest
+from obscure_stats.central_tendency import midhinge, trimean
+from obscure_stats.dispersion import quartile_coefficient_of_dispersion
+from obscure_stats.distributed import (
+    distributed_bowley_skew,
+    distributed_midhinge,
+    distributed_quantiles,
+    distributed_quartile_coefficient_of_dispersion,
+    distributed_trimean,
+)
+from obscure_stats.skewness import bowley_skew
+
+quantiles = [0.0, 0.1, 0.25, 0.5, 0.75, 0.9, 0.999, 1.0]
+
+
+@pytest.mark.parametrize(
+    ("func", "reference"),
+    [
+        (distributed_bowley_skew, bowley_skew),
+        (distributed_midhinge, midhinge),
+        (
+            distributed_quartile_coefficient_of_dispersion,
+            quartile_coefficient_of_dispersion,
+        ),
+        (distributed_trimean, trimean),
+    ],
+)
+def test_distributed_functions(
+    func: typing.Callable,
+    reference: typing.Callable,
+    x_list_float: list[float],
+    x_array_int: np.ndarray,
+    x_array_nan: np.ndarray,
+) -> None:
+    """Test that the results are the same as for the concatenated data."""
+    shards = [np.asarray(x_list_float), x_array_int, x_array_nan, np.asarray([])]
+    result = func(shards)
+    expected = reference(np.concatenate(shards))
+    if result != expected:
+        msg = f"Results do not match, got {result} != {expected}."
+        raise ValueError(msg)
+
+
+@pytest.mark.parametrize("dtype", ["float64", "float32", "int64"])
+@pytest.mark.parametrize(
+    ("bits", "max_candidates"),
+    [(16, 1 << 16), (4, 10), (1, 0)],
+)
+@pytest.mark.parametrize("seed", [1, 42, 99])
+def test_quantiles_bit_identical(
+    dtype: str, bits: int, max_candidates: int, seed: int
+) -> None:
+    """Test that quantiles are bit-identical to np.nanquantile."""
+    rng = np.random.default_rng(seed)
+    shards = [
+        np.round(rng.normal(size=rng.integers(0, 1000)) * 10, 1).astype(dtype)
+        for _ in range(5)
+    ]
+    if dtype == "float64":
+        shards[0][::7] = np.nan
+    result = distributed_quantiles(
+        shards, quantiles, bits=bits, max_candidates=max_candidates
+    )
+    expected = np.nanquantile(np.concatenate(shards), quantiles)
+    if not np.array_equal(result, expected):
+        msg = f"Results do not match, got {result} != {expected}."
+        raise ValueError(msg)
+
+
+def test_quantiles_from_files(tmp_path: pathlib.Path) -> None:
+    """Test for shards stored in .npy files."""
+    rng = np.random.default_rng(42)
+    data = rng.exponential(size=(3, 1000))
+    paths = []
+    for i, shard in enumerate(data):
+        path = tmp_path / f"{i}.npy"
+        np.save(path, shard)
+        paths.append(path)
+    result = distributed_quantiles(paths, quantiles)
+    expected = np.quantile(data, quantiles)
+    if not np.array_equal(result, expected):
+        msg = f"Results do not match, got {result} != {expected}."
+        raise ValueError(msg)
+
+
+def test_quantiles_corner_cases() -> None:
+    """Test for empty data and incorrect parameters."""
+    result = distributed_quantiles([[], [np.nan]], [0.5])
+    if not np.isnan(result).all():
+        msg = "Quantiles of empty data should be nan."
+        raise ValueError(msg)
+    with pytest.raises(ValueError, match="Parameter bits should be in range"):
+        distributed_quantiles([[1.0]], [0.5], bits=0)
@@ -0,0 +1,34 @@
+"""Collection of tests of lazy imports."""
+
+import os
+import pathlib
+import subprocess
+import sys
+
+import obscure_stats
+import pytest
+
+
+@pytest.mark.parametrize(
+    "module",
+    [
+        "obscure_stats.association",
+        "obscure_stats.central_tendency",
+        "obscure_stats.cli",
+        "obscure_stats.dispersion",
+        "obscure_stats.kurtosis",
+        "obscure_stats.skewness",
+        "obscure_stats.variation",
+    ],
+)
+def test_scipy_is_not_imported(module: str) -> None:
+    """Test that importing the module does not load scipy.stats."""
+    code = f"import sys, {module}; sys.exit('scipy.stats' in sys.modules)"
+    env = {
+        **os.environ,
+        "PYTHONPATH": str(pathlib.Path(obscure_stats.__file__).parents[1]),
+    }
+    result = subprocess.run([sys.executable, "-c", code], env=env, check=False)  # noqa: S603
+    if result.returncode:
+        msg = f"Importing {module} should not load scipy.stats."
+        raise ValueError(msg)
@@ -72,3 +72,25 @@ def test_statistic_with_nans(
     if np.isnan(func(x_array_nan)):
         msg = "Statistic should not return nans."
         raise ValueError(msg)
+
+
+@pytest.mark.parametrize("size", [101, 200_001])
+@pytest.mark.parametrize("levels", [1, 3, 50])
+def test_hogg_kurt_ties(size: int, levels: int) -> None:
+    """Test tied and missing values against the masked means of the definition."""
+    rng = np.random.default_rng(size + levels)
+    x = rng.integers(0, levels, size=size).astype(np.float64) + rng.normal(size=size)
+    x = np.round(x) if levels > 1 else np.round(x, 1)
+    x[rng.random(size) < 0.05] = np.nan  # noqa: PLR2004
+    p05, p50, p95 = np.nanquantile(x, [0.05, 0.5, 0.95])
+    with np.errstate(invalid="ignore"):
+        expected = (
+            np.nanmean(np.where(x >= p95, x, np.nan))
+            - np.nanmean(np.where(x <= p05, x, np.nan))
+        ) / (
+            np.nanmean(np.where(x >= p50, x, np.nan))
+            - np.nanmean(np.where(x <= p50, x, np.nan))
+        )
+    if hogg_kurt(x) != pytest.approx(expected, rel=1e-9):
+        msg = "Results with ties and missing values do not match the definition."
+        raise ValueError(msg)
@@ -0,0 +1,95 @@
+"""Collection of tests of parallel module."""
+
+import typing
+
+import numpy as np
+import pytest
+from obscure_stats.central_tendency import half_sample_mode, midhinge
+from obscure_stats.cache import cache_info, clear_cache
+from obscure_stats.config import config_context
+from obscure_stats.dispersion import shamos_estimator
+from obscure_stats.parallel import _choose_backend, compute_many
+
+
+@pytest.mark.parametrize("backend", ["threads", "processes"])
+@pytest.mark.parametrize("n_jobs", [1, 2])
+def test_compute_many(backend: str, n_jobs: int) -> None:
+    """Test that parallel results are equal to direct calls."""
+    x = np.random.default_rng(0).exponential(size=(50, 7))
+    x[3, 2] = np.nan
+    funcs: list[typing.Callable] = [midhinge, half_sample_mode, shamos_estimator]
+    result = compute_many(
+        x, [f.__name__ for f in funcs], n_jobs=n_jobs, backend=backend
+    )
+    expected = np.array([[f(x[:, j]) for j in range(x.shape[1])] for f in funcs])
+    if not np.allclose(result, expected, equal_nan=True):
+        msg = f"Results of {backend} differ from direct calls."
+        raise ValueError(msg)
+
+
+def test_compute_many_warnings() -> None:
+    """Test that warnings of the worker processes are emitted."""
+    x = np.full((10, 4), np.nan)
+    with pytest.warns(RuntimeWarning):
+        result = compute_many(x, ["l_skew"], n_jobs=2, backend="processes")
+    if not np.isnan(result).all():
+        msg = "Statistics of missing values should be missing."
+        raise ValueError(msg)
+
+
+@pytest.mark.parametrize("n_jobs", [1, 2])
+def test_compute_many_nan_policy(n_jobs: int) -> None:
+    """Test that columns with missing values are handled by the policy."""
+    x = np.random.default_rng(0).exponential(size=(50, 4))
+    expected = compute_many(x, ["midhinge", "l_skew"], n_jobs=n_jobs)
+    x[3, 2] = np.nan
+    result = compute_many(
+        x, ["midhinge", "l_skew"], n_jobs=n_jobs, nan_policy="propagate"
+    )
+    expected[:, 2] = np.nan
+    if not np.allclose(result, expected, equal_nan=True):
+        msg = "Only the column with missing values should be missing."
+        raise ValueError(msg)
+    with pytest.raises(ValueError, match="missing values"):
+        compute_many(x, ["midhinge"], n_jobs=n_jobs, nan_policy="raise")
+
+
+def test_compute_many_settings() -> None:
+    """Test that settings of the caller are used by the threads."""
+    x = np.random.default_rng(0).normal(size=(30, 4))
+    clear_cache()
+    with config_context(cache_entries=16):
+        compute_many(x, ["midhinge"], n_jobs=2, backend="threads")
+    entries = cache_info()["entries"]
+    clear_cache()
+    if entries != x.shape[1]:
+        msg = "Settings are not passed to the threads."
+        raise ValueError(msg)
+
+
+def test_choose_backend() -> None:
+    """Test that threads are chosen for long columns of numpy kernels."""
+    if _choose_backend(["midhinge"], 10**6) != "threads":
+        msg = "Threads should be chosen for kernels that release the GIL."
+        raise ValueError(msg)
+    if _choose_backend(["half_sample_mode"], 10**6) != "processes":
+        msg = "Processes should be chosen for GIL-bound measures."
+        raise ValueError(msg)
+    if _choose_backend(["midhinge"], 100) != "processes":
+        msg = "Processes should be chosen for short columns."
+        raise ValueError(msg)
+
+
+def test_compute_many_errors() -> None:
+    """Test for incorrect inputs."""
+    x = np.zeros((3, 3))
+    with pytest.raises(ValueError, match="2-d array"):
+        compute_many(x[0], ["midhinge"])
+    with pytest.raises(ValueError, match="numeric"):
+        compute_many(x.astype(str), ["midhinge"])
+    with pytest.raises(ValueError, match="Unknown statistics"):
+        compute_many(x, ["foo"])
+    with pytest.raises(ValueError, match="backend"):
+        compute_many(x, ["midhinge"], backend="gpu")
+    with pytest.raises(ValueError, match="n_jobs"):
+        compute_many(x, ["midhinge"], n_jobs=-1)
@@ -0,0 +1,87 @@
+"""Collection of tests of the precision of float32 computations."""
+
+import tracemalloc
+import typing
+import warnings
+
+import numpy as np
+import pytest
+from obscure_stats import (
+    association,
+    central_tendency,
+    dispersion,
+    kurtosis,
+    skewness,
+    variation,
+)
+from obscure_stats.config import config_context, set_config
+from obscure_stats.skewness import l_skew
+
+MODULES = (central_tendency, dispersion, kurtosis, skewness, variation)
+ESTIMATORS = [getattr(module, name) for module in MODULES for name in module.__all__]
+CORRELATIONS = [getattr(association, name) for name in association.__all__]
+# bound of the error relative to the value, with the absolute one for values near 0
+RTOL = 1e-5
+ATOL = 1e-6
+
+
+def _samples() -> dict[str, np.ndarray]:
+    """Generate well-conditioned and offset float32 samples."""
+    rng = np.random.default_rng(42)
+    return {
+        "offset": rng.normal(50, 10, size=5000).astype(np.float32),
+        "heavy": rng.lognormal(size=5000).astype(np.float32),
+    }
+
+
+def _assert_close(func: typing.Callable, *args: np.ndarray) -> None:
+    """Compare the float32 computation with float64 one on the same values."""
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        expected = func(*(np.asarray(a, dtype=np.float64) for a in args))
+        with config_context(dtype_policy="preserve"):
+            result = func(*args)
+    if not np.allclose(result, expected, rtol=RTOL, atol=ATOL, equal_nan=True):
+        msg = (
+            f"Error of {func.__name__} on float32 data exceeds the bound: "
+            f"{result} vs {expected}."
+        )
+        raise ValueError(msg)
+
+
+@pytest.mark.parametrize("func", ESTIMATORS)
+@pytest.mark.parametrize("sample", ["offset", "heavy"])
+def test_preserve_precision(func: typing.Callable, sample: str) -> None:
+    """Test that float32 temporaries keep the error of every estimator bounded."""
+    _assert_close(func, _samples()[sample])
+
+
+@pytest.mark.parametrize("func", CORRELATIONS)
+def test_preserve_precision_correlations(func: typing.Callable) -> None:
+    """Test that float32 temporaries keep the error of every correlation bounded."""
+    rng = np.random.default_rng(42)
+    x = rng.normal(50, 10, size=1000).astype(np.float32)
+    y = (x + rng.normal(0, 10, size=1000)).astype(np.float32)
+    _assert_close(func, x, y)
+
+
+def test_preserve_memory() -> None:
+    """Test that float32 data is not converted to float64."""
+    x = np.random.default_rng(42).normal(size=100000).astype(np.float32)
+    peaks = []
+    for policy in ("float64", "preserve"):
+        with config_context(dtype_policy=policy):
+            l_skew(x)
+            tracemalloc.start()
+            l_skew(x)
+            peaks.append(tracemalloc.get_traced_memory()[1])
+            tracemalloc.stop()
+    if peaks[1] >= peaks[0] * 0.75:
+        msg = f"Preserve policy should use less memory, got peaks {peaks}."
+        raise ValueError(msg)
+
+
+def test_dtype_policy_setting() -> None:
+    """Test for incorrect values of the setting."""
+    with pytest.raises(ValueError, match="dtype_policy"):
+        set_config(dtype_policy="float16")
@@ -0,0 +1,121 @@
+"""Collection of tests of profiling module."""
+
+import json
+import os
+import pathlib
+import subprocess
+import sys
+
+import numpy as np
+import obscure_stats
+import pytest
+from obscure_stats.association import tukey_correlation
+from obscure_stats.central_tendency import midhinge
+from obscure_stats.kurtosis import l_kurt
+from obscure_stats.profiling import PHASES, profile
+from obscure_stats.skewness import auc_skew_gamma
+
+
+def test_profile_stats(x_array_float: np.ndarray, y_array_float: np.ndarray) -> None:
+    """Test that calls, sizes and phases are recorded."""
+    with profile() as profiler:
+        midhinge(x_array_float)
+        midhinge(x_array_float)
+        tukey_correlation(x_array_float, y_array_float)
+        l_kurt(x_array_float)
+        auc_skew_gamma(x_array_float)
+    stats = profiler.stats()
+    if stats["midhinge"]["calls"] != 2:  # noqa: PLR2004
+        msg = "Calls of midhinge are not counted."
+        raise ValueError(msg)
+    if stats["midhinge"]["max_elements"] != len(x_array_float):
+        msg = "Input size of midhinge is not recorded."
+        raise ValueError(msg)
+    if stats["midhinge"]["phases"]["quantile"] <= 0:
+        msg = "Quantile phase of midhinge is not recorded."
+        raise ValueError(msg)
+    if stats["tukey_correlation"]["phases"]["validation"] <= 0:
+        msg = "Validation phase of tukey_correlation is not recorded."
+        raise ValueError(msg)
+    if stats["l_kurt"]["phases"]["sort"] <= 0:
+        msg = "Sort phase of l_kurt is not recorded."
+        raise ValueError(msg)
+    for name in ("_check_arrays", "_prep_arrays", "_auc_skew_gamma"):
+        if stats[name]["calls"] != 1:
+            msg = f"Calls of {name} are not counted."
+            raise ValueError(msg)
+    for name, record in stats.items():
+        if sum(record["phases"].values()) > record["time"]:
+            msg = f"Phases of {name} are longer than the call."
+            raise ValueError(msg)
+
+
+def test_profile_memory() -> None:
+    """Test that peak allocation is recorded."""
+    x = np.random.default_rng(0).normal(size=100_000)
+    with profile() as profiler:
+        l_kurt(x)
+    if profiler.stats()["l_kurt"]["peak_memory"] < x.nbytes:
+        msg = "Peak memory of l_kurt is not recorded."
+        raise ValueError(msg)
+    with profile(memory=False) as profiler:
+        l_kurt(x)
+    if profiler.stats()["l_kurt"]["peak_memory"]:
+        msg = "Memory should not be traced."
+        raise ValueError(msg)
+
+
+def test_profile_disabled(x_array_float: np.ndarray) -> None:
+    """Test that calls outside of the context are not recorded."""
+    with profile() as profiler:
+        pass
+    midhinge(x_array_float)
+    if profiler.stats():
+        msg = "Calls outside of the context should not be recorded."
+        raise ValueError(msg)
+
+
+def test_profile_export(x_array_float: np.ndarray, tmp_path: pathlib.Path) -> None:
+    """Test JSON and Chrome trace reports."""
+    with profile(tmp_path / "stats.json"):
+        midhinge(x_array_float)
+    with profile(tmp_path / "trace.json", trace_format="chrome"):
+        midhinge(x_array_float)
+    stats = json.loads((tmp_path / "stats.json").read_text())
+    if set(stats["midhinge"]["phases"]) != set(PHASES):
+        msg = "JSON report is not written."
+        raise ValueError(msg)
+    events = json.loads((tmp_path / "trace.json").read_text())["traceEvents"]
+    names = {event["name"] for event in events}
+    if "midhinge" not in names or any(event["ph"] != "X" for event in events):
+        msg = "Chrome trace is not written."
+        raise ValueError(msg)
+
+
+def test_profile_errors() -> None:
+    """Test that unknown format raises an error."""
+    context = profile(trace_format="csv")
+    with pytest.raises(ValueError, match="Parameter trace_format"):
+        context.__enter__()
+
+
+def test_profile_environment(tmp_path: pathlib.Path) -> None:
+    """Test that profiling is enabled by the environment variable."""
+    path = tmp_path / "stats.json"
+    code = "from obscure_stats.central_tendency import trimean; trimean([1, 2, 3])"
+    env = {
+        **os.environ,
+        "PYTHONPATH": str(pathlib.Path(obscure_stats.__file__).parents[1]),
+        "OBSCURE_STATS_PROFILE": str(path),
+    }
+    subprocess.run([sys.executable, "-c", code], env=env, check=True)  # noqa: S603
+    if json.loads(path.read_text())["trimean"]["calls"] != 1:
+        msg = "Profiling should be enabled by OBSCURE_STATS_PROFILE."
+        raise ValueError(msg)
+
+
+def test_instrumented_signature() -> None:
+    """Test that instrumented functions keep names and docstrings."""
+    if midhinge.__name__ != "midhinge" or "midhinge" not in (midhinge.__doc__ or ""):
+        msg = "Instrumented function should keep the metadata."
+        raise ValueError(msg)
@@ -0,0 +1,148 @@
+"""Collection of tests of rolling module."""
+
+import typing
+
+import numpy as np
+import pytest
+from obscure_stats.association import chatterjeexi
+from obscure_stats.dispersion import coefficient_of_lvariation, gini_mean_difference
+from obscure_stats.kurtosis import l_kurt
+from obscure_stats.rolling import (
+    rolling_chatterjeexi,
+    rolling_coefficient_of_lvariation,
+    rolling_gini_mean_difference,
+    rolling_l_kurt,
+    rolling_l_skew,
+)
+from obscure_stats.skewness import l_skew
+
+all_functions = [
+    rolling_coefficient_of_lvariation,
+    rolling_gini_mean_difference,
+    rolling_l_kurt,
+    rolling_l_skew,
+]
+
+
+@pytest.mark.parametrize(
+    "func",
+    all_functions,
+)
+@pytest.mark.parametrize(
+    "data",
+    ["x_list_float", "x_list_int", "x_array_int", "x_array_float"],
+)
+def test_mock_rolling_functions(
+    func: typing.Callable,
+    data: str,
+    request: pytest.FixtureRequest,
+) -> None:
+    """Test for different data types."""
+    data = request.getfixturevalue(data)
+    func(data, 4)
+
+
+@pytest.mark.parametrize(
+    ("func", "reference"),
+    [
+        (rolling_coefficient_of_lvariation, coefficient_of_lvariation),
+        (rolling_gini_mean_difference, gini_mean_difference),
+        (rolling_l_kurt, l_kurt),
+        (rolling_l_skew, l_skew),
+    ],
+)
+@pytest.mark.parametrize("window", [5, 16])
+@pytest.mark.parametrize("seed", [1, 42, 99])
+def test_rolling_matches_reference(
+    func: typing.Callable,
+    reference: typing.Callable,
+    window: int,
+    seed: int,
+) -> None:
+    """Testing that every window matches the full computation."""
+    rng = np.random.default_rng(seed)
+    x = np.round(rng.exponential(size=100), 1)
+    result = func(x, window)
+    expected = [
+        reference(w) for w in np.lib.stride_tricks.sliding_window_view(x, window)
+    ]
+    if result != pytest.approx(expected, rel=1e-6):
+        msg = "Rolling statistic does not match the full computation."
+        raise ValueError(msg)
+
+
+@pytest.mark.parametrize(
+    "func",
+    all_functions,
+)
+def test_rolling_with_nans(func: typing.Callable, x_array_nan: np.ndarray) -> None:
+    """Test for missing values inside the window."""
+    result = func(x_array_nan, 5)
+    if len(result) != len(x_array_nan) - 4:
+        msg = "Number of windows is wrong."
+        raise ValueError(msg)
+    if np.isnan(result).any():
+        msg = "Statistic should not return nans."
+        raise ValueError(msg)
+
+
+@pytest.mark.parametrize(
+    "func",
+    all_functions,
+)
+def test_window_size(func: typing.Callable, x_array_float: np.ndarray) -> None:
+    """Test for incorrect window size."""
+    with pytest.raises(ValueError, match="Parameter window should be in range"):
+        func(x_array_float, 1)
+    with pytest.raises(ValueError, match="Parameter window should be in range"):
+        func(x_array_float, len(x_array_float) + 1)
+
+
+@pytest.mark.parametrize("func", [rolling_l_skew, rolling_l_kurt])
+@pytest.mark.parametrize("value", [0.0, 1.0, 3.3])
+def test_l_moments_constant_window(func: typing.Callable, value: float) -> None:
+    """Test that constant windows have undefined L-moment ratios."""
+    x = np.r_[1.0, 2.0, 3.0, value, value, value, value, value, 5.0]
+    result = func(x, 4)
+    if not np.isnan(result[3:5]).all() or np.isnan(np.r_[result[:3], result[5:]]).any():
+        msg = "L-moment ratios should be nan only in the constant windows."
+        raise ValueError(msg)
+
+
+def test_lcv_corner_cases() -> None:
+    """Testing for very small mean in rolling L-CV calculation."""
+    x = np.asarray([0.0, 0.0, 0.0, 0.0, 1e-9, 0.0, 0.0])
+    with pytest.warns(match="Statistic is undefined"):
+        result = rolling_coefficient_of_lvariation(x, 3)
+    if not np.isinf(result).all():
+        msg = "Dispersion should be inf."
+        raise ValueError(msg)
+
+
+@pytest.mark.parametrize("window", [5, 16])
+@pytest.mark.parametrize("seed", [1, 42, 99])
+def test_rolling_xi_matches_reference(window: int, seed: int) -> None:
+    """Testing that every window matches the full computation."""
+    rng = np.random.default_rng(seed)
+    x = rng.normal(size=100)
+    y = np.round(x + rng.normal(size=100), 1)
+    result = rolling_chatterjeexi(x, y, window)
+    expected = [
+        chatterjeexi(x[i : i + window], y[i : i + window])
+        for i in range(len(x) - window + 1)
+    ]
+    if result != pytest.approx(expected, rel=1e-6):
+        msg = "Rolling statistic does not match the full computation."
+        raise ValueError(msg)
+
+
+def test_rolling_xi_with_nans(
+    x_array_nan: np.ndarray, y_array_float: np.ndarray
+) -> None:
+    """Test for missing values inside the window."""
+    result = rolling_chatterjeexi(x_array_nan, y_array_float, 5)
+    if np.isnan(result).any():
+        msg = "Statistic should not return nans."
+        raise ValueError(msg)
+    with pytest.raises(ValueError, match="Lengths of the inputs do not match"):
+        rolling_chatterjeexi(x_array_nan, y_array_float[:-1], 5)
@@ -0,0 +1,115 @@
+"""Collection of tests of the local statistics server and its client."""
+
+import contextlib
+import getpass
+import os
+import pathlib
+import subprocess
+import stat
+import sys
+import tempfile
+import threading
+import time
+import typing
+
+import numpy as np
+import obscure_stats
+import pytest
+from obscure_stats.central_tendency import midhinge, trimean
+from obscure_stats.client import Client, _runtime_dir
+from obscure_stats.server import _private_dir, serve
+
+
+@contextlib.contextmanager
+def _running_server(path: pathlib.Path) -> typing.Iterator[Client]:
+    """Start the server in a background thread and connect to it."""
+    thread = threading.Thread(target=serve, args=(path, 1), daemon=True)
+    thread.start()
+    for _ in range(100):
+        if path.exists():
+            break
+        time.sleep(0.1)
+    with Client(path) as connection:
+        yield connection
+        connection.shutdown()
+    thread.join(timeout=10)
+
+
+@pytest.fixture(scope="module")
+def client() -> typing.Iterator[Client]:
+    """Start the server in a temporary directory."""
+    # paths of Unix sockets are limited to ~100 characters
+    with (
+        tempfile.TemporaryDirectory() as directory,
+        _running_server(pathlib.Path(directory) / "server.sock") as connection,
+    ):
+        yield connection
+
+
+def test_socket_permissions(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that only the owner could connect to the socket."""
+    with tempfile.TemporaryDirectory() as directory:
+        monkeypatch.setenv("XDG_RUNTIME_DIR", directory)
+        path = _runtime_dir() / "obscure_stats.sock"
+        with _running_server(path) as connection:
+            mode = stat.S_IMODE(path.stat().st_mode)
+            if mode != 0o600 or not connection.ping():  # noqa: PLR2004
+                msg = f"Socket should be private, got mode {mode:o}."
+                raise ValueError(msg)
+
+
+def test_runtime_dir(monkeypatch: pytest.MonkeyPatch, tmp_path: pathlib.Path) -> None:
+    """Test that the default directory is per-user and private."""
+    monkeypatch.delenv("XDG_RUNTIME_DIR", raising=False)
+    monkeypatch.setattr(tempfile, "tempdir", str(tmp_path))
+    directory = _runtime_dir()
+    if directory.parent != tmp_path or getpass.getuser() not in directory.name:
+        msg = "Socket directory should be a per-user temporary directory."
+        raise ValueError(msg)
+    _private_dir(directory)
+    if stat.S_IMODE(directory.stat().st_mode) != 0o700:  # noqa: PLR2004
+        msg = "Socket directory should be accessible only by the user."
+        raise ValueError(msg)
+    directory.chmod(0o777)
+    with pytest.raises(OSError, match="private"):
+        _private_dir(directory)
+
+
+def test_compute(client: Client, tmp_path: pathlib.Path) -> None:
+    """Test that the server gives the same results as direct calls."""
+    rng = np.random.default_rng(42)
+    x = rng.exponential(size=1000)
+    y = rng.integers(0, 10, size=(10, 10)).astype(np.int32)
+    np.save(tmp_path / "x.npy", x)
+    if not client.ping():
+        msg = "Server is not alive."
+        raise ValueError(msg)
+    reports = client.compute([x, y, tmp_path / "x.npy"], ["midhinge", "trimean"])
+    datasets: list[np.ndarray] = [x, y, x]
+    for i, data in enumerate(datasets):
+        report = reports[i]
+        expected = {"midhinge": midhinge(data), "trimean": trimean(data)}
+        if report["statistics"] != pytest.approx(expected):
+            msg = f"Results do not match, got {report['statistics']} != {expected}."
+            raise ValueError(msg)
+
+
+def test_errors(client: Client) -> None:
+    """Test for incorrect requests."""
+    with pytest.raises(RuntimeError, match="Unknown statistics"):
+        client.compute([np.arange(3.0)], ["foo"])
+    with pytest.raises(RuntimeError, match="FileNotFoundError"):
+        client.compute(["missing.npy"], ["midhinge"])
+
+
+def test_client_imports() -> None:
+    """Test that the client does not import scipy."""
+    code = "import sys; import obscure_stats.client; sys.exit('scipy' in sys.modules)"
+    env = {
+        **os.environ,
+        "PYTHONPATH": str(pathlib.Path(obscure_stats.__file__).parents[1]),
+    }
+    result = subprocess.run([sys.executable, "-c", code], env=env, check=False)  # noqa: S603
+    if result.returncode:
+        msg = "Client should not import scipy."
+        raise ValueError(msg)
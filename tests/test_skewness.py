@@ -1,5 +1,6 @@
 """Collection of tests of skewness module."""
 
+import pathlib
 import typing
 
 import numpy as np
@@ -19,6 +20,7 @@ from obscure_stats.skewness import (
     pearson_mode_skew,
     wauc_skew_gamma,
 )
+from scipy import stats  # type: ignore[import-untyped]
 
 all_functions = [
     auc_skew_gamma,
@@ -84,6 +86,46 @@ def test_rank_skew(rank_skewness_test_data: np.ndarray) -> None:
         raise ValueError(msg)
 
 
+def _rank_skew_reference(x: np.ndarray) -> float:
+    """Calculate rank skewness from the min-ranks of the values and the midrange."""
+    _x = x[~np.isnan(x)]
+    mr = (np.min(_x) + np.max(_x)) * 0.5
+    ranks = stats.rankdata(np.r_[_x, mr], method="min")
+    diff = ranks[-1] - ranks[:-1]
+    return np.sum(diff) / np.sum(np.abs(diff))
+
+
+@pytest.mark.parametrize(
+    "x",
+    [
+        np.random.default_rng(0).integers(0, 4, size=200).astype(np.float64),
+        np.random.default_rng(1).integers(0, 3, size=1001).astype(np.float64) ** 2,
+        np.array([0.0, 1.0, 1.0, 2.0, 2.0, 2.0, 3.0, 4.0]),
+        np.array([0.0, 5.0, 5.0, 5.0, 10.0, 10.0]),
+        np.array([0.0, 0.0, 0.0, 3.0, 7.0, 10.0]),
+        np.array([1.0, np.nan, 2.0, 2.0, np.nan, 9.0, 2.0]),
+        np.array([1.0, 2.0]),
+        np.random.default_rng(2).lognormal(size=500),
+    ],
+)
+def test_rank_skew_definition(x: np.ndarray) -> None:
+    """Test ties, ties at the midrange and missing values against the ranks."""
+    if forhad_shorna_rank_skew(x) != pytest.approx(_rank_skew_reference(x)):
+        msg = "Rank skewness does not match the definition with ranks."
+        raise ValueError(msg)
+
+
+@pytest.mark.parametrize("x", [np.array([3.0]), np.array([2.0, 2.0, np.nan])])
+def test_rank_skew_constant(x: np.ndarray) -> None:
+    """Test that constant samples have undefined rank skewness as in the ranks."""
+    with np.errstate(invalid="ignore"):
+        expected = _rank_skew_reference(x)
+        result = forhad_shorna_rank_skew(x)
+    if not (np.isnan(result) and np.isnan(expected)):
+        msg = "Rank skewness of the constant sample should be undefined."
+        raise ValueError(msg)
+
+
 @pytest.mark.parametrize(
     "func",
     all_functions,
@@ -96,3 +138,123 @@ def test_statistic_with_nans(
     if np.isnan(func(x_array_nan)):
         msg = "Statistic should not return nans."
         raise ValueError(msg)
+
+
+@pytest.mark.parametrize(
+    "func",
+    [auc_skew_gamma, wauc_skew_gamma],
+)
+def test_auc_several_steps(func: typing.Callable) -> None:
+    """Test that several steps give the same results as separate calls."""
+    rng = np.random.default_rng(42)
+    x = rng.exponential(size=1000)
+    dps = [0.01, 0.02, 0.005]
+    result = func(x, dps)
+    expected = [func(x, dp) for dp in dps]
+    if result != pytest.approx(expected):
+        msg = f"Results do not match, got {result} != {expected}."
+        raise ValueError(msg)
+
+
+@pytest.mark.parametrize(
+    "func",
+    [auc_skew_gamma, wauc_skew_gamma],
+)
+def test_auc_histogram(func: typing.Callable) -> None:
+    """Test that pre-binned histogram gives close results."""
+    rng = np.random.default_rng(42)
+    x = rng.exponential(size=100_000)
+    counts, bin_edges = np.histogram(x, bins=2000)
+    result = func(counts, bin_edges=bin_edges)
+    expected = func(x)
+    if result != pytest.approx(expected, rel=0.05):
+        msg = f"Results do not match, got {result} != {expected}."
+        raise ValueError(msg)
+    with pytest.raises(ValueError, match="Parameter bin_edges should be"):
+        func(counts, bin_edges=bin_edges[:-1])
+
+
+@pytest.mark.parametrize("method", ["exact", "hist", "kde", "hsm"])
+def test_pearson_mode_methods(method: str, x_array_nan: np.ndarray) -> None:
+    """Test that every mode estimator gives sensible results."""
+    rng = np.random.default_rng(42)
+    x = rng.gamma(2, size=100_000)
+    if method == "exact":
+        x = np.round(x, 1)
+    result = pearson_mode_skew(x, method=method)
+    # mode of gamma(2) distribution is 1
+    expected = (np.mean(x) - 1) / np.std(x)
+    if result != pytest.approx(expected, abs=0.1):
+        msg = f"Results do not match, got {result} != {expected}."
+        raise ValueError(msg)
+    if np.isnan(pearson_mode_skew(x_array_nan, method=method)):
+        msg = "Statistic should not return nans."
+        raise ValueError(msg)
+
+
+def test_pearson_mode_exact() -> None:
+    """Test that exact mode is the smallest of the most frequent values."""
+    x = np.asarray([5, 3, 3, 9, 5, 1], dtype=np.int8)
+    expected = (np.mean(x) - 3) / np.std(x)
+    for data in (x, x.astype(np.float64), x.astype(np.int64) * 10**12):
+        result = pearson_mode_skew(data)
+        if result != pytest.approx(expected):
+            msg = f"Results do not match, got {result} != {expected}."
+            raise ValueError(msg)
+    with pytest.raises(ValueError, match="Parameter method should be one of"):
+        pearson_mode_skew(x, method="median")
+    with pytest.raises(ValueError, match="Parameter bins should be"):
+        pearson_mode_skew(x, method="hist", bins=0)
+
+
+@pytest.mark.parametrize(
+    "x",
+    [
+        np.array([0.0, 1.0, 1.0]),
+        np.array([0.0, 1.0, 1.0, 1.0, 5.0]),
+        np.array([2.0, 2.5, 7.0, 7.5, 7.5, 8.0]),
+        np.random.default_rng(3).normal(size=40),
+    ],
+)
+@pytest.mark.parametrize("bins", [4, 16, 256])
+def test_pearson_mode_kde_small(x: np.ndarray, bins: int) -> None:
+    """Test that kernels wider than the histogram keep the bins aligned."""
+    counts, edges = np.histogram(x, bins=bins)
+    centers = 0.5 * (edges[1:] + edges[:-1])
+    # Gaussian kernel in the units of bins, truncated at 4 bandwidths
+    # (but not farther than the number of bins) as in the estimator
+    bandwidth = 0.9 * np.std(x) * len(x) ** -0.2 / (edges[1] - edges[0])
+    radius = min(np.ceil(4 * bandwidth), bins)
+    distances = np.arange(bins)[:, None] - np.arange(bins)[None, :]
+    kernel = np.exp(-0.5 * (distances / bandwidth) ** 2)
+    density = np.where(np.abs(distances) <= radius, kernel, 0) @ counts
+    mode = centers[np.argmax(density)]
+    expected = (np.mean(x) - mode) / np.std(x)
+    result = pearson_mode_skew(x, method="kde", bins=bins)
+    if result != pytest.approx(expected):
+        msg = f"Results do not match, got {result} != {expected}."
+        raise ValueError(msg)
+
+
+def test_cumulative_skew_batched(tmp_path: pathlib.Path) -> None:
+    """Test that batched and chunked calculations match separate calls."""
+    rng = np.random.default_rng(42)
+    x = rng.exponential(size=(20, 500))
+    x[3, :10] = np.nan
+    expected = [cumulative_skew(row) for row in x]
+    result = cumulative_skew(x)
+    if result != pytest.approx(expected):
+        msg = f"Results do not match, got {result} != {expected}."
+        raise ValueError(msg)
+    result = cumulative_skew(x.T, axis=0)
+    if result != pytest.approx(expected):
+        msg = f"Results do not match, got {result} != {expected}."
+        raise ValueError(msg)
+    mm = np.lib.format.open_memmap(tmp_path / "x.npy", mode="w+", shape=x.shape)
+    mm[:] = np.sort(x, axis=1)
+    result = cumulative_skew(mm, presorted=True, chunk_size=37)
+    if result != pytest.approx(expected):
+        msg = f"Results do not match, got {result} != {expected}."
+        raise ValueError(msg)
+    with pytest.raises(ValueError, match="Parameter chunk_size should be"):
+        cumulative_skew(x, chunk_size=0)
@@ -0,0 +1,181 @@
+"""Collection of tests of internal helpers."""
+
+import typing
+import warnings
+
+import numpy as np
+import pytest
+from obscure_stats import association
+from obscure_stats._utils import _nanquantile, _scratch, _strip_nans
+from obscure_stats._registry import ESTIMATORS
+from obscure_stats.config import config_context, set_config
+
+CORRELATIONS = [getattr(association, name) for name in association.__all__]
+
+MISSING_SHARE = 0.05
+
+quantiles = [0.0, 0.025, 0.05, 0.1, 0.25, 0.4375, 0.5, 0.75, 0.9, 0.975, 1.0]
+
+
+@pytest.mark.parametrize(
+    "data",
+    ["x_list_float", "x_list_int", "x_array_int", "x_array_float", "x_array_nan"],
+)
+def test_nanquantile(data: str, request: pytest.FixtureRequest) -> None:
+    """Test that quantiles are identical to numpy."""
+    x = np.asarray(request.getfixturevalue(data))
+    result = _nanquantile(x, quantiles)
+    expected = np.nanquantile(x, quantiles)
+    if not np.array_equal(result, expected):
+        msg = f"Quantiles do not match numpy, got {result} != {expected}."
+        raise ValueError(msg)
+
+
+@pytest.mark.parametrize("seed", [1, 42, 99])
+def test_nanquantile_overwrite_input(seed: int) -> None:
+    """Test that input is modified only when it is allowed."""
+    rng = np.random.default_rng(seed)
+    x = rng.normal(size=1001)
+    x_copy = x.copy()
+    expected = np.nanquantile(x, quantiles)
+    result = _nanquantile(x, quantiles)
+    if not np.array_equal(x, x_copy):
+        msg = "Input should not be modified."
+        raise ValueError(msg)
+    result_inplace = _nanquantile(x, quantiles, overwrite_input=True)
+    if not (
+        np.array_equal(result, expected) and np.array_equal(result_inplace, expected)
+    ):
+        msg = "Quantiles do not match numpy."
+        raise ValueError(msg)
+    if np.array_equal(x, x_copy):
+        msg = "Input should be partitioned inplace."
+        raise ValueError(msg)
+
+
+@pytest.mark.parametrize(
+    "func",
+    [
+        "midhinge",
+        "trimean",
+        "midmean",
+        "half_sample_mode",
+        "standard_trimmed_harrell_davis_quantile",
+        "quartile_coefficient_of_dispersion",
+        "coefficient_of_lvariation",
+        "bowley_skew",
+        "groeneveld_skew",
+        "kelly_skew",
+        "l_skew",
+        "cumulative_skew",
+        "crow_siddiqui_kurt",
+        "hogg_kurt",
+        "l_kurt",
+        "moors_octile_kurt",
+        "reza_ma_kurt",
+    ],
+)
+def test_scratch_buffers(func: str) -> None:
+    """Test that in place and buffered calls give the same results."""
+    f = ESTIMATORS[func]
+    rng = np.random.default_rng(42)
+    x = rng.exponential(size=1001)
+    x[rng.random(len(x)) < MISSING_SHARE] = np.nan
+    x_copy = x.copy()
+    expected = f(x)
+    buffer = np.full(2000, np.inf)
+    for _ in range(2):
+        if not np.isclose(f(x, buffer=buffer), expected):
+            msg = f"Buffered call of {func} gives a different result."
+            raise ValueError(msg)
+    if not np.array_equal(x, x_copy, equal_nan=True):
+        msg = "Input should not be modified when the buffer is given."
+        raise ValueError(msg)
+    if not np.isclose(f(x, overwrite_input=True), expected):
+        msg = f"In place call of {func} gives a different result."
+        raise ValueError(msg)
+
+
+def test_strip_nans_inplace() -> None:
+    """Test that missing values are dropped without copying the input."""
+    x = np.arange(200000, dtype=np.float64)
+    x[::3] = np.nan
+    result = _strip_nans(x, overwrite_input=True)
+    if not np.shares_memory(result, x):
+        msg = "Values should be moved inside the input."
+        raise ValueError(msg)
+    expected = np.arange(200000, dtype=np.float64)
+    if not np.array_equal(result, expected[expected % 3 != 0]):
+        msg = "Values should keep their order."
+        raise ValueError(msg)
+
+
+def test_scratch_errors() -> None:
+    """Test for incorrect buffers."""
+    x = np.zeros(10)
+    with pytest.raises(ValueError, match="could not be used together"):
+        _scratch(x, overwrite_input=True, buffer=np.empty(10))
+    with pytest.raises(ValueError, match="1-d array"):
+        _scratch(x, buffer=np.empty((2, 10)))
+    with pytest.raises(ValueError, match="at least 10 elements"):
+        _scratch(x, buffer=np.empty(9))
+    with pytest.raises(ValueError, match="dtype"):
+        _scratch(x, buffer=np.empty(10, dtype=np.int64))
+    readonly = np.zeros(10)
+    readonly.flags.writeable = False
+    if _scratch(readonly, overwrite_input=True)[1]:
+        msg = "Read-only inputs should not be overwritten."
+        raise ValueError(msg)
+
+
+def _call_quietly(func: typing.Callable, *args: np.ndarray, **kwargs: str) -> float:
+    """Call the function ignoring its warnings."""
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        return func(*args, **kwargs)
+
+
+@pytest.mark.parametrize("func", sorted(ESTIMATORS))
+def test_nan_policies(func: str) -> None:
+    """Test that every policy handles missing values in the same way."""
+    f = ESTIMATORS[func]
+    x = np.random.default_rng(42).exponential(size=101)
+    expected = _call_quietly(f, x)
+    for policy in ("propagate", "raise", "assume_none"):
+        if not np.allclose(
+            _call_quietly(f, x, nan_policy=policy), expected, equal_nan=True
+        ):
+            msg = f"Policy {policy} of {func} changes results without missing values."
+            raise ValueError(msg)
+    x[3] = np.nan
+    if not np.isnan(_call_quietly(f, x, nan_policy="propagate")).all():
+        msg = f"Missing values of {func} should propagate."
+        raise ValueError(msg)
+    with pytest.raises(ValueError, match="missing values"):
+        f(x, nan_policy="raise")
+
+
+@pytest.mark.parametrize("func", CORRELATIONS)
+def test_nan_policies_correlations(func: typing.Callable) -> None:
+    """Test that missing values of either input are checked."""
+    rng = np.random.default_rng(42)
+    x = rng.normal(size=101)
+    y = x + rng.normal(size=101)
+    expected = _call_quietly(func, x, y)
+    if not np.isclose(_call_quietly(func, x, y, nan_policy="assume_none"), expected):
+        msg = f"Fast path of {func.__name__} changes results."
+        raise ValueError(msg)
+    y[3] = np.nan
+    if not np.isnan(_call_quietly(func, x, y, nan_policy="propagate")):
+        msg = f"Missing values of {func.__name__} should propagate."
+        raise ValueError(msg)
+    with config_context(nan_policy="raise"), pytest.raises(ValueError, match="missing"):
+        func(x, y)
+
+
+def test_nan_policy_setting() -> None:
+    """Test for incorrect values of the setting."""
+    with pytest.raises(ValueError, match="nan_policy"):
+        set_config(nan_policy="ignore")
+    with pytest.raises(ValueError, match="nan_policy"):
+        ESTIMATORS["midhinge"]([1.0, 2.0], nan_policy="ignore")
@@ -0,0 +1,124 @@
+"""Collection of tests of frequency-weighted samples."""
+
+import inspect
+import math
+import typing
+import warnings
+
+import numpy as np
+import pytest
+from obscure_stats._weighted import (
+    _block_comb_sums,
+    _exact_dot,
+    _weighted_pairwise_median,
+)
+from obscure_stats._registry import ESTIMATORS
+from obscure_stats.dispersion import gini_mean_difference, shamos_estimator
+from obscure_stats.skewness import l_skew
+
+weighted_functions = sorted(
+    name
+    for name, func in ESTIMATORS.items()
+    if "weights" in inspect.signature(func).parameters
+)
+
+
+def _tied_sample(seed: int) -> tuple[np.ndarray, np.ndarray]:
+    """Generate rounded values with counts, some of them missing or zero."""
+    rng = np.random.default_rng(seed)
+    x = np.round(rng.lognormal(size=1000), 2)
+    weights = rng.integers(0, 4, size=1000)
+    x[rng.random(1000) < 0.02] = np.nan  # noqa: PLR2004
+    return x, weights
+
+
+def test_weighted_functions() -> None:
+    """Test that all quantile, L-moment, pairwise and moment measures are covered."""
+    if len(weighted_functions) != 32:  # noqa: PLR2004
+        msg = f"Unexpected weighted functions {weighted_functions}."
+        raise ValueError(msg)
+
+
+@pytest.mark.parametrize("func", weighted_functions)
+@pytest.mark.parametrize("seed", [1, 42])
+def test_weights_expand(func: str, seed: int) -> None:
+    """Test that weights give the same result as the repeated values."""
+    f: typing.Callable = ESTIMATORS[func]
+    x, weights = _tied_sample(seed)
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        result = f(x, weights=weights)
+        expected = f(np.repeat(x, weights))
+    if not np.isclose(result, expected, rtol=1e-9, equal_nan=True):
+        msg = (
+            f"Weighted {func} differs from the expanded sample: {result} != {expected}."
+        )
+        raise ValueError(msg)
+
+
+@pytest.mark.parametrize("sums", [True, False])
+def test_weighted_pairwise_median_infinite(*, sums: bool) -> None:
+    """Test that infinite values give the same pairs as the expanded sample."""
+    x = np.array([1.0, np.inf, 2.0, -np.inf, 2.0, 5.0])
+    weights = np.array([3, 1, 2, 1, 1, 4])
+    expanded = np.repeat(x, weights)
+    product = np.meshgrid(expanded, expanded, sparse=True)
+    with np.errstate(invalid="ignore"):
+        pairs = product[0] + product[1] if sums else np.abs(product[0] - product[1])
+    result = _weighted_pairwise_median(x, weights, sums=sums)
+    if not np.isclose(result, np.nanmedian(pairs), equal_nan=True):
+        msg = "Pairs of infinite values are counted incorrectly."
+        raise ValueError(msg)
+
+
+def test_large_counts() -> None:
+    """Test that counts of 10^10 observations are not expanded nor overflowed."""
+    x = np.arange(1000, dtype=np.float64)
+    weights = np.full(1000, 10**7)
+    if not np.isclose(gini_mean_difference(x, weights=weights), (1000**2 - 1) / 3000):
+        msg = "Gini mean difference of the discrete uniform sample is incorrect."
+        raise ValueError(msg)
+    if abs(l_skew(x, weights=weights)) > 1e-9:  # noqa: PLR2004
+        msg = "L-skewness of the symmetric sample should be zero."
+        raise ValueError(msg)
+    # share of pairs with differences below d is 1 - (1 - d / 1000)^2
+    expected = 1000 * (1 - 0.5**0.5)
+    if abs(shamos_estimator(x, weights=weights) - expected) > 1:
+        msg = "Shamos estimator of the discrete uniform sample is incorrect."
+        raise ValueError(msg)
+
+
+def test_block_comb_sums() -> None:
+    """Test that sums of binomial coefficients match the direct ones."""
+    starts = np.array([0, 1, 3, 7, 10**9])
+    ends = np.array([1, 3, 7, 12, 10**9 + 5])
+    for r in range(4):
+        result = _block_comb_sums(starts, ends, r)
+        expected = np.array(
+            [
+                float(sum(math.comb(j, r) for j in range(s, e)))
+                for s, e in np.c_[starts, ends].tolist()
+            ]
+        )
+        if not np.allclose(result, expected, rtol=1e-12, atol=0):
+            msg = f"Sums of C(j, {r}) do not match: {result} != {expected}."
+            raise ValueError(msg)
+
+
+def test_exact_dot() -> None:
+    """Test that large sums of products are exact."""
+    a = np.full(4, 10**10, dtype=np.int64)
+    if _exact_dot(a, a) != 4 * 10**20:
+        msg = "Sum of products should not overflow."
+        raise ValueError(msg)
+
+
+def test_weights_errors() -> None:
+    """Test for incorrect weights."""
+    x = np.arange(5.0)
+    with pytest.raises(ValueError, match="same shape"):
+        l_skew(x, weights=np.ones(4))
+    with pytest.raises(ValueError, match="non-negative integer"):
+        l_skew(x, weights=np.full(5, 0.5))
+    with pytest.raises(ValueError, match="non-negative integer"):
+        l_skew(x, weights=-np.ones(5))